@@ -0,0 +1,431 @@
+"""Generate a synthetic CineStream dataset and bulk-load it.
+
+Distributions aim at what a streaming catalog looks like in production:
+- title popularity follows a Zipf law: reviews, watchlists, playback and load-test
+  traffic all concentrate on a few hundred hits;
+- ratings are J-shaped (mostly 5s, a bump at 1), and a small share of reviews are
+  copy-pasted spam;
+- users have between 1 and --profiles-per-user profiles, most having one or two;
+- a share of titles are series with seasons and episodes, titles carry audio
+  and subtitle tracks, and most users hold a subscription with a payment.
+
+Rows are generated lazily as tuples and loaded in chunks: PostgreSQL via COPY,
+SQLite via executemany on the raw connection with synchronous writes off. Memory
+use stays flat, so tens of millions of rows load in minutes.
+
+Every user's password is "secret1". Profile ids are strided: user u owns ids
+(u - 1) * profiles_per_user + 1 .. + profile_count(u, profiles_per_user).
+
+Usage (from Backend/):
+    python -m benchmarks.dataset --users 1000000 --contents 100000 --reviews 20000000 --watchlist 10000000
+Set DATABASE_URL to load into PostgreSQL; a temporary SQLite file is used otherwise.
+"""
+import argparse
+import bisect
+import csv
+import io
+import itertools
+import os
+import random
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from sqlalchemy.engine import Engine
+
+from src.core import database
+from src.core.database import Base
+from src.core.security import get_password_hash
+from src.models.models import EPISODE_ORDINAL_STRIDE, MATURITY_LEVELS
+
+GENRES = ["Drama", "Comedy", "Action", "Thriller", "Horror", "Romance", "Documentary", "Sci-Fi", "Animation", "Crime"]
+LANGUAGES = ["English", "Hindi", "Spanish", "French", "Korean", "Japanese", "Tamil", "German"]
+CATEGORIES = ["Trending", "Latest", "Originals", "Recommended"]
+RATINGS = ["G", "PG", "PG-13", "R", "TV-MA"]
+PLANS = [("Basic", 499, "720p", 1), ("Standard", 899, "1080p", 2), ("Premium", 1299, "4K", 4)]
+PROVIDERS = ["stripe", "paypal", "upi"]
+PASSWORD = "secret1"
+CHUNK_ROWS = 50_000
+
+# Star ratings 1..5: J-shaped like most public review data
+RATING_WEIGHTS = [0.11, 0.06, 0.10, 0.23, 0.50]
+# Profiles per user 1..5 before capping at --profiles-per-user
+PROFILE_COUNT_WEIGHTS = [0.40, 0.30, 0.15, 0.10, 0.05]
+REVIEW_TEXTS = [
+    "Loved it, would watch again.",
+    "Great performances but the pacing drags in the middle.",
+    "Not for me.",
+    "The ending was worth it.",
+    "Beautifully shot, weak script.",
+    "Perfect weekend watch with the family.",
+    None,
+]
+SPAM_TEXTS = ["Watch free movies at best-streams.example!!!", "Earn $$$ from home, click my profile"]
+SPAM_SHARE = 0.01
+
+Row = Tuple
+# Column order of the generated row tuples, per table
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "users": ("id", "email", "phone", "hashed_password", "is_active", "is_admin", "created_at"),
+    "profiles": ("id", "user_id", "name", "avatar", "maturity_rating"),
+    "contents": (
+        "id", "title", "description", "release_year", "duration_minutes", "genre", "language", "category",
+        "content_type", "maturity_rating", "maturity_level", "is_premium", "video_url", "thumbnail_url", "created_at",
+    ),
+    "content_genres": ("content_id", "genre"),
+    "content_languages": ("content_id", "language"),
+    "content_tracks": ("content_id", "kind", "language"),
+    "seasons": ("id", "series_id", "season_number", "title", "description", "release_year"),
+    "episodes": (
+        "id", "season_id", "series_id", "season_number", "episode_number", "ordinal", "title", "description",
+        "duration_minutes", "video_url", "thumbnail_url", "created_at",
+    ),
+    "rating_reviews": ("id", "profile_id", "content_id", "rating", "review_text", "created_at"),
+    "watchlist_items": ("id", "profile_id", "content_id", "created_at"),
+    "playback_progress": (
+        "id", "profile_id", "content_id", "position_seconds", "duration_seconds", "completed", "updated_at",
+    ),
+    "subscription_plans": ("id", "name", "price_cents", "currency", "quality_limit", "screens", "is_active"),
+    "subscriptions": ("id", "user_id", "plan_id", "status", "start_at", "end_at"),
+    "payments": (
+        "id", "user_id", "amount_cents", "currency", "provider", "provider_ref", "status", "idempotency_key",
+        "attempts", "created_at", "updated_at",
+    ),
+}
+
+
+@dataclass
+class Scale:
+    """Target row counts for a synthetic dataset (reviews/watchlist/progress are approximate)."""
+
+    users: int = 1_000
+    profiles_per_user: int = 2
+    contents: int = 5_000
+    reviews: int = 20_000
+    watchlist: int = 20_000
+    progress: int = 20_000
+    series_share: float = 0.15
+    zipf_exponent: float = 1.1
+
+
+class ZipfSampler:
+    """Draw content ids with Zipf-distributed popularity in O(log n) per draw.
+
+    Popularity ranks are assigned to a seeded permutation of the ids, so the hits
+    are scattered across the id range rather than being ids 1, 2, 3...
+    """
+
+    def __init__(self, n: int, exponent: float, seed: int):
+        self.n = n
+        self._cumulative = list(itertools.accumulate(1.0 / rank**exponent for rank in range(1, n + 1)))
+        self._total = self._cumulative[-1]
+        self._ids = list(range(1, n + 1))
+        random.Random(f"{seed}:popularity").shuffle(self._ids)
+
+    # PUBLIC_INTERFACE
+    def sample(self, rng: random.Random) -> int:
+        """Return one content id."""
+        return self._ids[min(self.n - 1, bisect.bisect_right(self._cumulative, rng.random() * self._total))]
+
+    # PUBLIC_INTERFACE
+    def sample_distinct(self, rng: random.Random, k: int) -> List[int]:
+        """Return k distinct content ids, popular ones most likely."""
+        k = min(k, self.n)
+        picked = set()
+        attempts = 0
+        while len(picked) < k and attempts < k * 20:
+            picked.add(self.sample(rng))
+            attempts += 1
+        while len(picked) < k:
+            picked.add(rng.randint(1, self.n))
+        return list(picked)
+
+
+# PUBLIC_INTERFACE
+def profile_count(user_id: int, profiles_per_user: int) -> int:
+    """Number of profiles the generator gives user_id (deterministic, no RNG state)."""
+    u = ((user_id * 2654435761) & 0xFFFFFFFF) / 2**32
+    cumulative = 0.0
+    for count, weight in enumerate(PROFILE_COUNT_WEIGHTS, start=1):
+        cumulative += weight
+        if u < cumulative or count == profiles_per_user:
+            return min(count, profiles_per_user)
+    return min(len(PROFILE_COUNT_WEIGHTS), profiles_per_user)
+
+
+def _profile_ids(scale: Scale) -> Iterator[Tuple[int, int]]:
+    for user_id in range(1, scale.users + 1):
+        base = (user_id - 1) * scale.profiles_per_user
+        for p in range(1, profile_count(user_id, scale.profiles_per_user) + 1):
+            yield user_id, base + p
+
+
+def _timestamps(rng: random.Random, n: int = 10_000) -> List[str]:
+    # A pool of preformatted times over the last three years; formatting per row is too slow
+    now = datetime(2026, 1, 1)
+    return sorted(
+        (now - timedelta(seconds=rng.randint(0, 3 * 365 * 86400))).strftime("%Y-%m-%d %H:%M:%S.%f") for _ in range(n)
+    )
+
+
+class _Generator:
+    """Row iterators for every table, sharing one RNG, popularity sampler and timestamp pool."""
+
+    def __init__(self, scale: Scale, seed: int):
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.popularity = ZipfSampler(scale.contents, scale.zipf_exponent, seed)
+        self.times = _timestamps(self.rng)
+        self.profiles = sum(1 for _ in _profile_ids(scale))
+        self._series: List[int] = []
+        self._tags: List[Tuple[int, List[str], List[str], List[Tuple[str, str]]]] = []
+        self._rating_cumulative = list(itertools.accumulate(RATING_WEIGHTS))
+
+    def when(self) -> str:
+        return self.rng.choice(self.times)
+
+    def users(self) -> Iterator[Row]:
+        hashed = get_password_hash(PASSWORD)
+        for i in range(1, self.scale.users + 1):
+            yield i, f"user{i}@example.com", None, hashed, 1, 0, self.when()
+
+    def profiles_rows(self) -> Iterator[Row]:
+        ratings = ["PG-13", "PG-13", "R", "TV-MA", "G"]
+        for user_id, profile_id in _profile_ids(self.scale):
+            p = profile_id - (user_id - 1) * self.scale.profiles_per_user
+            yield profile_id, user_id, f"Profile {p}", None, ratings[(p - 1) % len(ratings)]
+
+    def contents(self) -> Iterator[Row]:
+        rng = self.rng
+        for i in range(1, self.scale.contents + 1):
+            rating = rng.choice(RATINGS)
+            series = rng.random() < self.scale.series_share
+            if series:
+                self._series.append(i)
+            genres = rng.sample(GENRES, rng.randint(1, 3))
+            languages = rng.sample(LANGUAGES, rng.randint(1, 2))
+            tracks = [("audio", lang) for lang in languages] + [
+                ("subtitle", lang) for lang in rng.sample(LANGUAGES, rng.randint(2, 5))
+            ]
+            self._tags.append((i, genres, languages, tracks))
+            yield (
+                i,
+                f"Title {i}",
+                f"Synthetic title number {i}.",
+                rng.randint(1970, 2025),
+                None if series else rng.randint(20, 180),
+                ", ".join(genres),
+                ", ".join(languages),
+                rng.choice(CATEGORIES),
+                "series" if series else "movie",
+                rating,
+                MATURITY_LEVELS[rating],
+                int(rng.random() < 0.3),
+                None,
+                None,
+                self.when(),
+            )
+
+    def tags(self) -> List[Tuple[str, Iterator[Row]]]:
+        # Tag rows mirror the legacy genre/language strings chosen in contents()
+        return [
+            ("content_genres", ((i, g) for i, genres, _, _ in self._tags for g in genres)),
+            ("content_languages", ((i, lang) for i, _, languages, _ in self._tags for lang in languages)),
+            ("content_tracks", ((i, kind, lang) for i, _, _, tracks in self._tags for kind, lang in tracks)),
+        ]
+
+    def seasons_and_episodes(self) -> Tuple[List[Row], Iterator[Row]]:
+        rng = self.rng
+        seasons = []
+        for series_id in self._series:
+            for number in range(1, rng.randint(1, 5) + 1):
+                seasons.append((len(seasons) + 1, series_id, number, f"Season {number}", None, rng.randint(1990, 2025)))
+
+        def episodes() -> Iterator[Row]:
+            episode_id = 0
+            for season_id, series_id, number, *_ in seasons:
+                for ep in range(1, rng.randint(6, 10) + 1):
+                    episode_id += 1
+                    yield (
+                        episode_id,
+                        season_id,
+                        series_id,
+                        number,
+                        ep,
+                        number * EPISODE_ORDINAL_STRIDE + ep,
+                        f"Episode {ep}",
+                        None,
+                        rng.randint(20, 60),
+                        None,
+                        None,
+                        self.when(),
+                    )
+
+        return seasons, episodes()
+
+    def _pairs(self, total: int) -> Iterator[Tuple[int, int]]:
+        # Per-profile activity is exponential (a few heavy users), titles are Zipf-popular
+        mean = total / max(1, self.profiles)
+        cap = max(1, self.scale.contents // 2)
+        for _, profile_id in _profile_ids(self.scale):
+            k = min(cap, int(self.rng.expovariate(1 / mean))) if mean else 0
+            for content_id in self.popularity.sample_distinct(self.rng, k):
+                yield profile_id, content_id
+
+    def reviews(self) -> Iterator[Row]:
+        rng = self.rng
+        for i, (profile_id, content_id) in enumerate(self._pairs(self.scale.reviews), start=1):
+            if rng.random() < SPAM_SHARE:
+                rating, text = 5, rng.choice(SPAM_TEXTS)
+            else:
+                rating = bisect.bisect_right(self._rating_cumulative, rng.random()) + 1
+                text = rng.choice(REVIEW_TEXTS)
+            yield i, profile_id, content_id, min(rating, 5), text, self.when()
+
+    def watchlist(self) -> Iterator[Row]:
+        for i, (profile_id, content_id) in enumerate(self._pairs(self.scale.watchlist), start=1):
+            yield i, profile_id, content_id, self.when()
+
+    def progress_rows(self) -> Iterator[Row]:
+        rng = self.rng
+        for i, (profile_id, content_id) in enumerate(self._pairs(self.scale.progress), start=1):
+            duration = rng.randint(20, 180) * 60
+            position = duration if rng.random() < 0.3 else rng.randint(0, duration)
+            yield i, profile_id, content_id, position, duration, int(position >= duration * 0.95), self.when()
+
+    def plans(self) -> List[Row]:
+        return [
+            (i, name, price, "USD", quality, screens, 1) for i, (name, price, quality, screens) in enumerate(PLANS, 1)
+        ]
+
+    def subscriptions_and_payments(self) -> Tuple[Iterator[Row], Iterator[Row]]:
+        rng = self.rng
+        subscribed = [
+            (user_id, rng.randint(1, len(PLANS)), self.when())
+            for user_id in range(1, self.scale.users + 1)
+            if rng.random() < 0.6
+        ]
+        subscriptions = (
+            (i, user_id, plan_id, "active", started, None)
+            for i, (user_id, plan_id, started) in enumerate(subscribed, 1)
+        )
+        payments = (
+            (i, user_id, PLANS[plan_id - 1][1], "USD", PROVIDERS[i % 3], f"sim_{i}", "succeeded", None, 1, at, at)
+            for i, (user_id, plan_id, at) in enumerate(subscribed, 1)
+        )
+        return subscriptions, payments
+
+
+def _tables(gen: _Generator) -> Iterator[Tuple[str, Iterator[Row]]]:
+    # Parents before children; lazy, so contents are generated before their tags and seasons
+    yield "users", gen.users()
+    yield "profiles", gen.profiles_rows()
+    yield "contents", gen.contents()
+    yield from gen.tags()
+    seasons, episodes = gen.seasons_and_episodes()
+    yield "seasons", iter(seasons)
+    yield "episodes", episodes
+    yield "rating_reviews", gen.reviews()
+    yield "watchlist_items", gen.watchlist()
+    yield "playback_progress", gen.progress_rows()
+    yield "subscription_plans", iter(gen.plans())
+    subscriptions, payments = gen.subscriptions_and_payments()
+    yield "subscriptions", subscriptions
+    yield "payments", payments
+
+
+def _chunks(rows: Iterator[Row], size: int = CHUNK_ROWS) -> Iterator[List[Row]]:
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _load_postgres(cursor, table: str, columns: Sequence[str], rows: Iterator[Row]) -> int:
+    copy = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    loaded = 0
+    for chunk in _chunks(rows):
+        buf = io.StringIO()
+        csv.writer(buf).writerows(chunk)
+        buf.seek(0)
+        cursor.copy_expert(copy, buf)
+        loaded += len(chunk)
+    if "id" in columns:
+        # Explicit ids bypass the sequence; move it past them so the API can keep inserting
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT COALESCE(MAX(id), 1) FROM {table}))"
+        )
+    return loaded
+
+
+def _load_executemany(cursor, table: str, columns: Sequence[str], rows: Iterator[Row], paramstyle: str) -> int:
+    marks = ", ".join("?" if paramstyle == "qmark" else "%s" for _ in columns)
+    statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({marks})"
+    loaded = 0
+    for chunk in _chunks(rows):
+        cursor.executemany(statement, chunk)
+        loaded += len(chunk)
+    return loaded
+
+
+# PUBLIC_INTERFACE
+def seed(engine: Engine, scale: Scale, seed: int = 42, progress: bool = False) -> Dict[str, int]:
+    """Create the schema and bulk-load a deterministic synthetic dataset; return rows per table."""
+    Base.metadata.create_all(engine)
+    gen = _Generator(scale, seed)
+    counts: Dict[str, int] = {}
+    dialect = engine.dialect.name
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if dialect == "sqlite":
+            cursor.execute("PRAGMA synchronous")
+            synchronous = cursor.fetchone()[0]
+            cursor.execute("PRAGMA synchronous = OFF")
+        elif dialect == "postgresql":
+            cursor.execute("SET synchronous_commit = off")
+        for table, rows in _tables(gen):
+            columns = COLUMNS[table]
+            started = time.perf_counter()
+            if dialect == "postgresql":
+                counts[table] = _load_postgres(cursor, table, columns, rows)
+            else:
+                counts[table] = _load_executemany(cursor, table, columns, rows, engine.dialect.paramstyle)
+            raw.commit()
+            if progress:
+                elapsed = time.perf_counter() - started
+                rate = counts[table] / max(elapsed, 1e-9)
+                print(f"{table:<20} {counts[table]:>12,} rows {elapsed:8.1f}s {rate:>12,.0f} rows/s")
+        if dialect == "sqlite":
+            cursor.execute(f"PRAGMA synchronous = {synchronous}")
+        elif dialect == "postgresql":
+            cursor.execute("SET synchronous_commit = DEFAULT")
+            raw.commit()
+    finally:
+        raw.close()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    defaults = Scale()
+    for field, value in asdict(defaults).items():
+        parser.add_argument(f"--{field.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    # src.core.config has already been imported, so pass the URL explicitly rather than via the environment
+    url = os.environ.get("DATABASE_URL") or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'dataset.db')}"
+    scale = Scale(**{field: getattr(args, field) for field in asdict(defaults)})
+    started = time.perf_counter()
+    counts = seed(database.get_engine(url), scale, args.seed, progress=True)
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(f"loaded {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s) into {url}")
+
+
+if __name__ == "__main__":
+    main()
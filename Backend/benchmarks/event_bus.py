@@ -0,0 +1,103 @@
+"""Measure cross-worker delivery of change events.
+
+Starts --workers processes that each join the event bus the way an API worker
+does (EVENT_BUS_TRANSPORT, unix sockets by default) and record, for every
+"content" event they receive, the time since it was published. The parent then
+commits --events sessions that each emit one change event, so every event goes
+through the real after_commit hook, and reports delivery latency percentiles
+and how many of the expected deliveries arrived.
+
+Usage (from Backend/):
+    python -m benchmarks.event_bus --workers 4 --events 2000
+    DATABASE_URL=postgresql+psycopg2://... python -m benchmarks.event_bus --transport postgres
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+
+def run_worker(expected: int, ready, results, timeout: float) -> None:
+    """Join the event bus like an API worker and put the latencies of expected "content" events on results."""
+    import threading
+
+    from src.core.events import event_bus
+
+    latencies = []
+    done = threading.Event()
+
+    def record(ev) -> None:
+        latencies.append((time.time() - ev.emitted_at) * 1000)
+        if len(latencies) >= expected:
+            done.set()
+
+    event_bus.subscribe("content", record)
+    event_bus.start()
+    ready.put(os.getpid())
+    done.wait(timeout)
+    event_bus.stop()
+    results.put(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--transport", choices=("unix", "postgres"), default="unix")
+    parser.add_argument("--interval-ms", type=float, default=0.5, help="Pause between commits.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="How long workers wait for all events.")
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        if args.transport == "postgres":
+            parser.error("the postgres transport needs DATABASE_URL")
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'events.db')}"
+    os.environ["EVENT_BUS_TRANSPORT"] = args.transport
+    os.environ["EVENT_BUS_SOCKET_DIR"] = tempfile.mkdtemp(prefix="events-")
+
+    import multiprocessing
+
+    from src.core import database
+    from src.core.events import emit, event_bus
+
+    ctx = multiprocessing.get_context("spawn")
+    ready, results = ctx.Queue(), ctx.Queue()
+    workers = [
+        ctx.Process(target=run_worker, args=(args.events, ready, results, args.timeout)) for _ in range(args.workers)
+    ]
+    for w in workers:
+        w.start()
+    for _ in workers:
+        ready.get(timeout=60)
+
+    event_bus.start()
+    commit_us = []
+    with database.SessionLocal() as db:
+        for i in range(args.events):
+            started = time.perf_counter_ns()
+            emit(db, "content", i + 1)
+            db.commit()
+            commit_us.append((time.perf_counter_ns() - started) / 1000)
+            time.sleep(args.interval_ms / 1000)
+    latencies = []
+    for _ in workers:
+        latencies.extend(results.get(timeout=args.timeout + 10))
+    for w in workers:
+        w.join()
+    event_bus.stop()
+    database.dispose_engine()
+
+    expected = args.events * args.workers
+    print(f"transport      {args.transport} ({args.workers} workers, {args.events} events)")
+    print(f"commit + emit  {statistics.median(commit_us):8.1f} us (median, publisher side)")
+    print(f"delivered      {len(latencies)}/{expected}")
+    if latencies:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+        print(f"latency        p50 {cuts[49]:.3f} ms  p95 {cuts[94]:.3f} ms  p99 {cuts[98]:.3f} ms  max {max(latencies):.3f} ms")
+    if len(latencies) < expected:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
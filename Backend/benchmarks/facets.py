@@ -0,0 +1,81 @@
+"""Compare bitset facet counts against per-facet GROUP BY queries.
+
+Usage (from Backend/): python -m benchmarks.facets --contents 100000 --iterations 50
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from src.core.database import Base
+from src.models.models import Content, ContentGenre, ContentLanguage
+from src.services.facets import FacetIndex, group_by_counts
+
+GENRES = ["Drama", "Comedy", "Action", "Thriller", "Horror", "Romance", "Documentary", "Sci-Fi", "Animation", "Crime"]
+LANGUAGES = ["English", "Hindi", "Spanish", "French", "Korean", "Japanese", "Tamil", "German"]
+CATEGORIES = ["Trending", "Latest", "Originals", "Recommended"]
+
+
+def seed(db: Session, n: int, rng: random.Random) -> None:
+    rows = [
+        {
+            "id": i + 1,
+            "title": f"Title {i}",
+            "release_year": rng.randint(1970, 2025),
+            "category": rng.choice(CATEGORIES),
+        }
+        for i in range(n)
+    ]
+    genres = [{"content_id": i + 1, "genre": g} for i in range(n) for g in rng.sample(GENRES, rng.randint(1, 3))]
+    languages = [{"content_id": i + 1, "language": lang} for i in range(n) for lang in rng.sample(LANGUAGES, rng.randint(1, 2))]
+    for model, batch in ((Content, rows), (ContentGenre, genres), (ContentLanguage, languages)):
+        for i in range(0, len(batch), 10_000):
+            db.execute(insert(model), batch[i:i + 10_000])
+    db.commit()
+
+
+def timed(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contents", type=int, default=100_000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'facets.db')}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            seed(db, args.contents, rng)
+            index = FacetIndex(max_age_seconds=float("inf"))
+            build_ms = timed(lambda: index.build(db), 1)
+            scenarios = {
+                "no filters": {},
+                "genre": {"genre": "Drama"},
+                "genre+language+year": {"genre": "Drama", "language": "Hindi", "release_year": 2020},
+            }
+            print(f"contents={args.contents} index build={build_ms:.1f}ms")
+            for name, filters in scenarios.items():
+                assert index.counts(db, filters) == group_by_counts(db, filters)
+                bitset_ms = timed(lambda: index.counts(db, filters), args.iterations)
+                group_by_ms = timed(lambda: group_by_counts(db, filters), max(1, args.iterations // 10))
+                print(
+                    f"{name:<22} bitset={bitset_ms:8.3f}ms  group_by={group_by_ms:8.3f}ms  "
+                    f"speedup={group_by_ms / bitset_ms:6.1f}x"
+                )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""Load-test the API in process and compare the results against a JSON baseline.
+
+Seeds a synthetic dataset (see benchmarks.dataset), starts the full app with its
+lifespan, and drives every scenario through httpx's ASGI transport with
+--concurrency requests in flight. For each endpoint it reports p50/p95/p99
+latency, throughput and SQL statements per request. Scenarios run one after
+another, so the statement count for a scenario is exact.
+
+With --baseline, the run fails (exit 1) when an endpoint errors or issues more
+statements per request than the baseline; both are deterministic for a given
+seed. p95 latencies are printed next to the baseline's as a report only, since
+they depend on the machine and its load; --gate-latency also fails the run when
+a p95 exceeds the baseline by more than --latency-tolerance (only compared when
+the scale and concurrency match the baseline's). --write-baseline records the
+current run.
+
+Usage (from Backend/):
+    python -m benchmarks.load --baseline benchmarks/load_baseline.json
+    python -m benchmarks.load --contents 100000 --reviews 2000000 --concurrency 64 --requests 2000
+Set DATABASE_URL to run against PostgreSQL (the schema must be empty); a
+temporary SQLite file is used otherwise.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional, Tuple
+
+Request = Tuple[str, str, dict]  # method, url, httpx request kwargs
+
+
+def _scenarios(scale, tokens: List[dict], popularity, genres: List[str]) -> Dict[str, Tuple[Callable, Tuple[int, ...]]]:
+    """name -> (request factory taking an rng, accepted status codes)."""
+    from benchmarks.dataset import profile_count
+
+    def as_user(rng: random.Random) -> Tuple[dict, int]:
+        user_id = rng.randint(1, len(tokens))
+        profile = rng.randint(1, profile_count(user_id, scale.profiles_per_user))
+        return tokens[user_id - 1], (user_id - 1) * scale.profiles_per_user + profile
+
+    def content_id(rng: random.Random) -> int:
+        # Traffic is as skewed toward hit titles as the seeded reviews and watchlists
+        return popularity.sample(rng)
+
+    def profile_get(path: str, **params) -> Callable:
+        def factory(rng: random.Random) -> Request:
+            headers, profile_id = as_user(rng)
+            kwargs = {"headers": headers}
+            if params:
+                kwargs["params"] = {k: v(rng) for k, v in params.items()}
+            return "GET", path.format(profile_id=profile_id), kwargs
+
+        return factory
+
+    def watchlist_add(rng: random.Random) -> Request:
+        headers, profile_id = as_user(rng)
+        return "POST", f"/watchlist/{profile_id}/add/{content_id(rng)}", {"headers": headers}
+
+    def progress_report(rng: random.Random) -> Request:
+        headers, profile_id = as_user(rng)
+        body = {"position_seconds": rng.randint(0, 3600), "duration_seconds": 3600}
+        return "PUT", f"/progress/{profile_id}/content/{content_id(rng)}", {"headers": headers, "json": body}
+
+    def catalog(rng: random.Random) -> Request:
+        return "GET", "/content", {"params": {"genre": rng.choice(genres), "release_year": rng.randint(1970, 2025)}}
+
+    return {
+        "health": (lambda rng: ("GET", "/", {}), (200,)),
+        "content_list_genre": (catalog, (200,)),
+        "content_search": (lambda rng: ("GET", "/content", {"params": {"q": f"Title {rng.randint(1, 999)}"}}), (200,)),
+        "content_facets": (lambda rng: ("GET", "/content/facets", {"params": {"genre": rng.choice(genres)}}), (200,)),
+        "content_get": (lambda rng: ("GET", f"/content/{content_id(rng)}", {}), (200,)),
+        "reviews_list": (lambda rng: ("GET", f"/reviews/content/{content_id(rng)}", {}), (200,)),
+        "plans_list": (lambda rng: ("GET", "/subscriptions/plans", {}), (200,)),
+        "users_me": (lambda rng: ("GET", "/users/me", {"headers": as_user(rng)[0]}), (200,)),
+        "profiles_list": (lambda rng: ("GET", "/profiles", {"headers": as_user(rng)[0]}), (200,)),
+        "watchlist_list": (profile_get("/watchlist/{profile_id}"), (200,)),
+        "watchlist_contains": (
+            profile_get(
+                "/watchlist/{profile_id}/contains",
+                content_ids=lambda rng: rng.sample(range(1, scale.contents + 1), 20),
+            ),
+            (200,),
+        ),
+        "continue_watching": (profile_get("/progress/{profile_id}/continue-watching"), (200,)),
+        # Premium titles answer 402 for users without a subscription
+        "stream_url": (lambda rng: ("GET", f"/stream/{content_id(rng)}", {"headers": as_user(rng)[0]}), (200, 402)),
+        "watchlist_add": (watchlist_add, (200,)),
+        "progress_report": (progress_report, (204,)),
+    }
+
+
+def _percentiles(samples: List[float]) -> Tuple[float, float, float]:
+    if len(samples) < 2:
+        return (samples[0],) * 3 if samples else (0.0, 0.0, 0.0)
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+async def _run_scenario(client, requests: List[Request], accepted: Tuple[int, ...], concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors: List[str] = []
+    pending = iter(requests)
+
+    async def worker() -> None:
+        for method, url, kwargs in pending:
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code not in accepted:
+                errors.append(f"{method} {url} -> {response.status_code}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    p50, p95, p99 = _percentiles(latencies)
+    return {
+        "requests": len(requests),
+        "errors": len(errors),
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+        "rps": round(len(requests) / elapsed, 1),
+        "error_samples": errors[:3],
+    }
+
+
+def _same_setup(current: dict, baseline: dict) -> bool:
+    return all(current[k] == baseline.get(k) for k in ("scale", "concurrency", "requests"))
+
+
+def compare(
+    current: dict, baseline: dict, query_tolerance: float, latency_tolerance: Optional[float] = None
+) -> List[str]:
+    """Return human readable regressions of current against baseline.
+
+    Errors and queries/request are always gated; p95 latency only when latency_tolerance is given.
+    """
+    same_setup = _same_setup(current, baseline)
+    regressions = []
+    for name, base in baseline["endpoints"].items():
+        result = current["endpoints"].get(name)
+        if result is None:
+            continue
+        if result["errors"]:
+            regressions.append(f"{name}: {result['errors']} unexpected responses, e.g. {result['error_samples'][:1]}")
+        if result["queries_per_request"] > base["queries_per_request"] + query_tolerance:
+            regressions.append(
+                f"{name}: {result['queries_per_request']} queries/request (baseline {base['queries_per_request']})"
+            )
+        # Small absolute slack keeps sub-millisecond endpoints from failing on timer noise
+        if latency_tolerance is None or not same_setup:
+            continue
+        limit = base["p95_ms"] * (1 + latency_tolerance) + 1.0
+        if result["p95_ms"] > limit:
+            regressions.append(f"{name}: p95 {result['p95_ms']} ms (baseline {base['p95_ms']} ms, limit {limit:.2f})")
+    return regressions
+
+
+def latency_report(current: dict, baseline: dict) -> List[str]:
+    """Return one line per endpoint comparing its p95 with the baseline's (informational)."""
+    if not _same_setup(current, baseline):
+        return ["scale or concurrency differ from the baseline; latencies not compared"]
+    lines = []
+    for name, result in current["endpoints"].items():
+        base = baseline["endpoints"].get(name)
+        if base is not None:
+            change = (result["p95_ms"] / base["p95_ms"] - 1) * 100 if base["p95_ms"] else 0.0
+            lines.append(
+                f"{name:<20} p95 {result['p95_ms']:8.2f} ms  baseline {base['p95_ms']:8.2f} ms  {change:+6.0f}%"
+            )
+    return lines
+
+
+async def _drive(app, database, scenarios, args) -> Dict[str, dict]:
+    import httpx
+    from sqlalchemy import event
+
+    statements = [0]
+
+    def count(*_):
+        statements[0] += 1
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        engine = database.get_engine()
+        event.listen(engine, "before_cursor_execute", count)
+        transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, (factory, accepted) in scenarios.items():
+                rng = random.Random(f"{args.seed}:{name}")
+                warmup = [factory(rng) for _ in range(args.warmup)]
+                await _run_scenario(client, warmup, accepted, args.concurrency)
+                requests = [factory(rng) for _ in range(args.requests)]
+                before = statements[0]
+                result = await _run_scenario(client, requests, accepted, args.concurrency)
+                result["queries_per_request"] = round((statements[0] - before) / len(requests), 2)
+                results[name] = result
+                print(
+                    f"{name:<20} {result['p50_ms']:8.2f} {result['p95_ms']:8.2f} {result['p99_ms']:8.2f} "
+                    f"{result['rps']:9.1f} {result['queries_per_request']:7.2f} {result['errors']:6d}"
+                )
+        event.remove(engine, "before_cursor_execute", count)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--profiles-per-user", type=int, default=2)
+    parser.add_argument("--contents", type=int, default=5_000)
+    parser.add_argument("--reviews", type=int, default=20_000)
+    parser.add_argument("--watchlist", type=int, default=20_000)
+    parser.add_argument("--progress", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=300, help="Measured requests per scenario.")
+    parser.add_argument("--warmup", type=int, default=30, help="Unmeasured requests per scenario.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", default=None, help="Comma separated scenario names.")
+    parser.add_argument("--baseline", default=None, help="Baseline JSON to compare against.")
+    parser.add_argument("--write-baseline", action="store_true", help="Save this run as the --baseline file.")
+    parser.add_argument("--gate-latency", action="store_true", help="Also fail on p95 regressions.")
+    parser.add_argument(
+        "--latency-tolerance", type=float, default=0.5, help="Allowed relative p95 growth with --gate-latency."
+    )
+    parser.add_argument("--query-tolerance", type=float, default=0.1, help="Allowed growth in queries/request.")
+    parser.add_argument("--output", default=None, help="Also write this run's results to a JSON file.")
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load.db')}"
+    # All simulated clients share one address; per-client limits would turn the run into a 429 test
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ.setdefault("PAYMENT_SIMULATED_LATENCY_MS", "0")
+
+    from src.api.main import create_app
+    from src.core import database
+    from src.core.security import create_access_token
+
+    from benchmarks.dataset import GENRES, Scale, ZipfSampler, seed
+
+    scale = Scale(args.users, args.profiles_per_user, args.contents, args.reviews, args.watchlist, args.progress)
+    started = time.perf_counter()
+    rows = sum(seed(database.get_engine(), scale, args.seed).values())
+    print(f"seeded {rows:,} rows {asdict(scale)} in {time.perf_counter() - started:.1f}s")
+
+    tokens = [
+        {"Authorization": "Bearer " + create_access_token(subject={"user_id": user_id})}
+        for user_id in range(1, scale.users + 1)
+    ]
+    scenarios = _scenarios(scale, tokens, ZipfSampler(scale.contents, scale.zipf_exponent, args.seed), GENRES)
+    if args.only:
+        names = [n.strip() for n in args.only.split(",")]
+        unknown = sorted(set(names) - set(scenarios))
+        if unknown:
+            parser.error(f"unknown scenarios: {', '.join(unknown)}")
+        scenarios = {n: scenarios[n] for n in names}
+
+    print(f"{'endpoint':<20} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>9} {'q/req':>7} {'errors':>6}")
+    results = asyncio.run(_drive(create_app(), database, scenarios, args))
+    current = {
+        "scale": asdict(scale),
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "endpoints": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    failures = [
+        f"{name}: {r['errors']} unexpected responses {r['error_samples']}"
+        for name, r in results.items()
+        if r["errors"]
+    ]
+    if args.baseline and args.write_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print("latency (report only)" if not args.gate_latency else "latency")
+        print("  " + "\n  ".join(latency_report(current, baseline)))
+        failures = compare(
+            current, baseline, args.query_tolerance, args.latency_tolerance if args.gate_latency else None
+        )
+    if failures:
+        print("REGRESSIONS:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
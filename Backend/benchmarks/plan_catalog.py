@@ -0,0 +1,85 @@
+"""Compare GET /subscriptions/plans served from the plan catalog snapshot with the DB-backed path.
+
+Creates --plans active plans (plus a few inactive ones), then sends --requests
+sequential requests to each variant through the ASGI app:
+- snapshot: the list_plans endpoint, which returns the pre-rendered body;
+- database: the previous implementation (query the active plans and let FastAPI
+  validate and serialize them through response_model), mounted on the same app.
+Reports req/s, median latency and SQL statements per request.
+
+Usage (from Backend/): python -m benchmarks.plan_catalog --plans 12 --requests 5000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", type=int, default=12)
+    parser.add_argument("--requests", type=int, default=5_000)
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'plans.db')}"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+    from fastapi import Depends
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+
+    from src.api.main import create_app
+    from src.core import database
+    from src.core.database import get_db
+    from src.models.models import SubscriptionPlan
+    from src.schemas.schemas import PlanOut
+
+    app = create_app(routers=["subscriptions"], warm_caches=False)
+
+    @app.get("/bench/plans-db", response_model=list[PlanOut])
+    def list_plans_from_db(db: Session = Depends(get_db)):
+        return db.query(SubscriptionPlan).filter(SubscriptionPlan.is_active.is_(True)).all()
+
+    statements = [0]
+
+    def count(*_):
+        statements[0] += 1
+
+    with TestClient(app) as client:
+        with database.SessionLocal() as db:
+            for i in range(args.plans + 3):
+                db.add(SubscriptionPlan(name=f"Plan {i}", price_cents=499 + 100 * i, is_active=i < args.plans))
+            db.commit()
+        from src.services.plan_catalog import plan_catalog
+
+        plan_catalog.reload()
+        engine = database.get_engine()
+        event.listen(engine, "before_cursor_execute", count)
+        expected = None
+        for name, path in (("snapshot", "/subscriptions/plans"), ("database", "/bench/plans-db")):
+            for _ in range(100):
+                client.get(path)
+            samples = []
+            before = statements[0]
+            began = time.perf_counter()
+            for _ in range(args.requests):
+                started = time.perf_counter_ns()
+                response = client.get(path)
+                samples.append((time.perf_counter_ns() - started) / 1000)
+            elapsed = time.perf_counter() - began
+            body = response.json()
+            if expected is not None and body != expected:
+                raise SystemExit("snapshot and database responses differ")
+            expected = body
+            print(
+                f"{name:<9} {args.requests / elapsed:9.0f} req/s  p50 {statistics.median(samples):7.0f} us  "
+                f"{(statements[0] - before) / args.requests:5.2f} q/req  ({len(body)} plans)"
+            )
+        event.remove(engine, "before_cursor_execute", count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Measure what rate limiting and admission control add to each request.
+
+Reports the cost of a token bucket check on the in-process store (single-threaded
+and with --threads threads contending on one lock), on the shared-store path
+through a local stand-in for Redis, and end to end: the same tiny route served
+with and without the limiter dependency. Also checks that a burst beyond the
+bucket capacity is rejected with 429 and a Retry-After header.
+
+Usage (from Backend/): python -m benchmarks.rate_limit --ops 200000 --threads 8
+"""
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LocalScriptClient:
+    """Stand-in for a Redis client: runs the token bucket script's logic in process."""
+
+    def __init__(self):
+        self._data = {}
+
+    def eval(self, script, numkeys, key, capacity, rate, cost, now):
+        tokens, updated_at = self._data.get(key, (capacity, now))
+        tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._data[key] = (tokens, now)
+        return [int(allowed), str(tokens)]
+
+
+def _ns_per_take(store, ops: int, keys: int) -> float:
+    names = [f"bench:u:{i}" for i in range(keys)]
+    started = time.perf_counter_ns()
+    for i in range(ops):
+        store.take(names[i % keys], 1e9, 1e9)
+    return (time.perf_counter_ns() - started) / ops
+
+
+def _contended_ns_per_take(store, ops: int, threads: int) -> float:
+    per_thread = ops // threads
+
+    def work(t: int) -> None:
+        key = f"bench:u:{t}"
+        for _ in range(per_thread):
+            store.take(key, 1e9, 1e9)
+
+    started = time.perf_counter_ns()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(work, range(threads)))
+    return (time.perf_counter_ns() - started) / (per_thread * threads)
+
+
+def _request_us(client, url: str, headers: dict, requests: int) -> float:
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter_ns()
+        client.get(url, headers=headers)
+        samples.append((time.perf_counter_ns() - started) / 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+
+    from src.core.rate_limit import (
+        ConcurrencyLimiter,
+        MemoryBucketStore,
+        RateLimiter,
+        RatePolicy,
+        SharedBucketStore,
+    )
+    from src.core.security import create_access_token
+
+    memory = MemoryBucketStore()
+    print(f"memory store, 1 key        {_ns_per_take(memory, args.ops, 1):8.0f} ns/check")
+    print(f"memory store, 10k keys     {_ns_per_take(MemoryBucketStore(), args.ops, 10_000):8.0f} ns/check")
+    contended = _contended_ns_per_take(memory, args.ops, args.threads)
+    print(f"memory store, {args.threads} threads    {contended:8.0f} ns/check")
+    shared = SharedBucketStore(LocalScriptClient())
+    print(f"shared store (local stub)  {_ns_per_take(shared, args.ops, 1000):8.0f} ns/check (+ network round trip)")
+
+    admission = ConcurrencyLimiter("bench", 64)
+    started = time.perf_counter_ns()
+    for _ in range(args.ops):
+        with admission:
+            pass
+    print(f"admission slot             {(time.perf_counter_ns() - started) / args.ops:8.0f} ns/request")
+
+    limiter = RateLimiter(MemoryBucketStore(), {"bench": RatePolicy("bench", 1e9, 1e9)})
+    app = FastAPI()
+    app.get("/plain")(lambda: {"ok": True})
+    app.get("/limited", dependencies=[Depends(limiter.dependency("bench"))])(lambda: {"ok": True})
+    headers = {"Authorization": "Bearer " + create_access_token(subject={"user_id": 1})}
+    with TestClient(app) as client:
+        _request_us(client, "/plain", headers, 200)
+        _request_us(client, "/limited", headers, 200)
+        plain = _request_us(client, "/plain", headers, args.requests)
+        limited_us = _request_us(client, "/limited", headers, args.requests)
+    print(f"request without limiter    {plain:8.1f} us (median)")
+    print(f"request with limiter       {limited_us:8.1f} us (median, +{limited_us - plain:.1f} us)")
+
+    burst = RateLimiter(MemoryBucketStore(), {"burst": RatePolicy("burst", 5, 1)})
+    app = FastAPI()
+    app.get("/burst", dependencies=[Depends(burst.dependency("burst"))])(lambda: {"ok": True})
+
+    with TestClient(app) as client:
+        responses = [client.get("/burst") for _ in range(8)]
+    statuses = [r.status_code for r in responses]
+    ok = statuses == [200] * 5 + [429] * 3 and all("retry-after" in r.headers for r in responses[5:])
+    print(f"burst of 8 against 5       {statuses} {'ok' if ok else 'FAIL'}")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Measure the review moderation pipeline: batch throughput and verdict quality.
+
+Seeds users, profiles and titles (see benchmarks.dataset), then inserts --reviews
+pending reviews with known labels:
+- original texts built from a word pool;
+- near-duplicate copies of earlier originals, re-cased, re-punctuated and with
+  one word swapped or stretched;
+- promotional spam.
+For every --processes value the pipeline moderates the whole backlog from
+scratch. The script reports reviews/s and the mean batch time, plus precision
+and recall of the hidden verdicts for the spam and duplicate labels. It also
+reports the median API latency of add_review, which only inserts a pending row.
+
+Usage (from Backend/): python -m benchmarks.review_moderation --reviews 20000 --processes 0,2
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+WORDS = (
+    "acting actor audience beautiful camera character cinematography clever dialogue director drama ending "
+    "episode family finale funny gorgeous heart humour intense journey lead memorable moving music narrative "
+    "pacing performance plot quiet rewatch scene score script season sequel slow soundtrack story subtle tension "
+    "thriller twist villain visual warm weak writing brilliant bland charming clumsy dark gripping haunting "
+    "hilarious messy predictable refreshing stunning tedious tender uneven"
+).split()
+SPAM = [
+    "FREE {x} giveaway!!! visit www.{d}.xyz now",
+    "earn {n} dollars a day from home, whatsapp +1 555 {n} 0199",
+    "cheap {x} promo codes at https://{d}.top click click click",
+    "Best crypto investment, telegram me: {d}@mail.example",
+]
+
+
+def _original(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 40))).capitalize() + "."
+
+
+def _near_copy(rng: random.Random, text: str) -> str:
+    words = text.rstrip(".").split()
+    i = rng.randrange(len(words))
+    words[i] = words[i] + words[i][-1] * 3 if rng.random() < 0.5 else rng.choice(WORDS)
+    out = " ".join(words)
+    return (out.upper() if rng.random() < 0.2 else out) + rng.choice(["!!", ".", "...", " :)"])
+
+
+def _reviews(rng: random.Random, count: int, spam_share: float, duplicate_share: float):
+    originals = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < spam_share:
+            template = rng.choice(SPAM)
+            yield "spam", template.format(x=rng.choice(WORDS), d=rng.choice(WORDS) + "-deals", n=rng.randint(100, 999))
+        elif roll < spam_share + duplicate_share and originals:
+            yield "duplicate", _near_copy(rng, rng.choice(originals))
+        else:
+            text = _original(rng)
+            originals.append(text)
+            yield "original", text
+
+
+def _quality(labels, hidden, label: str):
+    flagged = {i for i, lab in labels.items() if lab == label}
+    caught = flagged & hidden
+    return len(caught) / len(flagged) if flagged else 1.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reviews", type=int, default=20_000)
+    parser.add_argument("--spam-share", type=float, default=0.05)
+    parser.add_argument("--duplicate-share", type=float, default=0.1)
+    parser.add_argument("--processes", default="0,2", help="Comma separated analysis pool sizes to compare.")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'reviews.db')}"
+    os.environ["REVIEW_MODERATION_ENABLED"] = "false"
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import delete, select, update
+
+    from src.api.main import create_app
+    from src.core import database
+    from src.core.security import create_access_token
+    from src.models.models import ContentReviewStats, Profile, RatingReview, ReviewFingerprint, ReviewLshBucket
+    from src.services.review_moderation import ReviewModerator
+
+    from benchmarks.dataset import Scale, seed
+
+    engine = database.get_engine()
+    contents = 2_000
+    profiles_needed = args.reviews // contents + 1
+    scale = Scale(users=profiles_needed, profiles_per_user=1, contents=contents, reviews=0, watchlist=0, progress=0)
+    seed(engine, scale, args.seed)
+    with database.SessionLocal() as db:
+        profile_ids = list(db.execute(select(Profile.id).order_by(Profile.id)).scalars())
+
+    rng = random.Random(args.seed)
+    labels = {}
+    rows = []
+    for i, (label, text) in enumerate(_reviews(rng, args.reviews, args.spam_share, args.duplicate_share), start=1):
+        labels[i] = label
+        rows.append(
+            {
+                "id": i,
+                "profile_id": profile_ids[i // contents],
+                "content_id": i % contents + 1,
+                "rating": rng.randint(1, 5),
+                "review_text": text,
+                "status": "pending",
+            }
+        )
+    with engine.begin() as conn:
+        conn.execute(RatingReview.__table__.insert(), rows)
+    counts = {lab: sum(v == lab for v in labels.values()) for lab in ("original", "duplicate", "spam")}
+    print(f"{args.reviews} reviews: {counts}")
+
+    for processes in [int(p) for p in args.processes.split(",")]:
+        with engine.begin() as conn:
+            conn.execute(update(RatingReview).values(status="pending", spam_score=None, duplicate_of_id=None))
+            for model in (ReviewLshBucket, ReviewFingerprint, ContentReviewStats):
+                conn.execute(delete(model))
+        moderator = ReviewModerator(interval=3600, batch_size=args.batch_size, processes=processes)
+        moderator.start()  # creates the pool; the thread itself sleeps for the interval
+        started = time.perf_counter()
+        moderated = moderator.process_pending()
+        elapsed = time.perf_counter() - started
+        moderator.stop()
+        with database.SessionLocal() as db:
+            hidden = set(db.execute(select(RatingReview.id).where(RatingReview.status == "hidden")).scalars())
+        false_positives = sum(labels[i] == "original" for i in hidden)
+        print(
+            f"processes={processes:<2} {moderated / elapsed:9.0f} reviews/s  "
+            f"batch {elapsed * 1000 / max(moderator.batches, 1):7.1f} ms  "
+            f"spam recall {_quality(labels, hidden, 'spam'):.3f}  "
+            f"duplicate recall {_quality(labels, hidden, 'duplicate'):.3f}  "
+            f"precision {1 - false_positives / max(len(hidden), 1):.3f}"
+        )
+
+    # The write path: add_review stores a pending row and returns
+    app = create_app(routers=["reviews"])
+    headers = {"Authorization": "Bearer " + create_access_token(subject={"user_id": 1})}
+    samples = []
+    with TestClient(app) as client:
+        for content_id in range(1, 501):
+            body = {"rating": 4, "review_text": _original(rng)}
+            began = time.perf_counter_ns()
+            response = client.post(f"/reviews/{profile_ids[0]}/content/{content_id}", json=body, headers=headers)
+            samples.append((time.perf_counter_ns() - began) / 1000)
+            if response.status_code not in (200, 400):
+                raise SystemExit(f"add_review failed: {response.status_code} {response.text}")
+    print(f"add_review      {statistics.median(samples):9.0f} us (median, moderation deferred)")
+
+
+if __name__ == "__main__":
+    main()
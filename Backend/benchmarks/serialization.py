@@ -0,0 +1,131 @@
+"""Compare the ORM + response_model path against the column-row fast path for list endpoints.
+
+The ORM path mirrors what FastAPI did before: load ORM objects, validate them with
+the *Out models (from_attributes), dump to JSON-able Python and json.dumps the result.
+The fast path selects column rows and encodes dicts with a single TypeAdapter.dump_json.
+Both outputs are checked to be identical JSON before timing.
+
+Usage (from Backend/): python -m benchmarks.serialization --contents 20000 --iterations 5
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from benchmarks.facets import LANGUAGES, seed
+from src.core.database import Base
+from src.models.models import Content, ContentTrack, Profile, RatingReview, User, WatchlistItem
+from src.schemas.schemas import ContentOut, ReviewOut, WatchlistItemOut
+from src.services.listings import content_rows, dump_rows, review_rows, watchlist_rows
+
+
+def seed_extras(db: Session, n: int, watchlist: int, reviews: int, rng: random.Random) -> None:
+    tracks = [
+        {"content_id": i + 1, "kind": kind, "language": lang}
+        for i in range(n)
+        for kind in ("audio", "subtitle")
+        for lang in rng.sample(LANGUAGES, rng.randint(1, 3))
+    ]
+    for i in range(0, len(tracks), 10_000):
+        db.execute(insert(ContentTrack), tracks[i:i + 10_000])
+    db.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "x"}])
+    db.execute(insert(Profile), [{"id": 1, "user_id": 1, "name": "bench"}])
+    db.execute(insert(Profile), [{"id": p, "user_id": 1, "name": f"p{p}"} for p in range(2, reviews + 2)])
+    now = datetime.utcnow()
+    db.execute(
+        insert(WatchlistItem),
+        [{"profile_id": 1, "content_id": c, "created_at": now} for c in rng.sample(range(1, n + 1), watchlist)],
+    )
+    db.execute(
+        insert(RatingReview),
+        [{"profile_id": p, "content_id": 1, "rating": rng.randint(1, 5), "review_text": "ok"} for p in range(2, reviews + 2)],
+    )
+    db.commit()
+
+
+def response_model_path(adapter: TypeAdapter, objects) -> bytes:
+    # What FastAPI does for a response_model: validate, serialize to JSON-able data, json.dumps
+    value = adapter.validate_python(objects, from_attributes=True)
+    content = adapter.dump_python(value, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def timed(engine, fn, iterations: int) -> float:
+    total = 0.0
+    for _ in range(iterations):
+        with Session(engine) as db:  # fresh session per "request", as in the app
+            started = time.perf_counter()
+            fn(db)
+            total += time.perf_counter() - started
+    return total / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--contents", type=int, default=20_000)
+    parser.add_argument("--watchlist", type=int, default=2_000)
+    parser.add_argument("--reviews", type=int, default=5_000)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'serialization.db')}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            seed(db, args.contents, rng)
+            seed_extras(db, args.contents, args.watchlist, args.reviews, rng)
+
+        content_adapter = TypeAdapter(list[ContentOut])
+        watchlist_adapter = TypeAdapter(list[WatchlistItemOut])
+        review_adapter = TypeAdapter(list[ReviewOut])
+        endpoints = {
+            "list_content": (
+                args.contents,
+                lambda db: response_model_path(
+                    content_adapter, db.query(Content).order_by(Content.created_at.desc(), Content.id).all()
+                ),
+                lambda db: dump_rows(content_rows(db, db.query(Content).order_by(Content.created_at.desc(), Content.id))),
+            ),
+            "list_watchlist": (
+                args.watchlist,
+                lambda db: response_model_path(
+                    watchlist_adapter,
+                    db.query(WatchlistItem)
+                    .join(Content)
+                    .filter(WatchlistItem.profile_id == 1)
+                    .order_by(WatchlistItem.created_at.desc(), WatchlistItem.id)
+                    .all(),
+                ),
+                lambda db: dump_rows(watchlist_rows(db, 1)),
+            ),
+            "list_reviews": (
+                args.reviews,
+                lambda db: response_model_path(
+                    review_adapter, db.query(RatingReview).filter(RatingReview.content_id == 1).all()
+                ),
+                lambda db: dump_rows(review_rows(db, 1)),
+            ),
+        }
+        for name, (rows, orm_fn, fast_fn) in endpoints.items():
+            with Session(engine) as db:
+                assert json.loads(orm_fn(db)) == json.loads(fast_fn(db)), f"{name}: outputs differ"
+            orm_s = timed(engine, orm_fn, args.iterations)
+            fast_s = timed(engine, fast_fn, args.iterations)
+            print(
+                f"{name:<16} rows={rows:<7} orm={orm_s / rows * 1e6:7.2f}us/row  "
+                f"fast={fast_s / rows * 1e6:7.2f}us/row  speedup={orm_s / fast_s:5.1f}x"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Measure the series queries on long-running series with thousands of episodes.
+
+Seeds --series series of --seasons seasons with --episodes-per-season episodes each
+(default: 40 series x 50 seasons x 100 episodes = 200k episodes, 5000 per series)
+and compares, per call:
+- season listing: the (series_id, ordinal) range scan of season_episodes, cold
+  (season cache cleared) and warm, against joining seasons and ordering by
+  episode_number;
+- next episode: the single ordinal query of next_episode against looking the
+  episode up, then the rest of its season, then the next season;
+- season overview: season_overview's grouped count.
+
+Usage (from Backend/): python -m benchmarks.series --series 40 --seasons 50 --episodes-per-season 100
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from src.core.database import Base
+from src.models.models import Content, ContentType, Episode, Season
+from src.schemas.schemas import EpisodeOut
+from src.services.series import episode_ordinal, next_episode, season_cache, season_episodes, season_overview
+
+
+def seed(db: Session, series: int, seasons: int, episodes: int) -> None:
+    db.execute(
+        insert(Content),
+        [{"id": i, "title": f"Series {i}", "content_type": ContentType.SERIES.value} for i in range(1, series + 1)],
+    )
+    season_rows, episode_rows = [], []
+    for series_id in range(1, series + 1):
+        for number in range(1, seasons + 1):
+            season_id = len(season_rows) + 1
+            season_rows.append({"id": season_id, "series_id": series_id, "season_number": number})
+            for ep in range(1, episodes + 1):
+                episode_rows.append(
+                    {
+                        "season_id": season_id,
+                        "series_id": series_id,
+                        "season_number": number,
+                        "episode_number": ep,
+                        "ordinal": episode_ordinal(number, ep),
+                        "title": f"Episode {ep}",
+                    }
+                )
+    db.execute(insert(Season), season_rows)
+    for i in range(0, len(episode_rows), 10_000):
+        db.execute(insert(Episode), episode_rows[i:i + 10_000])
+    db.commit()
+
+
+def joined_season(db: Session, series_id: int, season_number: int) -> list:
+    rows = db.execute(
+        select(Episode)
+        .join(Season, Season.id == Episode.season_id)
+        .where(Season.series_id == series_id, Season.season_number == season_number)
+        .order_by(Episode.episode_number)
+    ).scalars()
+    return [EpisodeOut.model_validate(e).model_dump() for e in rows]
+
+
+def stepwise_next(db: Session, episode_id: int):
+    current = db.get(Episode, episode_id)
+    following = db.execute(
+        select(Episode)
+        .where(Episode.season_id == current.season_id, Episode.episode_number > current.episode_number)
+        .order_by(Episode.episode_number)
+        .limit(1)
+    ).scalar_one_or_none()
+    if following is not None:
+        return following
+    season = db.execute(
+        select(Season)
+        .where(Season.series_id == current.series_id, Season.season_number > current.season_number)
+        .order_by(Season.season_number)
+        .limit(1)
+    ).scalar_one_or_none()
+    if season is None:
+        return None
+    return db.execute(
+        select(Episode).where(Episode.season_id == season.id).order_by(Episode.episode_number).limit(1)
+    ).scalar_one_or_none()
+
+
+def timed(db: Session, fn, iterations: int) -> float:
+    # Start each call from an empty identity map so no variant is served from the session
+    elapsed = 0.0
+    for _ in range(iterations):
+        db.expunge_all()
+        started = time.perf_counter()
+        fn()
+        elapsed += time.perf_counter() - started
+    return elapsed / iterations * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--series", type=int, default=40)
+    parser.add_argument("--seasons", type=int, default=50)
+    parser.add_argument("--episodes-per-season", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'series.db')}")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            started = time.perf_counter()
+            seed(db, args.series, args.seasons, args.episodes_per_season)
+            total = args.series * args.seasons * args.episodes_per_season
+            print(f"seeded {total} episodes in {time.perf_counter() - started:.1f}s")
+            seasons = [(rng.randint(1, args.series), rng.randint(1, args.seasons)) for _ in range(args.iterations)]
+            episode_ids = [rng.randint(1, total) for _ in range(args.iterations)]
+            picks = iter(range(10**9))
+
+            def cold_season():
+                season_cache.clear()
+                series_id, number = seasons[next(picks) % len(seasons)]
+                return season_episodes(db, series_id, number)
+
+            def warm_season():
+                series_id, number = seasons[next(picks) % len(seasons)]
+                return season_episodes(db, series_id, number)
+
+            def join_season():
+                series_id, number = seasons[next(picks) % len(seasons)]
+                return joined_season(db, series_id, number)
+
+            for series_id, number in seasons:
+                assert season_episodes(db, series_id, number) == joined_season(db, series_id, number)
+            for episode_id in episode_ids[:20]:
+                db.expunge_all()
+                ours, theirs = next_episode(db, episode_id), stepwise_next(db, episode_id)
+                assert (ours and ours.id) == (theirs and theirs.id)
+
+            # The check above filled the season cache with every sampled season
+            rows = [
+                ("season, ordinal range (cached)", timed(db, warm_season, args.iterations)),
+                ("season, ordinal range (cold)", timed(db, cold_season, args.iterations)),
+                ("season, join on seasons", timed(db, join_season, args.iterations)),
+                ("next episode, ordinal query", timed(
+                    db, lambda: next_episode(db, episode_ids[next(picks) % len(episode_ids)]), args.iterations
+                )),
+                ("next episode, stepwise", timed(
+                    db, lambda: stepwise_next(db, episode_ids[next(picks) % len(episode_ids)]), args.iterations
+                )),
+                ("season overview", timed(
+                    db, lambda: season_overview(db, rng.randint(1, args.series)), args.iterations
+                )),
+            ]
+            for name, ms in rows:
+                print(f"{name:<32} {ms:8.3f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
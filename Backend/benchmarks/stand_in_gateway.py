@@ -0,0 +1,145 @@
+"""A local stand-in for a card gateway, and a check of the provider registry against it.
+
+StandInGateway answers POST /charges like a Stripe-style gateway: 200 with
+{"id", "status"} for tokens starting with "tok_", 402 for anything else, and the
+original charge again for a repeated Idempotency-Key. It can add latency and
+fail the next requests with scripted status codes, and it records each request's
+idempotency key and client port so callers can check retries and keep-alive reuse.
+
+Running the module points the registry's stripe provider at a stand-in gateway,
+sends --charges concurrent charges and reports the registry's latency metrics
+and how many TCP connections the pooled client opened.
+
+Usage (from Backend/): python -m benchmarks.stand_in_gateway --charges 2000 --latency-ms 5
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+class StandInGateway:
+    """Threaded HTTP/1.1 gateway stand-in bound to 127.0.0.1."""
+
+    def __init__(self, port: int = 0, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.failures: Deque[int] = deque()  # status codes for the next requests
+        self.charges: Dict[str, dict] = {}
+        self.requests: List[Tuple[Optional[str], int]] = []  # (Idempotency-Key, client port)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def connections(self) -> int:
+        """Distinct client connections seen so far."""
+        with self._lock:
+            return len({port for _, port in self.requests})
+
+    # PUBLIC_INTERFACE
+    def fail_next(self, *statuses: int) -> None:
+        """Answer the next len(statuses) requests with these status codes."""
+        with self._lock:
+            self.failures.extend(statuses)
+
+    # PUBLIC_INTERFACE
+    def start(self) -> "StandInGateway":
+        """Serve in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stand-in-gateway", daemon=True)
+        self._thread.start()
+        return self
+
+    # PUBLIC_INTERFACE
+    def stop(self) -> None:
+        """Stop serving and close the listening socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _charge(self, key: Optional[str], port: int, body: dict) -> Tuple[int, dict]:
+        with self._lock:
+            self.requests.append((key, port))
+            if self.failures:
+                return self.failures.popleft(), {"error": "scripted failure"}
+            if key is not None and key in self.charges:
+                return 200, self.charges[key]
+            if not isinstance(body.get("amount"), int) or body["amount"] < 0 or not body.get("source"):
+                return 400, {"error": "invalid request"}
+            if not str(body["source"]).startswith("tok_"):
+                return 402, {"error": "card declined"}
+            charge = {"id": f"ch_{len(self.charges) + 1:08d}", "status": "succeeded", "amount": body["amount"]}
+            self.charges[key or charge["id"]] = charge
+            return 200, charge
+
+    def _handler(self):
+        gateway = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_POST(self):
+                payload = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if gateway.latency_seconds:
+                    time.sleep(gateway.latency_seconds)
+                if self.path != "/charges":
+                    status, body = 404, {"error": "not found"}
+                else:
+                    status, body = gateway._charge(
+                        self.headers.get("Idempotency-Key"), self.client_address[1], json.loads(payload or b"{}")
+                    )
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--charges", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    from src.services.payments import PaymentProviderRegistry
+
+    gateway = StandInGateway(latency_seconds=args.latency_ms / 1000).start()
+
+    async def run() -> float:
+        registry = PaymentProviderRegistry()
+        registry.providers["stripe"].base_url = gateway.url
+        limit = asyncio.Semaphore(args.concurrency)
+
+        async def one(i: int) -> None:
+            async with limit:
+                status, _ = await registry.charge("stripe", 499, "USD", f"tok_{i}", timeout=5, idempotency_key=str(i))
+                assert status == "succeeded", status
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.charges)))
+        elapsed = time.perf_counter() - started
+        print(json.dumps(registry.metrics()["stripe"], indent=2))
+        await registry.aclose()
+        return elapsed
+
+    elapsed = asyncio.run(run())
+    gateway.stop()
+    print(f"{args.charges / elapsed:.0f} charges/s over {gateway.connections} connections")
+
+
+if __name__ == "__main__":
+    main()
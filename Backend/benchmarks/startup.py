@@ -0,0 +1,82 @@
+"""Measure worker cold-start: import time, lifespan startup and time-to-first-request.
+
+Each sample runs in a fresh interpreter so module caches, the engine and in-memory
+indexes are all cold, as they are for a worker started by an autoscaler.
+
+Usage (from Backend/): python -m benchmarks.startup --runs 5 --routers "*" content,series
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import src.api.main as main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+client = TestClient(main.app, raise_server_exceptions=False)
+t2 = time.perf_counter()
+client.__enter__()
+t3 = time.perf_counter()
+status = client.get(sys.argv[1]).status_code
+t4 = time.perf_counter()
+client.get(sys.argv[1])
+t5 = time.perf_counter()
+client.__exit__(None, None, None)
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "startup_ms": (t3 - t2) * 1000,
+    "first_request_ms": (t4 - t3) * 1000,
+    "warm_request_ms": (t5 - t4) * 1000,
+    "time_to_first_request_ms": (t4 - t0) * 1000 - (t2 - t1) * 1000,
+    "modules": len(sys.modules),
+    "status": status,
+}))
+"""
+
+METRICS = ("import_ms", "startup_ms", "first_request_ms", "warm_request_ms", "time_to_first_request_ms")
+
+
+def sample(routers: str, warm: bool, path: str, database_url: str) -> dict:
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        APP_ROUTERS=routers,
+        STARTUP_WARM_CONNECTIONS="2" if warm else "0",
+        STARTUP_WARM_CACHES="true" if warm else "false",
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, path], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--routers", nargs="+", default=["*", "content,series"], help="APP_ROUTERS values to compare")
+    parser.add_argument("--path", default="/content", help="Request path timed as the first request")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'startup.db')}"
+        sample("*", True, "/", database_url)  # create the schema once so runs compare like for like
+        print(f"{'routers':<18}{'warm':<6}" + "".join(f"{m:>26}" for m in METRICS) + f"{'modules':>9}{'status':>8}")
+        for routers in args.routers:
+            for warm in (False, True):
+                runs = [sample(routers, warm, args.path, database_url) for _ in range(args.runs)]
+                medians = {m: statistics.median(r[m] for r in runs) for m in METRICS}
+                print(
+                    f"{routers:<18}{str(warm):<6}"
+                    + "".join(f"{medians[m]:>26.1f}" for m in METRICS)
+                    + f"{runs[-1]['modules']:>9}{runs[-1]['status']:>8}"
+                )
+
+
+if __name__ == "__main__":
+    main()
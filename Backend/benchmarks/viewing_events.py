@@ -0,0 +1,123 @@
+"""Measure the viewing events store: ingestion rate and windowed top-N queries.
+
+Generates --days days of history, with --events-per-day play and heartbeat events
+on Zipf-popular titles (see benchmarks.dataset.ZipfSampler), and measures:
+- record_play calls/s, i.e. the cost added to get_stream_url;
+- flush rows/s into the day partitions;
+- top_titles over 1 hour, 24 hours and 7 days, against the same GROUP BY query on a
+  single unpartitioned table holding all days, with an index on ts.
+
+Usage (from Backend/): python -m benchmarks.viewing_events --days 30 --events-per-day 200000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - began) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--events-per-day", type=int, default=100_000)
+    parser.add_argument("--contents", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if "DATABASE_URL" not in os.environ:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'events.db')}"
+
+    from sqlalchemy import Column, Index, Integer, MetaData, SmallInteger, Table, case, func, select
+
+    from src.core import database
+    from src.services.viewing_events import HEARTBEAT, PLAY, ViewingEventStore
+
+    from benchmarks.dataset import ZipfSampler
+
+    engine = database.get_engine()
+    rng = random.Random(args.seed)
+    popularity = ZipfSampler(args.contents, 1.1, args.seed)
+    store = ViewingEventStore(enabled=True, flush_rows=10**9, max_buffer=10**9, retention_days=args.days + 1)
+
+    # The request path: one tuple appended under a lock (a throwaway store that is never flushed)
+    probe = ViewingEventStore(enabled=True, flush_rows=10**9, max_buffer=10**9)
+    calls = 200_000
+    began = time.perf_counter()
+    for i in range(calls):
+        probe.record_play(i, i % args.contents + 1)
+    print(f"record_play     {calls / (time.perf_counter() - began):12.0f} calls/s")
+
+    now = int(time.time())
+    history = []
+    for day in range(args.days):
+        for _ in range(args.events_per_day):
+            ts = now - day * 86_400 - rng.randrange(86_400)
+            if rng.random() < 0.2:
+                history.append((ts, PLAY, popularity.sample(rng), rng.randrange(1, 10**6), None, 0))
+            else:
+                history.append((ts, HEARTBEAT, popularity.sample(rng), None, rng.randrange(1, 10**6), 30))
+    for row in history:
+        store.append(row)
+    began = time.perf_counter()
+    written = store.flush()
+    print(f"flush           {written / (time.perf_counter() - began):12.0f} rows/s  ({written} rows, {args.days} days)")
+
+    # Baseline: every event in one table, filtered through an index on ts
+    metadata = MetaData()
+    single = Table(
+        "viewing_events_all",
+        metadata,
+        Column("ts", Integer, nullable=False),
+        Column("kind", SmallInteger, nullable=False),
+        Column("content_id", Integer, nullable=False),
+        Column("user_id", Integer),
+        Column("profile_id", Integer),
+        Column("watch_seconds", Integer, nullable=False),
+        Index("ix_viewing_events_all_ts", "ts"),
+    )
+    metadata.create_all(engine)
+    fields = ("ts", "kind", "content_id", "user_id", "profile_id", "watch_seconds")
+    with engine.begin() as conn:
+        conn.execute(single.insert(), [dict(zip(fields, row)) for row in history])
+
+    def unpartitioned(db, since: int, limit: int = 10):
+        plays = func.sum(case((single.c.kind == PLAY, 1), else_=0))
+        watched = func.sum(single.c.watch_seconds)
+        stmt = (
+            select(single.c.content_id, plays, watched)
+            .where(single.c.ts >= since, single.c.ts < now + 1)
+            .group_by(single.c.content_id)
+            .order_by(plays.desc(), watched.desc(), single.c.content_id)
+            .limit(limit)
+        )
+        return db.execute(stmt).all()
+
+    until = datetime.fromtimestamp(now + 1, timezone.utc)
+    with database.SessionLocal() as db:
+        for hours in (1, 24, 24 * 7):
+            since = until - timedelta(hours=hours)
+            top = store.top_titles(db, since, until)
+            baseline = unpartitioned(db, int(since.timestamp()))
+            assert [t["content_id"] for t in top] == [row[0] for row in baseline], "rankings differ"
+            partitioned_ms = _median_ms(lambda: store.top_titles(db, since, until), args.repeat)
+            single_ms = _median_ms(lambda: unpartitioned(db, int(since.timestamp())), args.repeat)
+            print(
+                f"top 10 over {hours:>3}h  partitioned {partitioned_ms:8.1f} ms  "
+                f"single table {single_ms:8.1f} ms  ({single_ms / partitioned_ms:4.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
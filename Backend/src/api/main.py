@@ -0,0 +1,147 @@
+import importlib
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Iterable, Optional
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
+
+from src.core import database
+from src.core.compression import CompressionMiddleware
+from src.core.config import get_settings
+from src.core.events import event_bus
+from src.routers import __all__ as ALL_ROUTERS
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+# PUBLIC_INTERFACE
+def resolve_routers(spec: Optional[str] = None) -> list:
+    """Turn an APP_ROUTERS style spec ("*" or "content,series") into router module names."""
+    spec = settings.APP_ROUTERS if spec is None else spec
+    if spec.strip() in ("", "*"):
+        return list(ALL_ROUTERS)
+    names = [n.strip() for n in spec.split(",") if n.strip()]
+    unknown = sorted(set(names) - set(ALL_ROUTERS))
+    if unknown:
+        raise ValueError(f"Unknown routers: {', '.join(unknown)}")
+    return names
+
+
+def _warm_up(router_names: Iterable[str], warm_connections: int, warm_caches: bool) -> None:
+    # Runs in a worker thread during startup so the event loop stays responsive.
+    started = time.perf_counter()
+    database.get_engine()
+    if settings.STARTUP_CREATE_TABLES:
+        database.init_db()
+    opened = database.warm_pool(warm_connections) if warm_connections > 0 else 0
+    if warm_caches and "content" in router_names:
+        from src.services.facets import facet_index
+
+        with database.SessionLocal() as db:
+            facet_index.build(db)
+    if warm_caches and "subscriptions" in router_names:
+        from src.services.plan_catalog import plan_catalog
+
+        with database.SessionLocal() as db:
+            plan_catalog.reload(db)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info("Startup warm-up done in %.1f ms (%d pooled connections)", elapsed_ms, opened)
+
+
+def _lifespan(router_names: list, warm_connections: int, warm_caches: bool):
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        await run_in_threadpool(_warm_up, router_names, warm_connections, warm_caches)
+        await run_in_threadpool(event_bus.start)
+        if "progress" in router_names:
+            from src.services.progress import progress_tracker
+
+            progress_tracker.start()
+        if "reviews" in router_names and settings.REVIEW_MODERATION_ENABLED:
+            from src.services.review_moderation import review_moderator
+
+            review_moderator.start()
+        record_views = settings.VIEWING_EVENTS_ENABLED and {"streaming", "progress"} & set(router_names)
+        if record_views:
+            from src.services.viewing_events import viewing_events
+
+            viewing_events.start()
+        if "subscriptions" in router_names:
+            from src.services.payment_pipeline import get_payment_pipeline
+
+            await run_in_threadpool(get_payment_pipeline().start)
+        try:
+            yield
+        finally:
+            if "subscriptions" in router_names:
+                from src.services.payment_pipeline import get_payment_pipeline
+
+                await run_in_threadpool(get_payment_pipeline().stop)
+            if "progress" in router_names:
+                from src.services.progress import progress_tracker
+
+                await run_in_threadpool(progress_tracker.stop)
+            if "reviews" in router_names:
+                from src.services.review_moderation import review_moderator
+
+                await run_in_threadpool(review_moderator.stop)
+            if record_views:
+                from src.services.viewing_events import viewing_events
+
+                await run_in_threadpool(viewing_events.stop)
+            await run_in_threadpool(event_bus.stop)
+            database.dispose_engine()
+
+    return lifespan
+
+
+# PUBLIC_INTERFACE
+def create_app(
+    routers: Optional[Iterable[str]] = None,
+    warm_connections: Optional[int] = None,
+    warm_caches: Optional[bool] = None,
+) -> FastAPI:
+    """Build the FastAPI application.
+
+    Only the requested router modules are imported. The database engine is not
+    created here but in the lifespan startup hook, which also opens a few pooled
+    connections, builds in-memory indexes and starts background workers so the
+    first request served by a fresh worker does not pay for any of it.
+    """
+    router_names = resolve_routers() if routers is None else resolve_routers(",".join(routers))
+    app = FastAPI(
+        title=settings.APP_NAME,
+        version=settings.APP_VERSION,
+        lifespan=_lifespan(
+            router_names,
+            settings.STARTUP_WARM_CONNECTIONS if warm_connections is None else warm_connections,
+            settings.STARTUP_WARM_CACHES if warm_caches is None else warm_caches,
+        ),
+    )
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_allowed_origins(),
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # PUBLIC_INTERFACE
+    @app.get("/", tags=["health"], summary="Health check")
+    def health_check():
+        """Liveness probe."""
+        return {"message": "Healthy"}
+
+    for name in router_names:
+        module = importlib.import_module(f"src.routers.{name}")
+        app.include_router(module.router)
+    return app
+
+
+app = create_app()
@@ -0,0 +1,189 @@
+import gzip
+import zlib
+from typing import Dict, Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import get_settings
+
+try:  # optional: brotli is preferred when installed, gzip is always available
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+settings = get_settings()
+
+# Server preference when the client accepts several encodings equally
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+
+# PUBLIC_INTERFACE
+def negotiate(accept_encoding: str, available: Iterable[str] = ENCODINGS) -> Optional[str]:
+    """Pick the best encoding from an Accept-Encoding header, or None for identity."""
+    available = tuple(available)
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+# PUBLIC_INTERFACE
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """One-shot compression of a complete body."""
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class _StreamEncoder:
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=level)
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+
+    def encode(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._brotli.process(data)
+            return out + self._brotli.finish() if final else out
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush() if final else out
+
+
+class PrecompressedBody:
+    """A response body stored with its compressed variants, each computed on first use.
+
+    A variant is compressed the first time a client negotiates its encoding and kept
+    for the life of the body, so a cached entry only pays for the encodings its
+    clients ask for. Variants use the (slower, denser) cache compression levels since
+    their cost is paid once per cache entry rather than per request; a variant that
+    would not be smaller than the raw body is remembered as None and the next
+    acceptable encoding (or the raw body) is served instead. Two requests racing on
+    the same missing variant may both compress it; either result is kept.
+    """
+
+    __slots__ = ("raw", "variants", "media_type")
+
+    def __init__(self, raw: bytes, media_type: str = "application/json"):
+        self.raw = raw
+        self.media_type = media_type
+        self.variants: Dict[str, Optional[bytes]] = {}
+
+    def _variant(self, encoding: str) -> Optional[bytes]:
+        try:
+            return self.variants[encoding]
+        except KeyError:
+            pass
+        levels = {"br": settings.COMPRESSION_CACHE_BROTLI_QUALITY, "gzip": settings.COMPRESSION_CACHE_GZIP_LEVEL}
+        body: Optional[bytes] = compress(self.raw, encoding, levels[encoding])
+        if len(body) >= len(self.raw):
+            body = None
+        return self.variants.setdefault(encoding, body)
+
+    # PUBLIC_INTERFACE
+    def response(self, request: Request, status_code: int = 200) -> Response:
+        """Build a response carrying the variant the client accepts best (raw if none)."""
+        headers = {"Vary": "Accept-Encoding"}
+        if len(self.raw) >= settings.COMPRESSION_MINIMUM_SIZE:
+            accept = request.headers.get("accept-encoding", "")
+            available = [e for e in ENCODINGS if self.variants.get(e, b"") is not None]
+            while True:
+                encoding = negotiate(accept, available)
+                if encoding is None:
+                    break
+                body = self._variant(encoding)
+                if body is not None:
+                    headers["Content-Encoding"] = encoding
+                    return Response(body, status_code=status_code, media_type=self.media_type, headers=headers)
+                available.remove(encoding)
+        return Response(self.raw, status_code=status_code, media_type=self.media_type, headers=headers)
+
+
+class CompressionMiddleware:
+    """Compress responses with brotli or gzip according to the client's Accept-Encoding.
+
+    Responses below minimum_size, with a non-text content type, or that already carry
+    a Content-Encoding (e.g. a PrecompressedBody variant) pass through untouched.
+    Streaming responses are compressed incrementally.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = settings.COMPRESSION_BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        encoder: Optional[_StreamEncoder] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                content_type = headers.get("content-type", "")
+                small = not more_body and len(body) < self.minimum_size
+                if "content-encoding" in headers or small or not content_type.startswith(COMPRESSIBLE_TYPES):
+                    passthrough = True
+                else:
+                    encoder = _StreamEncoder(encoding, self.levels[encoding])
+                    headers["Content-Encoding"] = encoding
+                    headers.add_vary_header("Accept-Encoding")
+                    if more_body:
+                        del headers["Content-Length"]
+                    else:
+                        body = encoder.encode(body, final=True)
+                        headers["Content-Length"] = str(len(body))
+                        message = {**message, "body": body}
+                        encoder = None
+                await send(start)
+                start = None
+                if passthrough or encoder is None:
+                    await send(message)
+                    return
+            if passthrough:
+                await send(message)
+                return
+            await send({**message, "body": encoder.encode(body, final=not more_body)})
+
+        await self.app(scope, receive, send_compressed)
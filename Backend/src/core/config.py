@@ -31,12 +31,136 @@ class Settings(BaseSettings):
     DB_NAME: Optional[str] = Field(default=None, description="Database name.")
     DB_USER: Optional[str] = Field(default=None, description="Database user.")
     DB_PASSWORD: Optional[str] = Field(default=None, description="Database password.")
+    DB_POOL_SIZE: int = Field(default=10, description="Persistent connections kept per worker (non-sqlite).")
+    DB_MAX_OVERFLOW: int = Field(default=20, description="Extra connections allowed under burst load.")
+
+    # Application startup
+    APP_ROUTERS: str = Field(
+        default="*", description="Comma separated routers to mount (e.g. content,series), '*' for all."
+    )
+    STARTUP_CREATE_TABLES: bool = Field(default=True, description="Create missing tables on startup.")
+    STARTUP_WARM_CONNECTIONS: int = Field(default=2, description="Pooled connections opened during startup.")
+    STARTUP_WARM_CACHES: bool = Field(default=True, description="Build in-memory indexes during startup.")
 
     # Payments (optional real gateway keys; we simulate payments by default)
     STRIPE_API_KEY: Optional[str] = Field(default=None, description="Stripe API key.")
     PAYPAL_CLIENT_ID: Optional[str] = Field(default=None, description="PayPal client id.")
     PAYPAL_CLIENT_SECRET: Optional[str] = Field(default=None, description="PayPal client secret.")
     UPI_PROVIDER: str = Field(default="mock", description="UPI provider (mock/razorpay/etc).")
+    STRIPE_API_BASE: Optional[str] = Field(default=None, description="Stripe gateway base URL; simulated when unset.")
+    PAYPAL_API_BASE: Optional[str] = Field(default=None, description="PayPal gateway base URL; simulated when unset.")
+    UPI_API_BASE: Optional[str] = Field(default=None, description="UPI gateway base URL; simulated when unset.")
+
+    # Payment pipeline (asynchronous charge processing)
+    PAYMENT_WORKERS: int = Field(default=8, description="Number of payment worker tasks.")
+    PAYMENT_QUEUE_SIZE: int = Field(default=1000, description="Maximum number of queued payment jobs.")
+    PAYMENT_PROVIDER_CONCURRENCY: int = Field(default=4, description="Max in-flight charges per provider.")
+    PAYMENT_CHARGE_TIMEOUT_SECONDS: float = Field(default=10.0, description="Timeout for a single charge attempt.")
+    PAYMENT_MAX_ATTEMPTS: int = Field(default=3, description="Charge attempts before a payment is marked failed.")
+    PAYMENT_RETRY_BACKOFF_SECONDS: float = Field(default=0.5, description="Base delay for exponential retry backoff.")
+    PAYMENT_RECOVERY_INTERVAL_SECONDS: float = Field(
+        default=30.0, description="How often workers look for abandoned pending payments."
+    )
+    PAYMENT_RECOVERY_AFTER_SECONDS: float = Field(
+        default=120.0, description="Pending payments untouched for this long are re-enqueued."
+    )
+    PAYMENT_WAIT_POLL_SECONDS: float = Field(
+        default=0.25, description="Status poll interval when long-polling a payment queued by another worker."
+    )
+    PAYMENT_SIMULATED_LATENCY_MS: int = Field(default=0, description="Artificial latency added to simulated charges.")
+    PAYMENT_HTTP_TIMEOUT_SECONDS: float = Field(default=10.0, description="HTTP timeout for gateway calls.")
+    PAYMENT_HTTP_MAX_CONNECTIONS: int = Field(default=100, description="Max pooled gateway connections.")
+    PAYMENT_HTTP_MAX_KEEPALIVE: int = Field(default=20, description="Max idle keep-alive gateway connections.")
+    PAYMENT_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = Field(default=30.0, description="Idle keep-alive expiry.")
+    PAYMENT_BREAKER_FAILURE_THRESHOLD: int = Field(default=5, description="Consecutive failures that open a breaker.")
+    PAYMENT_BREAKER_RESET_SECONDS: float = Field(default=30.0, description="Open breaker cool-down before a retry.")
+
+    # Caches
+    WATCHLIST_CACHE_MAX_PROFILES: int = Field(default=50_000, description="Profiles kept in the watchlist id cache.")
+    WATCHLIST_CACHE_TTL_SECONDS: float = Field(default=60.0, description="Watchlist id cache entry lifetime.")
+    SEASON_CACHE_MAX_ENTRIES: int = Field(default=5_000, description="Season episode lists kept in memory.")
+    SEASON_CACHE_TTL_SECONDS: float = Field(default=300.0, description="Season episode list cache lifetime.")
+    CATALOG_CACHE_MAX_ENTRIES: int = Field(default=256, description="Cached catalog list responses.")
+    CATALOG_CACHE_TTL_SECONDS: float = Field(default=30.0, description="Catalog list response cache lifetime.")
+    CONTENT_CACHE_MAX_ENTRIES: int = Field(default=5_000, description="Titles kept in the hot content cache.")
+    CONTENT_CACHE_TTL_SECONDS: float = Field(default=60.0, description="Hot content cache entry lifetime.")
+    CONTENT_CACHE_NEGATIVE_TTL_SECONDS: float = Field(
+        default=2.0, description="Lifetime of hot content cache entries for ids that do not exist."
+    )
+    CONTENT_CACHE_LOAD_WAIT_SECONDS: float = Field(
+        default=5.0, description="How long concurrent misses wait for an in-flight load of the same title."
+    )
+    FACET_INDEX_MAX_AGE_SECONDS: float = Field(default=300.0, description="Full facet index rebuild interval.")
+    PLAN_CATALOG_TTL_SECONDS: float = Field(default=60.0, description="Plan catalog snapshot lifetime.")
+
+    # Change events (cross-worker cache invalidation)
+    EVENT_BUS_TRANSPORT: str = Field(
+        default="local", description="How workers share change events: local (none), unix or postgres."
+    )
+    EVENT_BUS_SOCKET_DIR: str = Field(
+        default="/tmp/cinestream-events", description="Directory holding each worker's socket (unix transport)."
+    )
+    EVENT_BUS_CHANNEL: str = Field(default="cinestream_changes", description="LISTEN/NOTIFY channel (postgres).")
+
+    # Response compression
+    COMPRESSION_MINIMUM_SIZE: int = Field(default=1024, description="Smallest response body worth compressing.")
+    COMPRESSION_GZIP_LEVEL: int = Field(default=6, description="gzip level for per-request compression.")
+    COMPRESSION_BROTLI_QUALITY: int = Field(default=4, description="Brotli quality for per-request compression.")
+    COMPRESSION_CACHE_GZIP_LEVEL: int = Field(default=9, description="gzip level for precompressed cache entries.")
+    COMPRESSION_CACHE_BROTLI_QUALITY: int = Field(default=9, description="Brotli quality for cache entries.")
+
+    # Playback progress (heartbeat coalescing)
+    PROGRESS_FLUSH_INTERVAL_SECONDS: float = Field(default=10.0, description="Interval between progress flushes.")
+    PROGRESS_FLUSH_BATCH_SIZE: int = Field(default=1000, description="Rows per batched progress upsert.")
+    PROGRESS_COMPLETION_RATIO: float = Field(default=0.95, description="Watched fraction that marks a title done.")
+
+    # Viewing events (append-only analytics store)
+    VIEWING_EVENTS_ENABLED: bool = Field(default=True, description="Record play and watch-time events.")
+    VIEWING_EVENTS_FLUSH_INTERVAL_SECONDS: float = Field(default=5.0, description="Interval between event flushes.")
+    VIEWING_EVENTS_FLUSH_ROWS: int = Field(default=5_000, description="Buffered events that trigger an early flush.")
+    VIEWING_EVENTS_MAX_BUFFER: int = Field(
+        default=200_000, description="Events kept in memory while writes fail; the oldest are dropped beyond it."
+    )
+    VIEWING_EVENTS_RETENTION_DAYS: int = Field(default=90, description="Days of event partitions kept.")
+    VIEWING_EVENTS_HEARTBEAT_GAP_SECONDS: int = Field(
+        default=120, description="Most watch time one heartbeat can add (longer gaps are pauses or seeks)."
+    )
+    TRENDING_WINDOW_HOURS: float = Field(default=24.0, description="Default window of the trending rail.")
+    TRENDING_CACHE_TTL_SECONDS: float = Field(default=60.0, description="Trending ranking cache lifetime.")
+
+    # Review moderation (background spam / near-duplicate screening)
+    REVIEW_MODERATION_ENABLED: bool = Field(default=True, description="Run the review moderation pipeline.")
+    REVIEW_MODERATION_INTERVAL_SECONDS: float = Field(default=1.0, description="Pause between pending-review scans.")
+    REVIEW_MODERATION_BATCH_SIZE: int = Field(default=500, description="Reviews moderated per transaction.")
+    REVIEW_MODERATION_PROCESSES: int = Field(
+        default=0, description="Processes analysing review text; 0 analyses in the moderation thread."
+    )
+    REVIEW_MINHASH_PERMUTATIONS: int = Field(default=64, description="MinHash signature length.")
+    REVIEW_MINHASH_BANDS: int = Field(default=16, description="LSH bands the signature is split into.")
+    REVIEW_DUPLICATE_SIMILARITY: float = Field(
+        default=0.6, description="Estimated word-bigram Jaccard similarity that marks a near-duplicate."
+    )
+    REVIEW_SPAM_THRESHOLD: float = Field(default=0.7, description="Spam score at which a review is hidden.")
+
+    # Rate limiting & admission control
+    RATE_LIMIT_ENABLED: bool = Field(default=True, description="Enforce per-client token bucket limits.")
+    RATE_LIMIT_REDIS_URL: Optional[str] = Field(
+        default=None, description="Redis URL for limits shared across workers; in-process buckets when unset."
+    )
+    RATE_LIMIT_TRUST_FORWARDED_FOR: bool = Field(
+        default=False, description="Key anonymous clients by X-Forwarded-For (only behind a trusted proxy)."
+    )
+    RATE_LIMIT_LOGIN_BURST: float = Field(default=10, description="Login attempts allowed in a burst per IP.")
+    RATE_LIMIT_LOGIN_PER_SECOND: float = Field(default=0.2, description="Sustained login attempts per IP.")
+    RATE_LIMIT_STREAM_BURST: float = Field(default=30, description="Playback URL requests in a burst per user.")
+    RATE_LIMIT_STREAM_PER_SECOND: float = Field(default=1.0, description="Sustained playback URL requests per user.")
+    RATE_LIMIT_CATALOG_BURST: float = Field(default=120, description="Catalog/search requests in a burst per client.")
+    RATE_LIMIT_CATALOG_PER_SECOND: float = Field(default=20.0, description="Sustained catalog requests per client.")
+    RATE_LIMIT_SEARCH_COST: float = Field(default=4.0, description="Tokens a text search (q=) costs.")
+    ADMISSION_CATALOG_CONCURRENCY: int = Field(
+        default=16, description="Uncached catalog/search renders running at once per worker."
+    )
+    ADMISSION_WAIT_SECONDS: float = Field(default=0.5, description="Wait for a free slot before answering 503.")
 
     class Config:
         env_file = ".env"
@@ -1,40 +1,149 @@
-from contextlib import contextmanager
-from typing import Generator
+import logging
+import threading
+from typing import Callable, Generator, Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from fastapi import Depends
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from src.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
-DATABASE_URL = settings.assembled_database_url()
 
-# echo=True can be enabled for debugging
-engine = create_engine(
-    DATABASE_URL,
-    future=True,
-    pool_pre_ping=True,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-)
+_ON_COMMIT = "on_commit_callbacks"
+
+# Created on first use (or by the app lifespan) so importing this module never
+# opens a connection pool; forked workers each build their own engine.
+engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that creates the engine the first time a session is requested."""
+
+    def __call__(self, **local_kw) -> Session:
+        if engine is None:
+            get_engine()
+        return super().__call__(**local_kw)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False, future=True)
 
 Base = declarative_base()
 
 
+# PUBLIC_INTERFACE
+def get_engine(database_url: Optional[str] = None) -> Engine:
+    """Return the process-wide engine, creating it (and binding SessionLocal) on first call."""
+    global engine
+    if engine is None:
+        with _engine_lock:
+            if engine is None:
+                url = database_url or settings.assembled_database_url()
+                is_sqlite = url.startswith("sqlite")
+                pool_kw = {} if is_sqlite else {
+                    "pool_size": settings.DB_POOL_SIZE,
+                    "max_overflow": settings.DB_MAX_OVERFLOW,
+                }
+                # echo=True can be enabled for debugging
+                engine = create_engine(
+                    url,
+                    future=True,
+                    pool_pre_ping=True,
+                    connect_args={"check_same_thread": False} if is_sqlite else {},
+                    **pool_kw,
+                )
+                SessionLocal.configure(bind=engine)
+    return engine
+
+
+# PUBLIC_INTERFACE
+def warm_pool(connections: int) -> int:
+    """Open and return up to `connections` pooled connections so first requests skip the connect cost."""
+    eng = get_engine()
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(eng.connect())
+    finally:
+        for conn in opened:
+            conn.close()
+    return len(opened)
+
+
+# PUBLIC_INTERFACE
+def dispose_engine() -> None:
+    """Close every pooled connection and forget the engine (used on shutdown)."""
+    global engine
+    with _engine_lock:
+        if engine is not None:
+            engine.dispose()
+            engine = None
+
+
 # PUBLIC_INTERFACE
 def init_db() -> None:
     """Create database tables if they do not exist."""
     from src.models import models  # noqa: F401  # ensure models are imported for metadata
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
 
 
-@contextmanager
 # PUBLIC_INTERFACE
-def get_db() -> Generator:
-    """Provide a transactional scope around a series of operations."""
-    db = SessionLocal()
+def dialect_insert(db: Session, model):
+    """Return an INSERT construct for the session's dialect supporting ON CONFLICT clauses."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+# PUBLIC_INTERFACE
+def get_db() -> Generator[Session, None, None]:
+    """Request-scoped session dependency, closed (and rolled back if uncommitted) after the request.
+
+    Sessions do not expire objects on commit, so a handler can return what it just
+    wrote without the extra SELECT a db.refresh() would cost.
+    """
+    db = SessionLocal(expire_on_commit=False)
     try:
         yield db
     finally:
         db.close()
+
+
+# PUBLIC_INTERFACE
+def get_uow_db(db: Session = Depends(get_db)) -> Generator[Session, None, None]:
+    """Unit-of-work session dependency: the handler only flushes, one commit runs after it returns.
+
+    The commit happens before the response is sent, so a failing commit still turns
+    into an error response. Nothing is committed if the handler raises.
+    """
+    yield db
+    db.commit()
+
+
+# PUBLIC_INTERFACE
+def on_commit(db: Session, callback: Callable[[], None]) -> None:
+    """Run callback once the session's current transaction commits; dropped on rollback.
+
+    Use it for in-process side effects (cache invalidation, index updates) that must
+    not happen for writes that never reach the database.
+    """
+    db.info.setdefault(_ON_COMMIT, []).append(callback)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _run_on_commit(db: Session) -> None:
+    for callback in db.info.pop(_ON_COMMIT, []):
+        try:
+            callback()
+        except Exception:
+            logger.exception("on_commit callback failed")
+
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _drop_on_commit(db: Session, previous_transaction) -> None:
+    db.info.pop(_ON_COMMIT, None)
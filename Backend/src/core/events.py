@@ -0,0 +1,403 @@
+import json
+import logging
+import os
+import select
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from src.core.config import get_settings
+from src.core.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+_PENDING = "change_events"
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A committed change to one entity, e.g. ("content", 42, "update").
+
+    version is a per-process sequence number and origin identifies the publishing
+    process, so receivers can tell their own events from other workers' and notice gaps.
+    """
+
+    entity: str
+    key: Hashable
+    op: str
+    version: int
+    origin: str
+    emitted_at: float
+
+    def to_json(self) -> dict:
+        return {
+            "e": self.entity, "k": self.key, "op": self.op, "v": self.version, "o": self.origin, "t": self.emitted_at
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "ChangeEvent":
+        key = tuple(data["k"]) if isinstance(data["k"], list) else data["k"]
+        return cls(data["e"], key, data["op"], data["v"], data["o"], data["t"])
+
+
+def _batches(items: List[str], max_payload: Optional[int]) -> Iterator[bytes]:
+    """Pack JSON-encoded events into JSON array payloads of at most max_payload bytes each."""
+    batch: List[str] = []
+    size = 2  # the brackets
+    for item in items:
+        if max_payload is not None and len(item) + 2 > max_payload:
+            logger.warning("Change event dropped: %d bytes exceed the transport's payload limit", len(item))
+            continue
+        if batch and max_payload is not None and size + 1 + len(item) > max_payload:
+            yield f"[{','.join(batch)}]".encode()
+            batch, size = [], 2
+        size += len(item) + (1 if batch else 0)
+        batch.append(item)
+    if batch:
+        yield f"[{','.join(batch)}]".encode()
+
+
+class LocalTransport:
+    """Transport for a single process: events are only dispatched to local handlers."""
+
+    max_payload = None
+
+    def open(self, deliver: Callable[[bytes], None]) -> None:
+        pass
+
+    def send(self, payload: bytes) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class UnixSocketTransport:
+    """Fan events out to every worker on this host through Unix datagram sockets.
+
+    Each process binds <directory>/<pid>-<nonce>.sock and a listener thread reads it;
+    publishing sends one datagram to every other socket in the directory. Sockets of
+    dead workers are removed the first time a send to them is refused. No broker is
+    needed, but delivery is best-effort: a worker whose receive buffer is full
+    drops the event, and caches still expire on their TTL.
+    """
+
+    max_payload = 65536  # the listener's recv buffer
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path: Optional[str] = None
+        self._sock: Optional[socket.socket] = None
+        self._out = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._out.setblocking(False)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def open(self, deliver: Callable[[bytes], None]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._sock.settimeout(0.5)
+        self._stopped.clear()
+
+        def listen() -> None:
+            while not self._stopped.is_set():
+                try:
+                    payload = self._sock.recv(65536)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    return
+                deliver(payload)
+
+        self._thread = threading.Thread(target=listen, name="change-events-unix", daemon=True)
+        self._thread.start()
+
+    def send(self, payload: bytes) -> None:
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not name.endswith(".sock") or path == self.path:
+                continue
+            try:
+                self._out.sendto(payload, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            except BlockingIOError:
+                logger.warning("Change event dropped: receiver %s is not keeping up", name)
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self._sock:
+            self._sock.close()
+        if self.path and os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class PostgresNotifyTransport:
+    """Fan events out through PostgreSQL LISTEN/NOTIFY on one channel.
+
+    Every worker LISTENs on a dedicated autocommit connection polled by a thread and
+    publishes with pg_notify on a second one, so workers on different hosts sharing
+    the database all receive every event. Requires psycopg2.
+
+    A lost connection (server restart, failover, idle timeout) is reopened with
+    exponential backoff: the listener reconnects and LISTENs again, and a failed
+    pg_notify reconnects and retries once; while the database stays unreachable,
+    sends fail fast until the next attempt is due. Events published while the
+    listener was down are lost, so caches fall back to their TTL. pg_notify payloads
+    must stay under 8000 bytes; the bus splits larger batches (max_payload).
+    """
+
+    max_payload = 7999
+
+    def __init__(self, dsn: str, channel: str, backoff_seconds: float = 0.5, max_backoff_seconds: float = 30.0):
+        self.dsn = dsn
+        self.channel = channel
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._listen_conn = None
+        self._notify_conn = None
+        self._notify_lock = threading.Lock()
+        self._notify_delay = backoff_seconds
+        self._notify_retry_at = 0.0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.reconnects = 0
+
+    def _connect(self):
+        import psycopg2  # optional dependency, only needed for this transport
+
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    @staticmethod
+    def _connection_errors() -> tuple:
+        import psycopg2
+
+        return (psycopg2.OperationalError, psycopg2.InterfaceError)
+
+    @staticmethod
+    def _close_quietly(conn) -> None:
+        try:
+            if conn is not None:
+                conn.close()
+        except Exception:
+            pass
+
+    def _listen_connect(self):
+        conn = self._connect()
+        with conn.cursor() as cur:
+            cur.execute(f'LISTEN "{self.channel}"')
+        return conn
+
+    def _reconnect_listener(self) -> bool:
+        delay = self.backoff_seconds
+        while not self._stopped.is_set():
+            try:
+                self._listen_conn = self._listen_connect()
+            except self._connection_errors() as exc:
+                logger.warning("LISTEN reconnect failed (%s); retrying in %.1fs", exc, delay)
+                self._stopped.wait(delay)
+                delay = min(delay * 2, self.max_backoff_seconds)
+                continue
+            self.reconnects += 1
+            logger.info("LISTEN connection re-established; events sent meanwhile were missed")
+            return True
+        return False
+
+    def open(self, deliver: Callable[[bytes], None]) -> None:
+        self._listen_conn = self._listen_connect()
+        self._notify_conn = self._connect()
+        self._stopped.clear()
+        errors = self._connection_errors()
+
+        def listen() -> None:
+            while not self._stopped.is_set():
+                conn = self._listen_conn
+                try:
+                    if select.select([conn], [], [], 0.5) == ([], [], []):
+                        continue
+                    conn.poll()
+                except (*errors, OSError, ValueError) as exc:  # select() on a closed socket raises OSError/ValueError
+                    if self._stopped.is_set():
+                        return
+                    logger.warning("LISTEN connection lost (%s); reconnecting", exc)
+                    self._close_quietly(conn)
+                    if not self._reconnect_listener():
+                        return
+                    continue
+                while conn.notifies:
+                    deliver(conn.notifies.pop(0).payload.encode())
+
+        self._thread = threading.Thread(target=listen, name="change-events-pg", daemon=True)
+        self._thread.start()
+
+    def send(self, payload: bytes) -> None:
+        errors = self._connection_errors()
+        with self._notify_lock:
+            for retry in (False, True):
+                try:
+                    if self._notify_conn is None:
+                        if time.monotonic() < self._notify_retry_at:
+                            raise ConnectionError("pg_notify connection is down; waiting to reconnect")
+                        self._notify_conn = self._connect()
+                        self.reconnects += 1
+                    with self._notify_conn.cursor() as cur:
+                        cur.execute("SELECT pg_notify(%s, %s)", (self.channel, payload.decode()))
+                except errors:
+                    self._close_quietly(self._notify_conn)
+                    self._notify_conn = None
+                    if retry:
+                        self._notify_retry_at = time.monotonic() + self._notify_delay
+                        self._notify_delay = min(self._notify_delay * 2, self.max_backoff_seconds)
+                        raise
+                    continue
+                self._notify_delay = self.backoff_seconds
+                return
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        for conn in (self._listen_conn, self._notify_conn):
+            self._close_quietly(conn)
+
+
+class ChangeEventBus:
+    """Publishes committed entity changes to local handlers and, via a transport, to other workers.
+
+    Handlers run in the publishing thread for local events and in the transport's
+    listener thread for remote ones. remote_only handlers skip local events, for
+    state the writing request already updated itself.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Tuple[Callable[[ChangeEvent], None], bool]]] = defaultdict(list)
+        self._transport = LocalTransport()
+        self._lock = threading.Lock()
+        self._version = 0
+        self.origin = ""
+        self.published = 0
+        self.received = 0
+        self.last_delivery_ms: Optional[float] = None
+
+    # PUBLIC_INTERFACE
+    def subscribe(self, entity: str, handler: Callable[[ChangeEvent], None], remote_only: bool = False) -> None:
+        """Call handler for every committed change to entity."""
+        self._handlers[entity].append((handler, remote_only))
+
+    # PUBLIC_INTERFACE
+    def start(self, transport=None) -> None:
+        """Start receiving other workers' events (transport defaults to EVENT_BUS_TRANSPORT)."""
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        transport = transport or build_transport()
+        transport.open(self._receive)
+        self._transport = transport
+
+    # PUBLIC_INTERFACE
+    def stop(self) -> None:
+        """Stop the transport; later events are only dispatched locally."""
+        transport, self._transport = self._transport, LocalTransport()
+        transport.close()
+
+    # PUBLIC_INTERFACE
+    def publish(self, changes: List[Tuple[str, Hashable, str]]) -> List[ChangeEvent]:
+        """Dispatch (entity, key, op) changes locally and send them to the other workers."""
+        with self._lock:
+            first = self._version + 1
+            self._version += len(changes)
+        now = time.time()
+        events = [ChangeEvent(e, k, op, first + i, self.origin, now) for i, (e, k, op) in enumerate(changes)]
+        for ev in events:
+            self._dispatch(ev, remote=False)
+        self.published += len(events)
+        try:
+            for payload in _batches([json.dumps(ev.to_json()) for ev in events], self._transport.max_payload):
+                self._transport.send(payload)
+        except Exception:
+            logger.exception("Failed to send change events")
+        return events
+
+    def _receive(self, payload: bytes) -> None:
+        try:
+            events = [ChangeEvent.from_json(item) for item in json.loads(payload)]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed change event payload")
+            return
+        for ev in events:
+            if ev.origin == self.origin:
+                continue
+            self.received += 1
+            self.last_delivery_ms = (time.time() - ev.emitted_at) * 1000
+            self._dispatch(ev, remote=True)
+
+    def _dispatch(self, ev: ChangeEvent, remote: bool) -> None:
+        for handler, remote_only in self._handlers.get(ev.entity, ()):
+            if remote_only and not remote:
+                continue
+            try:
+                handler(ev)
+            except Exception:
+                logger.exception("Change event handler failed for %s %s", ev.entity, ev.key)
+
+    # PUBLIC_INTERFACE
+    def stats(self) -> Dict[str, Any]:
+        """Return publish/receive counters and the latest cross-worker delivery latency."""
+        return {
+            "transport": type(self._transport).__name__,
+            "published": self.published,
+            "received": self.received,
+            "last_delivery_ms": self.last_delivery_ms,
+        }
+
+
+# PUBLIC_INTERFACE
+def build_transport():
+    """Create the transport selected by EVENT_BUS_TRANSPORT (local, unix or postgres)."""
+    kind = settings.EVENT_BUS_TRANSPORT
+    if kind == "local":
+        return LocalTransport()
+    if kind == "unix":
+        return UnixSocketTransport(settings.EVENT_BUS_SOCKET_DIR)
+    if kind == "postgres":
+        dsn = make_url(settings.assembled_database_url()).set(drivername="postgresql")
+        return PostgresNotifyTransport(dsn.render_as_string(hide_password=False), settings.EVENT_BUS_CHANNEL)
+    raise ValueError(f"Unknown EVENT_BUS_TRANSPORT: {kind}")
+
+
+event_bus = ChangeEventBus()
+
+
+# PUBLIC_INTERFACE
+def emit(db: Session, entity: str, key: Hashable, op: str = "update") -> None:
+    """Queue a change event on the session; it is published only if the transaction commits."""
+    db.info.setdefault(_PENDING, []).append((entity, key, op))
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _publish_changes(db: Session) -> None:
+    changes = db.info.pop(_PENDING, None)
+    if changes:
+        event_bus.publish(list(dict.fromkeys(changes)))
+
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _drop_changes(db: Session, previous_transaction) -> None:
+    db.info.pop(_PENDING, None)
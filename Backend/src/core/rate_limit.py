@@ -0,0 +1,242 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from jose import JWTError, jwt
+
+from src.core.cache import MISSING, LRUCache
+from src.core.config import get_settings
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class RatePolicy:
+    """Token bucket parameters for one route group.
+
+    capacity is the burst size, refill_per_second the sustained rate. key_by chooses
+    the bucket identity: "user" (JWT user id, falling back to the client IP for
+    anonymous requests) or "ip".
+    """
+
+    name: str
+    capacity: float
+    refill_per_second: float
+    key_by: str = "user"
+
+
+class MemoryBucketStore:
+    """In-process token buckets: one [tokens, updated_at] pair per key, refilled lazily.
+
+    A bucket is only touched when a request arrives, so each check is O(1) and there
+    is no background refill work. The number of tracked keys is bounded; evicting
+    an idle key only resets that client to a full bucket.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # PUBLIC_INTERFACE
+    def take(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """Try to take cost tokens; return (allowed, seconds until enough tokens exist)."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [capacity, now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * refill_per_second)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return True, 0.0
+            return False, (cost - bucket[0]) / refill_per_second
+
+    # PUBLIC_INTERFACE
+    def clear(self) -> None:
+        """Forget every bucket."""
+        with self._lock:
+            self._buckets.clear()
+
+
+# Atomic lazy-refill token bucket for Redis-compatible stores (KEYS[1]; ARGV: capacity, rate, cost, now)
+TOKEN_BUCKET_SCRIPT = """
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class SharedBucketStore:
+    """Token buckets kept in a Redis-compatible store so every worker shares the limits.
+
+    client needs only eval(script, numkeys, *keys_and_args), which is what redis-py
+    provides; any object with that method (e.g. a local stand-in) can be used. The
+    refill runs inside the store as one atomic script, so the per-request cost is
+    a single round trip. Wall-clock time is used because workers do not share a
+    monotonic clock.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    # PUBLIC_INTERFACE
+    def take(self, key: str, capacity: float, refill_per_second: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """Try to take cost tokens; return (allowed, seconds until enough tokens exist)."""
+        allowed, tokens = self.client.eval(
+            TOKEN_BUCKET_SCRIPT, 1, self.prefix + key, capacity, refill_per_second, cost, time.time()
+        )
+        if int(allowed):
+            return True, 0.0
+        return False, (cost - float(tokens)) / refill_per_second
+
+
+class ConcurrencyLimiter:
+    """Admission control: at most `limit` requests run the guarded section at once.
+
+    Requests that cannot get a slot within wait_seconds are rejected with 503 and a
+    Retry-After header instead of queueing behind slow work and timing out anyway.
+    Use as a context manager around the expensive part of a handler.
+    """
+
+    def __init__(self, name: str, limit: int, wait_seconds: float = 0.0):
+        self.name = name
+        self.limit = limit
+        self.wait_seconds = wait_seconds
+        self._slots = threading.BoundedSemaphore(limit)
+        self.rejected = 0
+
+    def __enter__(self) -> "ConcurrencyLimiter":
+        acquired = (
+            self._slots.acquire(timeout=self.wait_seconds) if self.wait_seconds > 0 else self._slots.acquire(False)
+        )
+        if not acquired:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Server busy, retry shortly.", headers={"Retry-After": "1"})
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._slots.release()
+
+
+class RateLimiter:
+    """Checks requests against named RatePolicy buckets in a bucket store."""
+
+    def __init__(self, store, policies: Dict[str, RatePolicy], enabled: bool = True):
+        self.store = store
+        self.policies = policies
+        self.enabled = enabled
+        self._token_users = LRUCache(max_entries=50_000, ttl_seconds=300)
+        self.rejected: Dict[str, int] = {name: 0 for name in policies}
+
+    def _user_id(self, request: Request) -> Optional[str]:
+        auth = request.headers.get("authorization", "")
+        if not auth.lower().startswith("bearer "):
+            return None
+        token = auth[7:]
+        user_id = self._token_users.get(token)
+        if user_id is MISSING:
+            # Verify the signature so a forged token cannot pick someone else's bucket
+            try:
+                claims = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+                user_id = str(claims.get("user_id") or claims.get("sub") or "") or None
+            except JWTError:
+                user_id = None
+            self._token_users.set(token, user_id)
+        return user_id
+
+    @staticmethod
+    def _client_ip(request: Request) -> str:
+        if settings.RATE_LIMIT_TRUST_FORWARDED_FOR:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        return request.client.host if request.client else "unknown"
+
+    # PUBLIC_INTERFACE
+    def check(self, request: Request, policy_name: str, cost: float = 1.0) -> None:
+        """Take cost tokens from the caller's bucket for policy_name or raise 429."""
+        if not self.enabled:
+            return
+        policy = self.policies[policy_name]
+        identity = self._user_id(request) if policy.key_by == "user" else None
+        key = f"{policy.name}:u:{identity}" if identity else f"{policy.name}:ip:{self._client_ip(request)}"
+        allowed, retry_after = self.store.take(key, policy.capacity, policy.refill_per_second, cost)
+        if not allowed:
+            self.rejected[policy_name] += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests.",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+
+    # PUBLIC_INTERFACE
+    def dependency(self, policy_name: str, cost: float = 1.0):
+        """Return a FastAPI dependency that enforces policy_name.
+
+        The in-process check never blocks, so it runs as an async dependency on the
+        event loop instead of paying for a threadpool hop; shared-store checks do
+        network I/O and stay sync.
+        """
+        if isinstance(self.store, MemoryBucketStore):
+
+            async def check_async(request: Request) -> None:
+                self.check(request, policy_name, cost)
+
+            return check_async
+
+        def check(request: Request) -> None:
+            self.check(request, policy_name, cost)
+
+        return check
+
+
+def _build_store():
+    if settings.RATE_LIMIT_REDIS_URL:
+        import redis  # optional dependency, only needed for the shared backend
+
+        return SharedBucketStore(redis.Redis.from_url(settings.RATE_LIMIT_REDIS_URL))
+    return MemoryBucketStore()
+
+
+POLICIES = {
+    "login": RatePolicy("login", settings.RATE_LIMIT_LOGIN_BURST, settings.RATE_LIMIT_LOGIN_PER_SECOND, key_by="ip"),
+    "stream": RatePolicy("stream", settings.RATE_LIMIT_STREAM_BURST, settings.RATE_LIMIT_STREAM_PER_SECOND),
+    "catalog": RatePolicy("catalog", settings.RATE_LIMIT_CATALOG_BURST, settings.RATE_LIMIT_CATALOG_PER_SECOND),
+}
+
+rate_limiter = RateLimiter(_build_store(), POLICIES, enabled=settings.RATE_LIMIT_ENABLED)
+
+catalog_admission = ConcurrencyLimiter(
+    "catalog", settings.ADMISSION_CATALOG_CONCURRENCY, settings.ADMISSION_WAIT_SECONDS
+)
+
+
+# PUBLIC_INTERFACE
+def rate_limit(policy_name: str, cost: float = 1.0):
+    """Return a dependency enforcing the named policy, e.g. dependencies=[Depends(rate_limit("login"))]."""
+    return rate_limiter.dependency(policy_name, cost)
@@ -0,0 +1,11 @@
+from starlette.responses import Response
+
+
+class JSONBytesResponse(Response):
+    """Response whose body is already-encoded JSON bytes (e.g. TypeAdapter.dump_json output).
+
+    Returning it from a handler bypasses FastAPI's response_model validation and
+    jsonable_encoder pass; the response_model is still used for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
@@ -16,6 +16,8 @@ _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # OAuth2 scheme: token endpoint matches /auth/login in routers
 _oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+# Same scheme for endpoints that also serve anonymous callers
+_optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login", auto_error=False)
 
 _settings = get_settings()
 
@@ -110,3 +112,26 @@ def get_current_user(token: str = Depends(_oauth2_scheme), db: Session = Depends
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User inactive or not found.")
 
     return user
+
+
+# PUBLIC_INTERFACE
+def get_token_profile_id(token: Optional[str] = Depends(_optional_oauth2_scheme)) -> Optional[int]:
+    """Dependency returning the profile a bearer token is bound to.
+
+    Returns None for anonymous requests and account tokens. Profile tokens come
+    from POST /profiles/{profile_id}/token and carry a 'profile_id' claim.
+    """
+    if token is None:
+        return None
+    profile_id = _decode_token(token).get("profile_id")
+    return int(profile_id) if profile_id is not None else None
+
+
+# PUBLIC_INTERFACE
+def get_account_user(
+    user: User = Depends(get_current_user), profile_id: Optional[int] = Depends(get_token_profile_id)
+) -> User:
+    """Like get_current_user, but rejects profile tokens (for managing the account's profiles)."""
+    if profile_id is not None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Profile tokens cannot manage profiles.")
+    return user
@@ -0,0 +1,113 @@
+import re
+from typing import Any, Dict, FrozenSet, Optional, Tuple, Type, TypeVar
+
+from sqlalchemy import Index, UniqueConstraint, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from src.core.database import dialect_insert
+
+ModelT = TypeVar("ModelT")
+
+# Column lists in unique-violation messages: SQLite "UNIQUE constraint failed: users.email",
+# PostgreSQL detail "Key (user_id, name)=(1, Kids) already exists."
+_SQLITE_UNIQUE = re.compile(r"UNIQUE constraint failed: ([\w., ]+)")
+_PG_KEY = re.compile(r"Key \(([^)]*)\)=")
+
+
+def _unique_keys(model) -> Dict[str, FrozenSet[str]]:
+    """Map each named unique constraint/index of model's table to its column names."""
+    table = model.__table__
+    keys = {}
+    for item in list(table.constraints) + list(table.indexes):
+        unique = isinstance(item, UniqueConstraint) or (isinstance(item, Index) and item.unique)
+        if unique and item.name:
+            keys[item.name] = frozenset(c.name for c in item.columns)
+    return keys
+
+
+# PUBLIC_INTERFACE
+def unique_columns(model, constraint: str) -> Tuple[str, ...]:
+    """Return the columns of a named unique constraint or index, in table order."""
+    cols = _unique_keys(model)[constraint]
+    return tuple(c.name for c in model.__table__.columns if c.name in cols)
+
+
+# PUBLIC_INTERFACE
+def violated_constraint(exc: IntegrityError, model) -> Optional[str]:
+    """Name the unique constraint of model that exc violated, or None if it was something else.
+
+    PostgreSQL reports the constraint name directly. SQLite only lists the columns,
+    and databases created before a constraint was named may use a generated name,
+    so the column list is matched against the model's declared constraints too.
+    """
+    keys = _unique_keys(model)
+    name = getattr(getattr(exc.orig, "diag", None), "constraint_name", None)
+    if name in keys:
+        return name
+    message = str(exc.orig)
+    match = _SQLITE_UNIQUE.search(message) or _PG_KEY.search(message)
+    if not match:
+        return None
+    columns = frozenset(c.strip().rsplit(".", 1)[-1] for c in match.group(1).split(","))
+    for key, key_columns in keys.items():
+        if key_columns == columns:
+            return key
+    return None
+
+
+# PUBLIC_INTERFACE
+def insert_returning(
+    db: Session, model: Type[ModelT], values: Dict[str, Any], related: Optional[Dict[str, Any]] = None
+) -> ModelT:
+    """INSERT one row and return it as a loaded ORM object in a single statement.
+
+    Uses INSERT ... RETURNING (PostgreSQL, SQLite >= 3.35), so generated keys,
+    column defaults and server defaults come back without a follow-up SELECT.
+    Objects the caller already holds can be attached via related (relationship
+    name -> object) so serializing the result does not lazy-load them again.
+    Relationship collections are not loaded; use session.add() for rows that need them.
+    """
+    obj = db.scalars(insert(model).returning(model), [values]).one()
+    for key, value in (related or {}).items():
+        set_committed_value(obj, key, value)
+    return obj
+
+
+# PUBLIC_INTERFACE
+def insert_or_none(
+    db: Session,
+    model: Type[ModelT],
+    values: Dict[str, Any],
+    conflict: str,
+    related: Optional[Dict[str, Any]] = None,
+) -> Optional[ModelT]:
+    """INSERT ... ON CONFLICT DO NOTHING RETURNING against a named unique constraint.
+
+    Returns the new row, or None when a row with the same key already exists. The
+    database decides atomically, so concurrent writers cannot both pass a
+    SELECT-then-INSERT check, and the transaction stays usable after a conflict.
+    """
+    stmt = (
+        dialect_insert(db, model)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=list(unique_columns(model, conflict)))
+        .returning(model)
+    )
+    obj = db.scalars(stmt).first()
+    if obj is not None:
+        for key, value in (related or {}).items():
+            set_committed_value(obj, key, value)
+    return obj
+
+
+# PUBLIC_INTERFACE
+def update_returning(db: Session, model: Type[ModelT], values: Dict[str, Any], *criteria) -> Optional[ModelT]:
+    """UPDATE the row matching criteria and return it in a single statement (None if no row matched).
+
+    Ownership checks can go into criteria so a read-check-write sequence becomes a
+    single UPDATE ... RETURNING; onupdate column defaults are applied as usual.
+    """
+    stmt = update(model).where(*criteria).values(**values).returning(model)
+    return db.scalars(stmt, execution_options={"synchronize_session": False, "populate_existing": True}).first()
@@ -0,0 +1,41 @@
+import argparse
+from typing import Optional
+
+from sqlalchemy import inspect, text, update
+from sqlalchemy.engine import Engine
+
+from src.models.models import RATING_LEVEL, Content
+
+
+# PUBLIC_INTERFACE
+def upgrade(engine: Engine) -> int:
+    """Add contents.maturity_level if missing and backfill it from maturity_rating.
+
+    Safe to re-run: only rows without a level are updated, in one UPDATE. Unrated
+    titles get UNRATED_LEVEL, so restricted profiles filter them like R titles
+    instead of hiding them from everyone. Returns the number of rows backfilled.
+    """
+    existing = {c["name"] for c in inspect(engine).get_columns("contents")}
+    with engine.begin() as conn:
+        if "maturity_level" not in existing:
+            conn.execute(text("ALTER TABLE contents ADD COLUMN maturity_level INTEGER"))
+    for index in Content.__table__.indexes:
+        if "maturity_level" in index.columns:
+            index.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        result = conn.execute(
+            update(Content).where(Content.maturity_level.is_(None)).values(maturity_level=RATING_LEVEL)
+        )
+    return result.rowcount
+
+
+def main(argv: Optional[list] = None) -> None:
+    from src.core.database import get_engine
+
+    argparse.ArgumentParser(description="Add and backfill contents.maturity_level.").parse_args(argv)
+    backfilled = upgrade(get_engine())
+    print(f"backfilled maturity_level on {backfilled} contents")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import argparse
+from typing import Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from src.models.models import Payment
+
+# Existing payments are settled (or abandoned) and are not resumed: no charge token
+_COLUMNS = {
+    "idempotency_key": "VARCHAR(64)",
+    "charge_token": "VARCHAR(255)",
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+    "updated_at": "TIMESTAMP",
+}
+
+
+# PUBLIC_INTERFACE
+def upgrade(engine: Engine) -> int:
+    """Add the payment pipeline columns and indexes to an existing payments table.
+
+    Safe to re-run: only missing columns and indexes are created. updated_at is
+    backfilled from created_at. The idempotency key is enforced by a unique index
+    named like the model's constraint (SQLite cannot add constraints to a table),
+    which ON CONFLICT and the constraint-name error mapping both accept. Returns the
+    number of columns added.
+    """
+    existing = {c["name"] for c in inspect(engine).get_columns("payments")}
+    missing = [name for name in _COLUMNS if name not in existing]
+    with engine.begin() as conn:
+        for name in missing:
+            conn.execute(text(f"ALTER TABLE payments ADD COLUMN {name} {_COLUMNS[name]}"))
+        conn.execute(text("UPDATE payments SET updated_at = created_at WHERE updated_at IS NULL"))
+        conn.execute(
+            text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_payment_user_idempotency "
+                "ON payments (user_id, idempotency_key)"
+            )
+        )
+    for index in Payment.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    return len(missing)
+
+
+def main(argv: Optional[list] = None) -> None:
+    from src.core.database import get_engine
+
+    argparse.ArgumentParser(description="Add payment pipeline columns and indexes.").parse_args(argv)
+    added = upgrade(get_engine())
+    print(f"added {added} payments columns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+from typing import Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from src.core.database import Base
+from src.models.models import ContentReviewStats, RatingReview, ReviewFingerprint, ReviewLshBucket
+
+# Existing reviews predate moderation and stay visible (the column's server default)
+_COLUMNS = {
+    "status": "VARCHAR(16) NOT NULL DEFAULT 'visible'",
+    "spam_score": "FLOAT",
+    "duplicate_of_id": "INTEGER REFERENCES rating_reviews (id) ON DELETE SET NULL",
+}
+
+
+# PUBLIC_INTERFACE
+def upgrade(engine: Engine) -> int:
+    """Add the moderation columns to rating_reviews and create the moderation tables.
+
+    Safe to re-run: only missing columns, indexes and tables are created. Aggregates
+    are backfilled for every title with reviews in one INSERT ... SELECT. Returns
+    the number of columns added.
+    """
+    existing = {c["name"] for c in inspect(engine).get_columns("rating_reviews")}
+    missing = [name for name in _COLUMNS if name not in existing]
+    with engine.begin() as conn:
+        for name in missing:
+            conn.execute(text(f"ALTER TABLE rating_reviews ADD COLUMN {name} {_COLUMNS[name]}"))
+    for index in RatingReview.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    tables = [ReviewFingerprint.__table__, ReviewLshBucket.__table__, ContentReviewStats.__table__]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO content_review_stats (content_id, review_count, rating_sum, updated_at) "
+                "SELECT content_id, COUNT(id), SUM(rating), CURRENT_TIMESTAMP FROM rating_reviews "
+                "WHERE status = 'visible' AND content_id NOT IN (SELECT content_id FROM content_review_stats) "
+                "GROUP BY content_id"
+            )
+        )
+    return len(missing)
+
+
+def main(argv: Optional[list] = None) -> None:
+    from src.core.database import get_engine
+
+    argparse.ArgumentParser(description="Add review moderation columns and tables.").parse_args(argv)
+    added = upgrade(get_engine())
+    print(f"added {added} rating_reviews columns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse
+from typing import Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from src.core.database import Base
+from src.models.models import Content, Episode, Season
+
+# Titles that predate series support are movies (the column's server default)
+_CONTENT_TYPE = "VARCHAR(16) NOT NULL DEFAULT 'movie'"
+
+
+# PUBLIC_INTERFACE
+def upgrade(engine: Engine) -> int:
+    """Add contents.content_type and create the seasons and episodes tables.
+
+    Safe to re-run: the column, its index and the tables are only created when
+    missing. Returns the number of columns added.
+    """
+    existing = {c["name"] for c in inspect(engine).get_columns("contents")}
+    added = 0
+    with engine.begin() as conn:
+        if "content_type" not in existing:
+            conn.execute(text(f"ALTER TABLE contents ADD COLUMN content_type {_CONTENT_TYPE}"))
+            added = 1
+    for index in Content.__table__.indexes:
+        if "content_type" in index.columns:
+            index.create(bind=engine, checkfirst=True)
+    Base.metadata.create_all(bind=engine, tables=[Season.__table__, Episode.__table__])
+    return added
+
+
+def main(argv: Optional[list] = None) -> None:
+    from src.core.database import get_engine
+
+    argparse.ArgumentParser(description="Add series support: content_type, seasons and episodes.").parse_args(argv)
+    added = upgrade(get_engine())
+    print(f"added {added} contents columns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+from typing import Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.core.database import Base, dialect_insert
+from src.models.models import Content, ContentGenre, ContentLanguage, ContentTrack
+from src.services.content_tags import split_tags
+
+# Set-based split on PostgreSQL: one INSERT ... SELECT per tag table. Like normalize_tags,
+# tags are deduplicated case-insensitively keeping the first spelling, and a tag whose
+# other-case spelling is already stored for the title is skipped.
+_PG_SPLIT = """
+INSERT INTO {table} (content_id, {column})
+SELECT s.id, s.value
+FROM (
+    SELECT DISTINCT ON (c.id, lower(btrim(t.value))) c.id, btrim(t.value) AS value
+    FROM contents c
+    CROSS JOIN LATERAL unnest(string_to_array(c.{source}, ',')) WITH ORDINALITY AS t(value, n)
+    WHERE c.{source} IS NOT NULL AND btrim(t.value) <> ''
+    ORDER BY c.id, lower(btrim(t.value)), t.n
+) s
+WHERE NOT EXISTS (
+    SELECT 1 FROM {table} x WHERE x.content_id = s.id AND lower(x.{column}) = lower(s.value)
+)
+ON CONFLICT DO NOTHING
+"""
+
+
+# PUBLIC_INTERFACE
+def upgrade(engine: Engine, chunk_size: int = 10_000) -> int:
+    """Create the tag tables and split legacy contents.genre/language strings into them.
+
+    Safe to re-run: existing tag rows are left untouched. On PostgreSQL the split runs
+    as set-based INSERT ... SELECT statements; elsewhere contents are streamed in id
+    order and tags are bulk inserted with executemany per chunk. Returns the number of
+    content rows scanned (PostgreSQL: -1).
+    """
+    Base.metadata.create_all(
+        bind=engine, tables=[ContentGenre.__table__, ContentLanguage.__table__, ContentTrack.__table__]
+    )
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text(_PG_SPLIT.format(table="content_genres", column="genre", source="genre")))
+            conn.execute(text(_PG_SPLIT.format(table="content_languages", column="language", source="language")))
+            return -1
+
+    scanned = 0
+    last_id = 0
+    with Session(engine) as db:
+        genre_insert = dialect_insert(db, ContentGenre).on_conflict_do_nothing()
+        language_insert = dialect_insert(db, ContentLanguage).on_conflict_do_nothing()
+        while True:
+            rows = db.execute(
+                select(Content.id, Content.genre, Content.language)
+                .where(Content.id > last_id)
+                .order_by(Content.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+            genres = [{"content_id": cid, "genre": g} for cid, genre, _ in rows for g in split_tags(genre)]
+            languages = [{"content_id": cid, "language": lang} for cid, _, language in rows for lang in split_tags(language)]
+            if genres:
+                db.execute(genre_insert, genres)
+            if languages:
+                db.execute(language_insert, languages)
+            db.commit()
+            scanned += len(rows)
+            last_id = rows[-1][0]
+    return scanned
+
+
+def main(argv: Optional[list] = None) -> None:
+    from src.core.database import get_engine
+
+    parser = argparse.ArgumentParser(description="Split legacy genre/language strings into tag tables.")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args(argv)
+    scanned = upgrade(get_engine(), chunk_size=args.chunk_size)
+    print(f"split tags for {scanned if scanned >= 0 else 'all'} content rows")
+
+
+if __name__ == "__main__":
+    main()
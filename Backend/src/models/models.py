@@ -1,18 +1,25 @@
 from datetime import datetime
 from enum import Enum
+from typing import Optional
 
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     CheckConstraint,
     Column,
     DateTime,
+    Float,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
+    case,
+    func,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
 from src.core.database import Base
 
@@ -24,6 +31,48 @@ class ContentCategory(str, Enum):
     RECOMMENDED = "Recommended"
 
 
+class ContentType(str, Enum):
+    MOVIE = "movie"
+    SERIES = "series"
+
+
+class ReviewStatus(str, Enum):
+    PENDING = "pending"  # accepted, not yet moderated
+    VISIBLE = "visible"
+    HIDDEN = "hidden"  # spam or near-duplicate
+
+
+# Ordinal per rating; a profile sees titles whose level is <= its own rating's level.
+MATURITY_LEVELS = {
+    "G": 0,
+    "TV-Y": 0,
+    "TV-G": 0,
+    "TV-Y7": 1,
+    "PG": 1,
+    "TV-PG": 1,
+    "PG-13": 2,
+    "TV-14": 2,
+    "R": 3,
+    "TV-MA": 4,
+    "NC-17": 4,
+}
+
+# Unrated titles (or unknown ratings) are treated as R: hidden from child and teen
+# profiles, shown to profiles rated R and above.
+UNRATED_LEVEL = MATURITY_LEVELS["R"]
+
+
+def content_maturity_level(rating: Optional[str]) -> int:
+    """Return the level stored in Content.maturity_level for a title's rating."""
+    return MATURITY_LEVELS.get(rating, UNRATED_LEVEL) if rating else UNRATED_LEVEL
+
+
+# Episodes are ordered across a whole series by season_number * EPISODE_ORDINAL_STRIDE + episode_number
+EPISODE_ORDINAL_STRIDE = 100_000
+# Largest season whose ordinals still fit the 32-bit ordinal column
+MAX_SEASON_NUMBER = (2**31 - 1) // EPISODE_ORDINAL_STRIDE - 1
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -52,6 +101,7 @@ class Profile(Base):
     user = relationship("User", back_populates="profiles")
     watchlist_items = relationship("WatchlistItem", back_populates="profile", cascade="all, delete-orphan")
     reviews = relationship("RatingReview", back_populates="profile", cascade="all, delete-orphan")
+    playback_progress = relationship("PlaybackProgress", back_populates="profile", cascade="all, delete-orphan")
 
     __table_args__ = (UniqueConstraint("user_id", "name", name="uq_profile_user_name"),)
 
@@ -67,6 +117,10 @@ class Content(Base):
     genre = Column(String(128), nullable=True, index=True)
     language = Column(String(64), nullable=True, index=True)
     category = Column(String(32), nullable=True, index=True)
+    content_type = Column(String(16), default=ContentType.MOVIE.value, nullable=False, index=True)
+    maturity_rating = Column(String(16), nullable=True)
+    # Derived from maturity_rating; src/migrations/maturity_level.py backfills older rows
+    maturity_level = Column(Integer, default=UNRATED_LEVEL, nullable=True, index=True)
     is_premium = Column(Boolean, default=False)
     video_url = Column(String(1024), nullable=True)  # For demo, direct URL or path
     thumbnail_url = Column(String(1024), nullable=True)
@@ -74,6 +128,127 @@ class Content(Base):
 
     watchlisted_by = relationship("WatchlistItem", back_populates="content")
     reviews = relationship("RatingReview", back_populates="content")
+    seasons = relationship(
+        "Season", back_populates="series", cascade="all, delete-orphan", order_by="Season.season_number"
+    )
+    # Loaded on access; paths that render tags opt in with content_tags.TAG_LOADERS
+    genre_tags = relationship("ContentGenre", cascade="all, delete-orphan", order_by="ContentGenre.genre")
+    language_tags = relationship("ContentLanguage", cascade="all, delete-orphan", order_by="ContentLanguage.language")
+    tracks = relationship(
+        "ContentTrack", cascade="all, delete-orphan", order_by="(ContentTrack.kind, ContentTrack.language)"
+    )
+
+    @validates("maturity_rating")
+    def _sync_maturity_level(self, key, value):
+        self.maturity_level = content_maturity_level(value)
+        return value
+
+    @property
+    def genres(self) -> list:
+        return [t.genre for t in self.genre_tags]
+
+    @property
+    def languages(self) -> list:
+        return [t.language for t in self.language_tags]
+
+    @property
+    def audio_languages(self) -> list:
+        return [t.language for t in self.tracks if t.kind == TrackKind.AUDIO.value]
+
+    @property
+    def subtitle_languages(self) -> list:
+        return [t.language for t in self.tracks if t.kind == TrackKind.SUBTITLE.value]
+
+
+# SQL form of content_maturity_level(Content.maturity_rating)
+RATING_LEVEL = case(
+    *((Content.maturity_rating == rating, level) for rating, level in MATURITY_LEVELS.items()),
+    else_=UNRATED_LEVEL,
+)
+# Level to filter on: rows the migration has not backfilled yet fall back to their rating,
+# so SQL filters agree with within_ceiling and the facet index instead of dropping NULLs
+EFFECTIVE_MATURITY_LEVEL = func.coalesce(Content.maturity_level, RATING_LEVEL)
+
+
+class TrackKind(str, Enum):
+    AUDIO = "audio"
+    SUBTITLE = "subtitle"
+
+
+class ContentGenre(Base):
+    __tablename__ = "content_genres"
+
+    content_id = Column(Integer, ForeignKey("contents.id", ondelete="CASCADE"), primary_key=True)
+    genre = Column(String(64), primary_key=True)
+
+    # Filter path: genre -> content ids as an index-only scan
+    __table_args__ = (Index("ix_content_genres_genre_content", "genre", "content_id"),)
+
+
+class ContentLanguage(Base):
+    __tablename__ = "content_languages"
+
+    content_id = Column(Integer, ForeignKey("contents.id", ondelete="CASCADE"), primary_key=True)
+    language = Column(String(64), primary_key=True)
+
+    __table_args__ = (Index("ix_content_languages_language_content", "language", "content_id"),)
+
+
+class ContentTrack(Base):
+    __tablename__ = "content_tracks"
+
+    content_id = Column(Integer, ForeignKey("contents.id", ondelete="CASCADE"), primary_key=True)
+    kind = Column(String(16), primary_key=True)  # audio, subtitle
+    language = Column(String(64), primary_key=True)
+
+    __table_args__ = (Index("ix_content_tracks_kind_language_content", "kind", "language", "content_id"),)
+
+
+class Season(Base):
+    __tablename__ = "seasons"
+
+    id = Column(Integer, primary_key=True, index=True)
+    series_id = Column(Integer, ForeignKey("contents.id", ondelete="CASCADE"), nullable=False)
+    season_number = Column(Integer, nullable=False)
+    title = Column(String(255), nullable=True)
+    description = Column(Text, nullable=True)
+    release_year = Column(Integer, nullable=True)
+
+    series = relationship("Content", back_populates="seasons")
+    episodes = relationship(
+        "Episode", back_populates="season", cascade="all, delete-orphan", order_by="Episode.episode_number"
+    )
+
+    __table_args__ = (
+        UniqueConstraint("series_id", "season_number", name="uq_season_series_number"),
+        CheckConstraint("season_number >= 0", name="chk_season_number_nonnegative"),
+    )
+
+
+class Episode(Base):
+    __tablename__ = "episodes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    season_id = Column(Integer, ForeignKey("seasons.id", ondelete="CASCADE"), nullable=False)
+    # Denormalized from the season so series-wide ordering is a single index range scan
+    series_id = Column(Integer, ForeignKey("contents.id", ondelete="CASCADE"), nullable=False)
+    season_number = Column(Integer, nullable=False)
+    episode_number = Column(Integer, nullable=False)
+    ordinal = Column(Integer, nullable=False)
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    duration_minutes = Column(Integer, nullable=True)
+    video_url = Column(String(1024), nullable=True)
+    thumbnail_url = Column(String(1024), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    season = relationship("Season", back_populates="episodes")
+
+    __table_args__ = (
+        UniqueConstraint("season_id", "episode_number", name="uq_episode_season_number"),
+        UniqueConstraint("series_id", "ordinal", name="uq_episode_series_ordinal"),
+        CheckConstraint("episode_number >= 1", name="chk_episode_number_positive"),
+    )
 
 
 class WatchlistItem(Base):
@@ -94,7 +269,7 @@ class SubscriptionPlan(Base):
     __tablename__ = "subscription_plans"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(64), unique=True, nullable=False)
+    name = Column(String(64), nullable=False)
     price_cents = Column(Integer, nullable=False)
     currency = Column(String(8), default="USD", nullable=False)
     quality_limit = Column(String(16), default="1080p", nullable=False)
@@ -103,6 +278,8 @@ class SubscriptionPlan(Base):
 
     subscriptions = relationship("Subscription", back_populates="plan")
 
+    __table_args__ = (UniqueConstraint("name", name="uq_plan_name"),)
+
 
 class Subscription(Base):
     __tablename__ = "subscriptions"
@@ -128,11 +305,21 @@ class Payment(Base):
     provider = Column(String(32), nullable=False)  # stripe, paypal, upi
     provider_ref = Column(String(128), nullable=True)  # intent id / transaction id
     status = Column(String(32), default="succeeded", nullable=False)  # succeeded, failed, pending
+    idempotency_key = Column(String(64), nullable=True)
+    # Provider token of a pending charge, kept so another worker can resume it; cleared once settled
+    charge_token = Column(String(255), nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     user = relationship("User", back_populates="payments")
 
-    __table_args__ = (CheckConstraint("amount_cents >= 0", name="chk_payment_amount_nonnegative"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "idempotency_key", name="uq_payment_user_idempotency"),
+        Index("ix_payments_provider_ref", "provider", "provider_ref"),
+        Index("ix_payments_status_updated", "status", "updated_at"),
+        CheckConstraint("amount_cents >= 0", name="chk_payment_amount_nonnegative"),
+    )
 
 
 class RatingReview(Base):
@@ -144,6 +331,12 @@ class RatingReview(Base):
     rating = Column(Integer, nullable=False)
     review_text = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # New reviews wait for the moderation pipeline; rows written outside the app count as moderated
+    status = Column(
+        String(16), default=ReviewStatus.PENDING.value, server_default=ReviewStatus.VISIBLE.value, nullable=False
+    )
+    spam_score = Column(Float, nullable=True)
+    duplicate_of_id = Column(Integer, ForeignKey("rating_reviews.id", ondelete="SET NULL"), nullable=True)
 
     profile = relationship("Profile", back_populates="reviews")
     content = relationship("Content", back_populates="reviews")
@@ -151,4 +344,53 @@ class RatingReview(Base):
     __table_args__ = (
         UniqueConstraint("profile_id", "content_id", name="uq_review_profile_content"),
         CheckConstraint("rating >= 1 AND rating <= 5", name="chk_rating_range"),
+        # Serves the moderation pipeline's scan for pending reviews in id order
+        Index("ix_reviews_status_id", "status", "id"),
+    )
+
+
+class ReviewFingerprint(Base):
+    __tablename__ = "review_fingerprints"
+
+    review_id = Column(Integer, ForeignKey("rating_reviews.id", ondelete="CASCADE"), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)  # MinHash of the review text, packed uint32 values
+
+
+class ReviewLshBucket(Base):
+    __tablename__ = "review_lsh_buckets"
+
+    # One row per (signature band hash, review): reviews sharing a bucket are near-duplicate candidates
+    bucket = Column(BigInteger, primary_key=True)
+    review_id = Column(Integer, ForeignKey("rating_reviews.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+
+class ContentReviewStats(Base):
+    __tablename__ = "content_review_stats"
+
+    # Aggregates over visible reviews, refreshed in bulk by the moderation pipeline
+    content_id = Column(Integer, ForeignKey("contents.id", ondelete="CASCADE"), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class PlaybackProgress(Base):
+    __tablename__ = "playback_progress"
+
+    id = Column(Integer, primary_key=True, index=True)
+    profile_id = Column(Integer, ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False)
+    content_id = Column(Integer, ForeignKey("contents.id", ondelete="CASCADE"), nullable=False, index=True)
+    position_seconds = Column(Integer, nullable=False, default=0)
+    duration_seconds = Column(Integer, nullable=True)
+    completed = Column(Boolean, default=False, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    profile = relationship("Profile", back_populates="playback_progress")
+    content = relationship("Content")
+
+    __table_args__ = (
+        UniqueConstraint("profile_id", "content_id", name="uq_progress_profile_content"),
+        # Serves the continue-watching rail: latest unfinished titles per profile
+        Index("ix_progress_profile_completed_updated", "profile_id", "completed", "updated_at"),
+        CheckConstraint("position_seconds >= 0", name="chk_progress_position_nonnegative"),
     )
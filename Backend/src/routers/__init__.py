@@ -1,3 +1,23 @@
-# Expose routers as package
-from . import admin, auth, content, profiles, reviews, streaming, subscriptions
-from . import watchlist  # noqa: F401  # imported for side-effects
+# Expose routers as package. Submodules are imported on first access so an app
+# that mounts only a few routers does not pay for (or initialise) the others.
+import importlib
+
+__all__ = [
+    "admin",
+    "auth",
+    "content",
+    "profiles",
+    "progress",
+    "reviews",
+    "series",
+    "streaming",
+    "subscriptions",
+    "users",
+    "watchlist",
+]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
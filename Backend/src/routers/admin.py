@@ -1,10 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from src.core.database import get_db
+from src.core.events import event_bus
 from src.core.security import get_current_user
-from src.models.models import Content, Payment, Subscription, User
+from src.models.models import Content, Payment, RatingReview, ReviewStatus, Subscription, User
+from src.services.catalog_cache import catalog_cache
+from src.services.content_cache import content_cache
+from src.services.payments import get_payment_registry
+from src.services.plan_catalog import plan_catalog
+from src.services.review_moderation import review_moderator
+from src.services.series import season_cache
+from src.services.viewing_events import viewing_events
+from src.services.watchlist_cache import watchlist_cache
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -29,3 +41,64 @@ def analytics_summary(current_user: User = Depends(get_current_user), db: Sessio
         "active_subscriptions": active_subs,
         "revenue_cents": int(revenue_cents),
     }
+
+
+# PUBLIC_INTERFACE
+@router.get("/analytics/top-titles", summary="Most played or most watched titles in a window")
+def analytics_top_titles(
+    hours: float = Query(24.0, gt=0, le=24 * 365),
+    limit: int = Query(10, ge=1, le=100),
+    by: Literal["plays", "watch_seconds"] = "plays",
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Rank titles by plays or watch time over the last `hours` hours from the viewing events store.
+
+    Only the day partitions overlapping the window are read. Events still buffered
+    in a worker (at most VIEWING_EVENTS_FLUSH_INTERVAL_SECONDS old) are not counted.
+    """
+    ensure_admin(current_user)
+    until = datetime.now(timezone.utc)
+    ranked = viewing_events.top_titles(db, until - timedelta(hours=hours), until, limit=limit, by=by)
+    titles = dict(
+        db.query(Content.id, Content.title).filter(Content.id.in_([r["content_id"] for r in ranked])).all()
+    )
+    return {
+        "since": until - timedelta(hours=hours),
+        "until": until,
+        "by": by,
+        "titles": [{**r, "title": titles.get(r["content_id"])} for r in ranked],
+        "ingestion": viewing_events.stats(),
+    }
+
+
+# PUBLIC_INTERFACE
+@router.get("/payments/providers", summary="Payment provider health and latency metrics")
+def payment_provider_metrics(current_user: User = Depends(get_current_user)):
+    """Return circuit breaker state and latency percentiles for each payment provider."""
+    ensure_admin(current_user)
+    return get_payment_registry().metrics()
+
+
+# PUBLIC_INTERFACE
+@router.get("/reviews/moderation", summary="Review moderation pipeline status")
+def review_moderation_metrics(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Return this worker's moderation counters and the size of the pending backlog."""
+    ensure_admin(current_user)
+    pending = db.query(func.count(RatingReview.id)).filter(RatingReview.status == ReviewStatus.PENDING.value).scalar()
+    return {**review_moderator.stats(), "pending": pending or 0}
+
+
+# PUBLIC_INTERFACE
+@router.get("/caches", summary="In-memory cache hit rates")
+def cache_metrics(current_user: User = Depends(get_current_user)):
+    """Return size and hit-rate counters for this worker's in-memory caches."""
+    ensure_admin(current_user)
+    return {
+        "content": content_cache.stats(),
+        "catalog": catalog_cache.stats(),
+        "seasons": season_cache.stats(),
+        "watchlist": watchlist_cache.stats(),
+        "plans": plan_catalog.stats(),
+        "change_events": event_bus.stats(),
+    }
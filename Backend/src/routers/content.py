@@ -1,49 +1,186 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from src.core.database import get_db
+from src.core.config import get_settings
+from src.core.database import get_db, get_uow_db, on_commit
+from src.core.events import emit
+from src.core.rate_limit import catalog_admission, rate_limiter
+from src.core.responses import JSONBytesResponse
 from src.core.security import get_current_user
-from src.models.models import Content, User
-from src.schemas.schemas import ContentCreate, ContentOut, ContentUpdate
+from src.models.models import (
+    EFFECTIVE_MATURITY_LEVEL,
+    Content,
+    ContentGenre,
+    ContentLanguage,
+    ContentTrack,
+    ContentType,
+    Season,
+    TrackKind,
+    User,
+)
+from src.schemas.schemas import ContentCreate, ContentOut, ContentUpdate, FacetCountsOut
+from src.services.catalog_cache import catalog_cache
+from src.services.content_cache import content_cache
+from src.services.content_tags import TAG_FIELDS, apply_content_tags
+from src.services.facets import facet_index
+from src.services.listings import content_rows, dump_rows
+from src.services.maturity import get_maturity_ceiling, within_ceiling
+from src.services.viewing_events import trending
 
 router = APIRouter(prefix="/content", tags=["content"])
+settings = get_settings()
 
 
 # PUBLIC_INTERFACE
 @router.get("", response_model=list[ContentOut], summary="List and search content")
 def list_content(
+    request: Request,
     q: Optional[str] = Query(None, description="Search text in title/description"),
     genre: Optional[str] = None,
     language: Optional[str] = None,
     release_year: Optional[int] = None,
     category: Optional[str] = None,
+    audio_language: Optional[str] = None,
+    subtitle_language: Optional[str] = None,
+    ceiling: Optional[int] = Depends(get_maturity_ceiling),
     db: Session = Depends(get_db),
 ):
-    """List content with optional filtering parameters."""
+    """List content with optional filtering parameters.
+
+    Genre, language and track filters match any of a title's tags; each is an
+    index-only lookup on its tag table and the database intersects the id sets.
+    Passing profile_id (or max_rating) hides titles above that maturity rating.
+    Rendered responses are cached per filter set, each gzip/brotli variant
+    compressed on first use, so repeated catalog pages cost neither a query nor
+    compression.
+    Callers are rate limited (text searches cost more tokens) and cache misses
+    go through admission control, answering 503 when too many renders are running.
+    """
+    rate_limiter.check(request, "catalog", settings.RATE_LIMIT_SEARCH_COST if q else 1.0)
+    key = (q, genre, language, release_year, category, audio_language, subtitle_language, ceiling)
+
+    def render() -> bytes:
+        with catalog_admission:
+            return _render_catalog(
+                db, q, genre, language, release_year, category, audio_language, subtitle_language, ceiling
+            )
+
+    body = catalog_cache.get_or_render(key, render)
+    return body.response(request)
+
+
+def _render_catalog(
+    db: Session,
+    q: Optional[str],
+    genre: Optional[str],
+    language: Optional[str],
+    release_year: Optional[int],
+    category: Optional[str],
+    audio_language: Optional[str],
+    subtitle_language: Optional[str],
+    ceiling: Optional[int],
+) -> bytes:
     query = db.query(Content)
+    if ceiling is not None:
+        query = query.filter(EFFECTIVE_MATURITY_LEVEL <= ceiling)
     if q:
         query = query.filter(Content.title.ilike(f"%{q}%"))
     if genre:
-        query = query.filter(Content.genre == genre)
+        query = query.filter(Content.id.in_(select(ContentGenre.content_id).where(ContentGenre.genre == genre)))
     if language:
-        query = query.filter(Content.language == language)
+        query = query.filter(
+            Content.id.in_(select(ContentLanguage.content_id).where(ContentLanguage.language == language))
+        )
+    for kind, track_language in ((TrackKind.AUDIO, audio_language), (TrackKind.SUBTITLE, subtitle_language)):
+        if track_language:
+            query = query.filter(
+                Content.id.in_(
+                    select(ContentTrack.content_id).where(
+                        ContentTrack.kind == kind.value, ContentTrack.language == track_language
+                    )
+                )
+            )
     if release_year:
         query = query.filter(Content.release_year == release_year)
     if category:
         query = query.filter(Content.category == category)
-    return query.order_by(Content.created_at.desc()).all()
+    return dump_rows(content_rows(db, query.order_by(Content.created_at.desc())))
+
+
+# PUBLIC_INTERFACE
+@router.get("/facets", response_model=FacetCountsOut, summary="Facet counts for the current filters")
+def content_facets(
+    request: Request,
+    q: Optional[str] = Query(None, description="Search text in title/description"),
+    genre: Optional[str] = None,
+    language: Optional[str] = None,
+    release_year: Optional[int] = None,
+    category: Optional[str] = None,
+    ceiling: Optional[int] = Depends(get_maturity_ceiling),
+    db: Session = Depends(get_db),
+):
+    """Return how many titles each genre/language/year/category value has under the given filters.
+
+    A facet's own filter is ignored when counting that facet, so clients can show
+    sibling values alongside the selected one.
+    """
+    rate_limiter.check(request, "catalog", settings.RATE_LIMIT_SEARCH_COST if q else 1.0)
+    base_ids = None
+    if q:
+        with catalog_admission:
+            base_ids = db.execute(select(Content.id).where(Content.title.ilike(f"%{q}%"))).scalars().all()
+    total, facets = facet_index.counts(
+        db,
+        {"genre": genre, "language": language, "release_year": release_year, "category": category},
+        base_ids=base_ids,
+        max_level=ceiling,
+    )
+    return FacetCountsOut(
+        total=total,
+        facets={facet: {str(value): n for value, n in counts.items()} for facet, counts in facets.items()},
+    )
+
+
+# PUBLIC_INTERFACE
+@router.get("/trending", response_model=list[ContentOut], summary="Most played titles right now")
+def trending_content(
+    hours: float = Query(settings.TRENDING_WINDOW_HOURS, gt=0, le=24 * 30, description="Ranking window"),
+    limit: int = Query(20, ge=1, le=100),
+    ceiling: Optional[int] = Depends(get_maturity_ceiling),
+    db: Session = Depends(get_db),
+):
+    """List the titles with the most plays in the last `hours` hours, most played first.
+
+    The ranking comes from the viewing events store and is cached for
+    TRENDING_CACHE_TTL_SECONDS; titles are served from the hot content cache.
+    Extra candidates are ranked so titles above the maturity ceiling can be
+    skipped without shortening the page.
+    """
+    bodies = []
+    for item in trending(db, hours, limit * 3):
+        record = content_cache.get(db, item["content_id"])
+        if record is not None and within_ceiling(record.maturity_level, ceiling):
+            bodies.append(record.body)
+            if len(bodies) == limit:
+                break
+    return JSONBytesResponse(b"[" + b",".join(bodies) + b"]")
 
 
 # PUBLIC_INTERFACE
 @router.get("/{content_id}", response_model=ContentOut, summary="Get content by id")
-def get_content(content_id: int, db: Session = Depends(get_db)):
-    """Retrieve content details by id."""
-    content = db.get(Content, content_id)
-    if not content:
+def get_content(
+    content_id: int,
+    ceiling: Optional[int] = Depends(get_maturity_ceiling),
+    db: Session = Depends(get_db),
+):
+    """Retrieve content details by id (served from the hot content cache)."""
+    record = content_cache.get(db, content_id)
+    if record is None or not within_ceiling(record.maturity_level, ceiling):
         raise HTTPException(status_code=404, detail="Content not found.")
-    return content
+    return JSONBytesResponse(record.body)
 
 
 # Admin endpoints - require admin
@@ -58,14 +195,16 @@ def ensure_admin(user: User):
 def admin_create_content(
     payload: ContentCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow_db),
 ):
     """Admin: Create new content."""
     ensure_admin(current_user)
-    content = Content(**payload.model_dump())
+    content = Content(**payload.model_dump(exclude=TAG_FIELDS))
+    apply_content_tags(content, payload)
     db.add(content)
-    db.commit()
-    db.refresh(content)
+    db.flush()
+    on_commit(db, lambda: facet_index.upsert(content))
+    emit(db, "content", content.id, "insert")
     return content
 
 
@@ -75,18 +214,30 @@ def admin_update_content(
     content_id: int,
     payload: ContentUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow_db),
 ):
-    """Admin: Update existing content."""
+    """Admin: Update existing content.
+
+    Only the fields present in the body change; omitted ones (tags included) keep
+    their stored values. A series cannot become a movie while it has seasons.
+    """
     ensure_admin(current_user)
     content = db.get(Content, content_id)
     if not content:
         raise HTTPException(status_code=404, detail="Content not found.")
-    for k, v in payload.model_dump().items():
+    changes = payload.model_dump(exclude_unset=True, exclude=TAG_FIELDS)
+    retyped = "content_type" in changes and changes["content_type"] != content.content_type
+    if retyped and db.query(Season.id).filter(Season.series_id == content_id).first() is not None:
+        raise HTTPException(status_code=409, detail="Delete the seasons before changing the content type.")
+    for k, v in changes.items():
         setattr(content, k, v)
+    apply_content_tags(content, payload, partial=True)
     db.add(content)
-    db.commit()
-    db.refresh(content)
+    db.flush()
+    on_commit(db, lambda: facet_index.upsert(content))
+    emit(db, "content", content.id, "update")
+    if retyped:
+        emit(db, "series", content.id, "update")
     return content
 
 
@@ -95,7 +246,7 @@ def admin_update_content(
 def admin_delete_content(
     content_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow_db),
 ):
     """Admin: Delete content by id."""
     ensure_admin(current_user)
@@ -103,5 +254,8 @@ def admin_delete_content(
     if not content:
         raise HTTPException(status_code=404, detail="Content not found.")
     db.delete(content)
-    db.commit()
+    on_commit(db, lambda: facet_index.remove(content_id))
+    emit(db, "content", content_id, "delete")
+    if content.content_type == ContentType.SERIES.value:
+        emit(db, "series", content_id, "delete")
     return None
@@ -1,10 +1,16 @@
+from datetime import timedelta
+
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from src.core.database import get_db
-from src.core.security import get_current_user
+from src.core.database import get_db, get_uow_db, on_commit
+from src.core.events import emit
+from src.core.security import create_access_token, get_account_user, get_current_user
+from src.core.writes import insert_or_none, update_returning, violated_constraint
 from src.models.models import Profile, User
-from src.schemas.schemas import ProfileCreate, ProfileOut, ProfileUpdate
+from src.schemas.schemas import ProfileCreate, ProfileOut, ProfileUpdate, Token
+from src.services.progress import progress_tracker
 
 router = APIRouter(prefix="/profiles", tags=["profiles"])
 
@@ -18,45 +24,71 @@ def list_profiles(current_user: User = Depends(get_current_user), db: Session =
 
 # PUBLIC_INTERFACE
 @router.post("", response_model=ProfileOut, summary="Create a new profile")
-def create_profile(payload: ProfileCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def create_profile(
+    payload: ProfileCreate, current_user: User = Depends(get_account_user), db: Session = Depends(get_uow_db)
+):
     """Create a new profile under current user's account."""
-    exists = db.query(Profile).filter(Profile.user_id == current_user.id, Profile.name == payload.name).first()
-    if exists:
+    profile = insert_or_none(
+        db, Profile, {"user_id": current_user.id, **payload.model_dump()}, conflict="uq_profile_user_name"
+    )
+    if profile is None:
         raise HTTPException(status_code=400, detail="Profile name already exists.")
-    profile = Profile(user_id=current_user.id, **payload.model_dump())
-    db.add(profile)
-    db.commit()
-    db.refresh(profile)
     return profile
 
 
+# PUBLIC_INTERFACE
+@router.post("/{profile_id}/token", response_model=Token, summary="Issue a token for viewing as a profile")
+def create_profile_token(
+    profile_id: int, current_user: User = Depends(get_account_user), db: Session = Depends(get_db)
+):
+    """Issue an access token bound to one of the current user's profiles.
+
+    Catalog and series requests made with it always apply the profile's maturity
+    ceiling, and it cannot be used to create, change or delete profiles.
+    """
+    owner = db.query(Profile.user_id).filter(Profile.id == profile_id).scalar()
+    if owner != current_user.id:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    token = create_access_token(
+        subject={"user_id": current_user.id, "profile_id": profile_id}, expires_delta=timedelta(minutes=60)
+    )
+    return Token(access_token=token, token_type="bearer")
+
+
 # PUBLIC_INTERFACE
 @router.put("/{profile_id}", response_model=ProfileOut, summary="Update profile by id")
 def update_profile(
     profile_id: int,
     payload: ProfileUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: User = Depends(get_account_user),
+    db: Session = Depends(get_uow_db),
 ):
     """Update an existing profile."""
-    profile = db.get(Profile, profile_id)
-    if not profile or profile.user_id != current_user.id:
+    try:
+        profile = update_returning(
+            db, Profile, payload.model_dump(), Profile.id == profile_id, Profile.user_id == current_user.id
+        )
+    except IntegrityError as e:
+        db.rollback()
+        if violated_constraint(e, Profile) == "uq_profile_user_name":
+            raise HTTPException(status_code=400, detail="Profile name already exists.")
+        raise
+    if not profile:
         raise HTTPException(status_code=404, detail="Profile not found.")
-    for k, v in payload.model_dump().items():
-        setattr(profile, k, v)
-    db.add(profile)
-    db.commit()
-    db.refresh(profile)
+    emit(db, "profile", profile_id, "update")
     return profile
 
 
 # PUBLIC_INTERFACE
 @router.delete("/{profile_id}", summary="Delete profile by id", status_code=204)
-def delete_profile(profile_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_profile(
+    profile_id: int, current_user: User = Depends(get_account_user), db: Session = Depends(get_uow_db)
+):
     """Delete a profile by id."""
     profile = db.get(Profile, profile_id)
     if not profile or profile.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Profile not found.")
     db.delete(profile)
-    db.commit()
+    emit(db, "profile", profile_id, "delete")
+    on_commit(db, lambda: progress_tracker.forget_profile(profile_id))
     return None
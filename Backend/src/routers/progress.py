@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from src.core.database import get_db
+from src.core.security import get_current_user
+from src.models.models import User
+from src.schemas.schemas import ContinueWatchingOut, ProgressHeartbeat
+from src.services.progress import progress_tracker
+from src.services.viewing_events import viewing_events
+
+router = APIRouter(prefix="/progress", tags=["progress"])
+
+
+def _ensure_profile(profile_id: int, user: User, db: Session) -> None:
+    if progress_tracker.profile_owner(db, profile_id) != user.id:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+
+
+# PUBLIC_INTERFACE
+@router.put("/{profile_id}/content/{content_id}", status_code=204, summary="Report playback position")
+def report_progress(
+    profile_id: int,
+    content_id: int,
+    payload: ProgressHeartbeat,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Player heartbeat: record the current position for a title.
+
+    Heartbeats are coalesced in memory and persisted in periodic batches.
+    """
+    _ensure_profile(profile_id, current_user, db)
+    previous = progress_tracker.last_position(db, profile_id, content_id) if viewing_events.enabled else None
+    progress_tracker.record(profile_id, content_id, payload.position_seconds, payload.duration_seconds)
+    viewing_events.record_heartbeat(current_user.id, profile_id, content_id, payload.position_seconds, previous)
+    return None
+
+
+# PUBLIC_INTERFACE
+@router.get(
+    "/{profile_id}/continue-watching",
+    response_model=list[ContinueWatchingOut],
+    summary="Continue watching rail for a profile",
+)
+def continue_watching(
+    profile_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """List partially watched titles for a profile, most recent first."""
+    _ensure_profile(profile_id, current_user, db)
+    return progress_tracker.continue_watching(db, profile_id, limit)
@@ -1,10 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from src.core.database import get_db
+from src.core.database import get_db, get_uow_db, on_commit
+from src.core.responses import JSONBytesResponse
 from src.core.security import get_current_user
-from src.models.models import Content, Profile, RatingReview, User
-from src.schemas.schemas import ReviewCreate, ReviewOut, ReviewUpdate
+from src.core.writes import insert_or_none, update_returning
+from src.models.models import Content, ContentReviewStats, Profile, RatingReview, ReviewStatus, User
+from src.schemas.schemas import ReviewCreate, ReviewOut, ReviewSummaryOut, ReviewUpdate
+from src.services.listings import dump_rows, review_rows
+from src.services.review_moderation import forget_review, review_moderator
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
@@ -20,10 +25,22 @@ def _ensure_profile(profile_id: int, user: User, db: Session) -> Profile:
 @router.get("/content/{content_id}", response_model=list[ReviewOut], summary="List reviews for content")
 def list_reviews_for_content(content_id: int, db: Session = Depends(get_db)):
     """List all reviews for a content item."""
-    content = db.get(Content, content_id)
-    if not content:
+    if db.scalar(select(Content.id).where(Content.id == content_id)) is None:
         raise HTTPException(status_code=404, detail="Content not found.")
-    return db.query(RatingReview).filter(RatingReview.content_id == content_id).all()
+    return JSONBytesResponse(dump_rows(review_rows(db, content_id)))
+
+
+# PUBLIC_INTERFACE
+@router.get("/content/{content_id}/summary", response_model=ReviewSummaryOut, summary="Rating summary for content")
+def review_summary(content_id: int, db: Session = Depends(get_db)):
+    """Return the number of moderated reviews and the average rating of a content item."""
+    stats = db.get(ContentReviewStats, content_id)
+    if stats is None:
+        if db.scalar(select(Content.id).where(Content.id == content_id)) is None:
+            raise HTTPException(status_code=404, detail="Content not found.")
+        return ReviewSummaryOut(content_id=content_id)
+    average = round(stats.rating_sum / stats.review_count, 2) if stats.review_count else None
+    return ReviewSummaryOut(content_id=content_id, review_count=stats.review_count, average_rating=average)
 
 
 # PUBLIC_INTERFACE
@@ -33,24 +50,25 @@ def add_review(
     content_id: int,
     payload: ReviewCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow_db),
 ):
-    """Add a rating and optional review for content by profile."""
+    """Add a rating and optional review for content by profile.
+
+    The review is stored as pending and listed right away; the moderation pipeline
+    hides it later if it turns out to be spam or a near-duplicate.
+    """
     _ensure_profile(profile_id, current_user, db)
-    content = db.get(Content, content_id)
-    if not content:
+    # Existence check only: the id is all the insert needs
+    if db.scalar(select(Content.id).where(Content.id == content_id)) is None:
         raise HTTPException(status_code=404, detail="Content not found.")
-    existing = (
-        db.query(RatingReview)
-        .filter(RatingReview.profile_id == profile_id, RatingReview.content_id == content_id)
-        .first()
+    review = insert_or_none(
+        db,
+        RatingReview,
+        {"profile_id": profile_id, "content_id": content_id, **payload.model_dump()},
+        conflict="uq_review_profile_content",
     )
-    if existing:
+    if review is None:
         raise HTTPException(status_code=400, detail="Review already exists.")
-    review = RatingReview(profile_id=profile_id, content_id=content_id, **payload.model_dump())
-    db.add(review)
-    db.commit()
-    db.refresh(review)
     return review
 
 
@@ -60,26 +78,28 @@ def update_review(
     review_id: int,
     payload: ReviewUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow_db),
 ):
     """Update an existing review created by one of the user's profiles."""
-    review = db.get(RatingReview, review_id)
-    if not review:
+    # Edited text goes through moderation again
+    review = update_returning(
+        db,
+        RatingReview,
+        {**payload.model_dump(), "status": ReviewStatus.PENDING.value, "spam_score": None, "duplicate_of_id": None},
+        RatingReview.id == review_id,
+        RatingReview.profile_id.in_(select(Profile.id).where(Profile.user_id == current_user.id)),
+    )
+    if review:
+        return review
+    # Only the failure path pays for telling "missing" and "not yours" apart
+    if db.get(RatingReview, review_id) is None:
         raise HTTPException(status_code=404, detail="Review not found.")
-    profile = db.get(Profile, review.profile_id)
-    if not profile or profile.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not allowed.")
-    for k, v in payload.model_dump().items():
-        setattr(review, k, v)
-    db.add(review)
-    db.commit()
-    db.refresh(review)
-    return review
+    raise HTTPException(status_code=403, detail="Not allowed.")
 
 
 # PUBLIC_INTERFACE
 @router.delete("/{review_id}", status_code=204, summary="Delete a review")
-def delete_review(review_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def delete_review(review_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_uow_db)):
     """Delete an existing review by the owning profile."""
     review = db.get(RatingReview, review_id)
     if not review:
@@ -87,6 +107,8 @@ def delete_review(review_id: int, current_user: User = Depends(get_current_user)
     profile = db.get(Profile, review.profile_id)
     if not profile or profile.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not allowed.")
+    forget_review(db, review_id)
     db.delete(review)
-    db.commit()
+    content_id = review.content_id
+    on_commit(db, lambda: review_moderator.refresh_aggregates(content_id))
     return None
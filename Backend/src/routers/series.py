@@ -0,0 +1,163 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.core.database import get_db, get_uow_db
+from src.core.events import emit
+from src.core.security import get_current_user
+from src.models.models import Content, ContentType, Episode, Season, User
+from src.schemas.schemas import EpisodeCreate, EpisodeOut, SeasonCreate, SeasonOut, SeriesOverviewOut
+from src.services.content_tags import TAG_LOADERS
+from src.services.maturity import get_maturity_ceiling, within_ceiling
+from src.services.series import episode_ordinal, next_episode, season_episodes, season_overview
+
+router = APIRouter(prefix="/series", tags=["series"])
+
+
+def ensure_admin(user: User):
+    if not user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin privileges required.")
+
+
+def _get_series(db: Session, series_id: int, ceiling: Optional[int] = None, options=()) -> Content:
+    series = db.get(Content, series_id, options=options)
+    if not series or series.content_type != ContentType.SERIES.value:
+        raise HTTPException(status_code=404, detail="Series not found.")
+    if not within_ceiling(series.maturity_level, ceiling):
+        raise HTTPException(status_code=404, detail="Series not found.")
+    return series
+
+
+# PUBLIC_INTERFACE
+@router.get("/{series_id}", response_model=SeriesOverviewOut, summary="Series overview with season counts")
+def get_series_overview(
+    series_id: int,
+    ceiling: Optional[int] = Depends(get_maturity_ceiling),
+    db: Session = Depends(get_db),
+):
+    """Return a series with its seasons and per-season episode counts."""
+    series = _get_series(db, series_id, ceiling, options=TAG_LOADERS)
+    seasons = season_overview(db, series_id)
+    return SeriesOverviewOut(
+        series=series,
+        season_count=len(seasons),
+        episode_count=sum(s.episode_count for s in seasons),
+        seasons=seasons,
+    )
+
+
+# PUBLIC_INTERFACE
+@router.get(
+    "/{series_id}/seasons/{season_number}/episodes",
+    response_model=list[EpisodeOut],
+    summary="List episodes of a season",
+)
+def list_season_episodes(
+    series_id: int,
+    season_number: int,
+    ceiling: Optional[int] = Depends(get_maturity_ceiling),
+    db: Session = Depends(get_db),
+):
+    """List a season's episodes in order (cached per season)."""
+    if ceiling is not None:
+        _get_series(db, series_id, ceiling)
+    episodes = season_episodes(db, series_id, season_number)
+    if not episodes:
+        _get_series(db, series_id)
+    return episodes
+
+
+# PUBLIC_INTERFACE
+@router.get("/episodes/{episode_id}/next", response_model=EpisodeOut, summary="Next episode to play")
+def get_next_episode(
+    episode_id: int,
+    ceiling: Optional[int] = Depends(get_maturity_ceiling),
+    db: Session = Depends(get_db),
+):
+    """Return the episode after the given one, continuing into the next season."""
+    episode = next_episode(db, episode_id)
+    if episode and ceiling is not None:
+        if not within_ceiling(db.get(Content, episode.series_id).maturity_level, ceiling):
+            episode = None
+    if not episode:
+        raise HTTPException(status_code=404, detail="No next episode.")
+    return episode
+
+
+# PUBLIC_INTERFACE
+@router.post("/{series_id}/seasons", response_model=SeasonOut, tags=["admin"], summary="Create a season (admin)")
+def admin_create_season(
+    series_id: int,
+    payload: SeasonCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_uow_db),
+):
+    """Admin: Add a season to a series."""
+    ensure_admin(current_user)
+    _get_series(db, series_id)
+    season = Season(series_id=series_id, **payload.model_dump())
+    db.add(season)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Season already exists.")
+    return season
+
+
+# PUBLIC_INTERFACE
+@router.post(
+    "/{series_id}/seasons/{season_number}/episodes",
+    response_model=EpisodeOut,
+    tags=["admin"],
+    summary="Create an episode (admin)",
+)
+def admin_create_episode(
+    series_id: int,
+    season_number: int,
+    payload: EpisodeCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_uow_db),
+):
+    """Admin: Add an episode to a season."""
+    ensure_admin(current_user)
+    season = (
+        db.query(Season).filter(Season.series_id == series_id, Season.season_number == season_number).first()
+    )
+    if not season:
+        raise HTTPException(status_code=404, detail="Season not found.")
+    episode = Episode(
+        season_id=season.id,
+        series_id=series_id,
+        season_number=season_number,
+        ordinal=episode_ordinal(season_number, payload.episode_number),
+        **payload.model_dump(),
+    )
+    db.add(episode)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Episode already exists.")
+    emit(db, "season", (series_id, season_number), "insert")
+    return episode
+
+
+# PUBLIC_INTERFACE
+@router.delete("/episodes/{episode_id}", status_code=204, tags=["admin"], summary="Delete an episode (admin)")
+def admin_delete_episode(
+    episode_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_uow_db),
+):
+    """Admin: Delete an episode by id."""
+    ensure_admin(current_user)
+    episode = db.get(Episode, episode_id)
+    if not episode:
+        raise HTTPException(status_code=404, detail="Episode not found.")
+    series_id, season_number = episode.series_id, episode.season_number
+    db.delete(episode)
+    emit(db, "season", (series_id, season_number), "delete")
+    return None
@@ -1,4 +1,5 @@
 
+from typing import Optional
 from urllib.parse import urlencode, urlparse, urlunparse
 
 from fastapi import APIRouter, Depends, HTTPException
@@ -7,9 +8,13 @@ from sqlalchemy.orm import Session
 
 from src.core.config import get_settings
 from src.core.database import get_db
+from src.core.rate_limit import rate_limit
 from src.core.security import get_current_user
-from src.models.models import Content, User
+from src.models.models import User
 from src.schemas.schemas import StreamTokenOut
+from src.services.content_cache import content_cache
+from src.services.maturity import get_maturity_ceiling, within_ceiling
+from src.services.viewing_events import viewing_events
 
 router = APIRouter(prefix="/stream", tags=["streaming"])
 settings = get_settings()
@@ -24,11 +29,24 @@ def _append_query(url: str, params: dict) -> str:
 
 
 # PUBLIC_INTERFACE
-@router.get("/{content_id}", response_model=StreamTokenOut, summary="Get secure playback URL for content")
-def get_stream_url(content_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Generate a signed playback URL for a piece of content."""
-    content = db.get(Content, content_id)
-    if not content:
+@router.get(
+    "/{content_id}",
+    response_model=StreamTokenOut,
+    summary="Get secure playback URL for content",
+    dependencies=[Depends(rate_limit("stream"))],
+)
+def get_stream_url(
+    content_id: int,
+    ceiling: Optional[int] = Depends(get_maturity_ceiling),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Generate a signed playback URL for a piece of content.
+
+    Titles above the profile's maturity ceiling answer 404, like get_content.
+    """
+    content = content_cache.get(db, content_id)
+    if not content or not within_ceiling(content.maturity_level, ceiling):
         raise HTTPException(status_code=404, detail="Content not found.")
     if content.is_premium:
         subs = [s for s in current_user.subscriptions if s.status == "active"]
@@ -37,4 +55,5 @@ def get_stream_url(content_id: int, current_user: User = Depends(get_current_use
     token = jwt.encode({"user_id": current_user.id, "content_id": content_id}, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
     base_url = content.video_url or f"https://cdn.example.com/hls/{content_id}/master.m3u8"
     playback_url = _append_query(base_url, {"token": token})
+    viewing_events.record_play(current_user.id, content_id)
     return StreamTokenOut(playback_url=playback_url, expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
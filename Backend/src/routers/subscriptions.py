@@ -1,37 +1,50 @@
+import logging
+import uuid
 from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from src.core.database import get_db
+from src.core.database import get_db, get_uow_db, on_commit
+from src.core.events import emit
 from src.core.security import get_current_user
+from src.core.writes import insert_or_none, insert_returning
 from src.models.models import Payment, Subscription, SubscriptionPlan, User
 from src.schemas.schemas import PaymentCreate, PaymentOut, PlanCreate, PlanOut, SubscriptionOut
+from src.services.payment_pipeline import TERMINAL_STATUSES, PaymentJob, PaymentQueueFull, get_payment_pipeline
 from src.services.payments import PaymentError, get_payment_provider
+from src.services.plan_catalog import plan_catalog
 
 router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
+logger = logging.getLogger(__name__)
 
 
 # PUBLIC_INTERFACE
 @router.get("/plans", response_model=list[PlanOut], summary="List subscription plans")
-def list_plans(db: Session = Depends(get_db)):
-    """List all active subscription plans."""
-    return db.query(SubscriptionPlan).filter(SubscriptionPlan.is_active.is_(True)).all()
+def list_plans(request: Request, db: Session = Depends(get_db)):
+    """List all active subscription plans.
+
+    Served from the in-memory plan catalog snapshot, whose body is rendered once
+    per plan change and compressed once per encoding; no query runs once it is loaded.
+    """
+    return plan_catalog.get(db).body.response(request)
 
 
 # PUBLIC_INTERFACE
 @router.post("/plans", response_model=PlanOut, tags=["admin"], summary="Create a new plan (admin)")
-def create_plan(payload: PlanCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def create_plan(payload: PlanCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_uow_db)):
     """Admin: Create a subscription plan."""
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin privileges required.")
-    exists = db.query(SubscriptionPlan).filter(SubscriptionPlan.name == payload.name).first()
-    if exists:
+    plan = insert_or_none(db, SubscriptionPlan, payload.model_dump(), conflict="uq_plan_name")
+    if plan is None:
         raise HTTPException(status_code=400, detail="Plan name already exists.")
-    plan = SubscriptionPlan(**payload.model_dump())
-    db.add(plan)
-    db.commit()
-    db.refresh(plan)
+    emit(db, "subscription_plan", plan.id, "insert")
+    created = PlanOut.model_validate(plan)
+    on_commit(db, lambda: plan_catalog.add(created))
     return plan
 
 
@@ -40,7 +53,7 @@ def create_plan(payload: PlanCreate, current_user: User = Depends(get_current_us
 def subscribe_to_plan(
     plan_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow_db),
 ):
     """Subscribe the current user to a plan."""
     plan = db.get(SubscriptionPlan, plan_id)
@@ -50,39 +63,121 @@ def subscribe_to_plan(
     db.query(Subscription).filter(Subscription.user_id == current_user.id, Subscription.status == "active").update(
         {"status": "cancelled"}
     )
-    sub = Subscription(user_id=current_user.id, plan_id=plan.id, status="active", start_at=datetime.utcnow())
-    db.add(sub)
-    db.commit()
-    db.refresh(sub)
-    return sub
+    return insert_returning(
+        db,
+        Subscription,
+        {"user_id": current_user.id, "plan_id": plan.id, "status": "active", "start_at": datetime.utcnow()},
+        related={"plan": plan},
+    )
+
+
+def _find_payment_by_key(db: Session, user_id: int, idempotency_key: str) -> Optional[Payment]:
+    return (
+        db.query(Payment)
+        .filter(Payment.user_id == user_id, Payment.idempotency_key == idempotency_key)
+        .first()
+    )
 
 
 # PUBLIC_INTERFACE
-@router.post("/pay", response_model=PaymentOut, summary="Make a subscription payment")
+@router.post("/pay", response_model=PaymentOut, status_code=202, summary="Make a subscription payment")
 def make_payment(
     payload: PaymentCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=64),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Perform a payment with the specified provider (simulated)."""
+    """Accept a payment with the specified provider (simulated) for asynchronous processing.
+
+    A pending payment is recorded and handed to the payment pipeline; poll
+    GET /subscriptions/payments/{payment_id} for the outcome. Retrying with the same
+    idempotency key (body field or Idempotency-Key header) returns the original payment
+    instead of charging again; reusing a key for a different amount, currency or
+    provider is answered with 409.
+    """
+    provider_name = payload.provider.lower()
     try:
-        provider = get_payment_provider(payload.provider)
+        get_payment_provider(provider_name)
     except PaymentError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    status, ref = provider.charge(payload.amount_cents, payload.currency, payload.token)
-    payment = Payment(
-        user_id=current_user.id,
-        amount_cents=payload.amount_cents,
-        currency=payload.currency,
-        provider=payload.provider,
-        provider_ref=ref,
-        status=status,
-    )
-    db.add(payment)
-    db.commit()
-    db.refresh(payment)
-    if status != "succeeded":
-        raise HTTPException(status_code=402, detail="Payment failed.")
+
+    key = payload.idempotency_key or idempotency_key or uuid.uuid4().hex
+    try:
+        payment = insert_or_none(
+            db,
+            Payment,
+            {
+                "user_id": current_user.id,
+                "amount_cents": payload.amount_cents,
+                "currency": payload.currency,
+                "provider": provider_name,
+                "status": "pending",
+                "idempotency_key": key,
+                "charge_token": payload.token,
+                "attempts": 0,
+            },
+            conflict="uq_payment_user_idempotency",
+        )
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Invalid payment request.")
+    if payment is None:
+        # A retry with the same key (possibly concurrent) already recorded this payment
+        original = _find_payment_by_key(db, current_user.id, key)
+        if (original.amount_cents, original.currency, original.provider) != (
+            payload.amount_cents,
+            payload.currency,
+            provider_name,
+        ):
+            raise HTTPException(status_code=409, detail="Idempotency key was already used for a different payment.")
+        return original
+
+    try:
+        get_payment_pipeline().submit(
+            PaymentJob(
+                payment_id=payment.id,
+                provider=provider_name,
+                amount_cents=payment.amount_cents,
+                currency=payment.currency,
+                token=payload.token,
+                idempotency_key=key,
+            )
+        )
+    except Exception as e:
+        # Not queued: fail the row now rather than leave it pending until recovery
+        db.query(Payment).filter(Payment.id == payment.id, Payment.status == "pending").update(
+            {"status": "failed", "charge_token": None}, synchronize_session=False
+        )
+        db.commit()
+        if isinstance(e, PaymentQueueFull):
+            raise HTTPException(status_code=503, detail=str(e))
+        logger.exception("Could not queue payment %s", payment.id)
+        raise HTTPException(status_code=503, detail="Payment could not be queued, try again later.")
+    return payment
+
+
+# PUBLIC_INTERFACE
+@router.get("/payments/{payment_id}", response_model=PaymentOut, summary="Get payment status")
+async def get_payment_status(
+    payment_id: int,
+    wait: float = Query(0, ge=0, le=30, description="Long-poll up to this many seconds while pending"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Return a payment's current status, optionally long-polling until it settles.
+
+    The wait runs on the event loop and the session is closed (returning its
+    connection to the pool) before it starts, so long-polling clients hold neither
+    a threadpool thread nor a database connection.
+    """
+    payment = await run_in_threadpool(db.get, Payment, payment_id)
+    if not payment or payment.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Payment not found.")
+    if payment.status not in TERMINAL_STATUSES and wait > 0:
+        await run_in_threadpool(db.close)
+        await get_payment_pipeline().wait_async(payment_id, wait)
+        payment = await run_in_threadpool(db.get, Payment, payment_id)
     return payment
 
 
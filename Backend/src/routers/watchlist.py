@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, literal, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from src.core.database import get_db
+from src.core.database import dialect_insert, get_db, get_uow_db
+from src.core.events import emit
+from src.core.responses import JSONBytesResponse
 from src.core.security import get_current_user
+from src.core.writes import insert_or_none
 from src.models.models import Content, Profile, User, WatchlistItem
-from src.schemas.schemas import WatchlistItemOut
+from src.schemas.schemas import WatchlistBatchIn, WatchlistBatchOut, WatchlistItemOut, WatchlistMembershipOut
+from src.services.content_cache import content_cache
+from src.services.listings import dump_rows, dump_watchlist_item, watchlist_rows
+from src.services.watchlist_cache import watchlist_cache
 
 router = APIRouter(prefix="/watchlist", tags=["watchlist"])
 
@@ -21,14 +31,7 @@ def _ensure_profile(profile_id: int, user: User, db: Session) -> Profile:
 def list_watchlist(profile_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """List all content in a profile's watchlist."""
     _ensure_profile(profile_id, current_user, db)
-    items = (
-        db.query(WatchlistItem)
-        .join(Content)
-        .filter(WatchlistItem.profile_id == profile_id)
-        .order_by(WatchlistItem.created_at.desc())
-        .all()
-    )
-    return items
+    return JSONBytesResponse(dump_rows(watchlist_rows(db, profile_id)))
 
 
 # PUBLIC_INTERFACE
@@ -37,25 +40,38 @@ def add_to_watchlist(
     profile_id: int,
     content_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow_db),
 ):
-    """Add an item to the profile's watchlist."""
+    """Add an item to the profile's watchlist.
+
+    The title comes from the hot content cache, so a warm add is the profile check
+    and one INSERT ... RETURNING; the response embeds the cached content body.
+    """
     _ensure_profile(profile_id, current_user, db)
-    content = db.get(Content, content_id)
-    if not content:
+    record = content_cache.get(db, content_id)
+    if record is None:
         raise HTTPException(status_code=404, detail="Content not found.")
-    existing = (
-        db.query(WatchlistItem)
-        .filter(WatchlistItem.profile_id == profile_id, WatchlistItem.content_id == content_id)
-        .first()
-    )
-    if existing:
-        return existing
-    item = WatchlistItem(profile_id=profile_id, content_id=content_id)
-    db.add(item)
-    db.commit()
-    db.refresh(item)
-    return item
+    try:
+        item = insert_or_none(
+            db,
+            WatchlistItem,
+            {"profile_id": profile_id, "content_id": content_id},
+            conflict="uq_watchlist_profile_content",
+        )
+    except IntegrityError:
+        # Deleted by another worker before its change event reached this cache
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Content not found.")
+    if item is None:
+        # Already on the watchlist: adding is idempotent, return the existing entry
+        item = (
+            db.query(WatchlistItem)
+            .filter(WatchlistItem.profile_id == profile_id, WatchlistItem.content_id == content_id)
+            .one()
+        )
+    else:
+        emit(db, "watchlist", profile_id)
+    return JSONBytesResponse(dump_watchlist_item(item, record.body))
 
 
 # PUBLIC_INTERFACE
@@ -64,7 +80,7 @@ def remove_from_watchlist(
     profile_id: int,
     content_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_uow_db),
 ):
     """Remove an item from the profile's watchlist."""
     _ensure_profile(profile_id, current_user, db)
@@ -76,5 +92,63 @@ def remove_from_watchlist(
     if not item:
         raise HTTPException(status_code=404, detail="Item not found.")
     db.delete(item)
-    db.commit()
+    emit(db, "watchlist", profile_id)
     return None
+
+
+# PUBLIC_INTERFACE
+@router.post("/{profile_id}/add", response_model=WatchlistBatchOut, summary="Add several titles to watchlist")
+def batch_add_to_watchlist(
+    profile_id: int,
+    payload: WatchlistBatchIn,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_uow_db),
+):
+    """Add many content ids in one INSERT ... SELECT ... ON CONFLICT DO NOTHING.
+
+    Ids that do not exist or are already watchlisted are skipped silently.
+    """
+    _ensure_profile(profile_id, current_user, db)
+    source = select(literal(profile_id), Content.id, literal(datetime.utcnow())).where(
+        Content.id.in_(set(payload.content_ids))
+    )
+    stmt = (
+        dialect_insert(db, WatchlistItem)
+        .from_select(["profile_id", "content_id", "created_at"], source)
+        .on_conflict_do_nothing(index_elements=["profile_id", "content_id"])
+    )
+    affected = db.execute(stmt).rowcount
+    emit(db, "watchlist", profile_id)
+    return WatchlistBatchOut(affected=max(affected, 0))
+
+
+# PUBLIC_INTERFACE
+@router.post("/{profile_id}/remove", response_model=WatchlistBatchOut, summary="Remove several titles from watchlist")
+def batch_remove_from_watchlist(
+    profile_id: int,
+    payload: WatchlistBatchIn,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_uow_db),
+):
+    """Remove many content ids from the watchlist with a single DELETE."""
+    _ensure_profile(profile_id, current_user, db)
+    stmt = delete(WatchlistItem).where(
+        WatchlistItem.profile_id == profile_id,
+        WatchlistItem.content_id.in_(set(payload.content_ids)),
+    )
+    affected = db.execute(stmt).rowcount
+    emit(db, "watchlist", profile_id)
+    return WatchlistBatchOut(affected=affected)
+
+
+# PUBLIC_INTERFACE
+@router.get("/{profile_id}/contains", response_model=WatchlistMembershipOut, summary="Check watchlist membership")
+def watchlist_membership(
+    profile_id: int,
+    content_ids: list[int] = Query(..., max_length=500, description="Content ids to test, e.g. ?content_ids=1&content_ids=2"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Return which of the given content ids are in the profile's watchlist."""
+    _ensure_profile(profile_id, current_user, db)
+    return WatchlistMembershipOut(content_ids=watchlist_cache.contains(db, profile_id, content_ids))
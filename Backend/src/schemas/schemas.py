@@ -1,7 +1,15 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator
+
+from src.models.models import EPISODE_ORDINAL_STRIDE, MATURITY_LEVELS, MAX_SEASON_NUMBER
+
+
+def _check_maturity_rating(value: Optional[str]) -> Optional[str]:
+    if value is not None and value not in MATURITY_LEVELS:
+        raise ValueError(f"maturity_rating must be one of {', '.join(MATURITY_LEVELS)}")
+    return value
 
 
 # Common / Auth
@@ -48,11 +56,11 @@ class ProfileBase(BaseModel):
 
 
 class ProfileCreate(ProfileBase):
-    pass
+    _validate_maturity = field_validator("maturity_rating")(_check_maturity_rating)
 
 
 class ProfileUpdate(ProfileBase):
-    pass
+    _validate_maturity = field_validator("maturity_rating")(_check_maturity_rating)
 
 
 class ProfileOut(ProfileBase):
@@ -72,26 +80,87 @@ class ContentBase(BaseModel):
     genre: Optional[str] = None
     language: Optional[str] = None
     category: Optional[str] = None
+    content_type: str = Field(default="movie", pattern="^(movie|series)$")
+    maturity_rating: Optional[str] = Field(None, description="Rating such as G, PG, PG-13, R, TV-MA")
     is_premium: bool = False
     video_url: Optional[str] = None
     thumbnail_url: Optional[str] = None
 
 
-class ContentCreate(ContentBase):
-    pass
+class ContentTagsIn(BaseModel):
+    genres: Optional[list[str]] = Field(None, description="All genres; defaults to splitting 'genre' on commas")
+    languages: Optional[list[str]] = Field(None, description="All languages; defaults to splitting 'language'")
+    audio_languages: list[str] = Field(default_factory=list, description="Available audio track languages")
+    subtitle_languages: list[str] = Field(default_factory=list, description="Available subtitle languages")
 
 
-class ContentUpdate(ContentBase):
-    pass
+class ContentCreate(ContentBase, ContentTagsIn):
+    _validate_maturity = field_validator("maturity_rating")(_check_maturity_rating)
+
+
+class ContentUpdate(ContentBase, ContentTagsIn):
+    _validate_maturity = field_validator("maturity_rating")(_check_maturity_rating)
 
 
 class ContentOut(ContentBase):
     id: int
+    genres: list[str] = []
+    languages: list[str] = []
+    audio_languages: list[str] = []
+    subtitle_languages: list[str] = []
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class FacetCountsOut(BaseModel):
+    total: int = Field(..., description="Number of titles matching all active filters")
+    facets: dict[str, dict[str, int]] = Field(..., description="Per facet, title counts by value")
+
+
+# Series
+
+class SeasonCreate(BaseModel):
+    season_number: int = Field(..., ge=0, le=MAX_SEASON_NUMBER)
+    title: Optional[str] = None
+    description: Optional[str] = None
+    release_year: Optional[int] = None
+
+
+class SeasonOut(SeasonCreate):
+    id: int
+    series_id: int
+    episode_count: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class EpisodeCreate(BaseModel):
+    # Beyond the stride the ordinal would run into the next season's range
+    episode_number: int = Field(..., ge=1, lt=EPISODE_ORDINAL_STRIDE)
+    title: str
+    description: Optional[str] = None
+    duration_minutes: Optional[int] = None
+    video_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+
+
+class EpisodeOut(EpisodeCreate):
+    id: int
+    series_id: int
+    season_id: int
+    season_number: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SeriesOverviewOut(BaseModel):
+    series: ContentOut
+    season_count: int
+    episode_count: int
+    seasons: list[SeasonOut]
+
+
 # Watchlist
 
 class WatchlistItemOut(BaseModel):
@@ -103,6 +172,18 @@ class WatchlistItemOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class WatchlistBatchIn(BaseModel):
+    content_ids: list[int] = Field(..., min_length=1, max_length=500, description="Content ids to add or remove")
+
+
+class WatchlistBatchOut(BaseModel):
+    affected: int = Field(..., description="Number of rows inserted or deleted")
+
+
+class WatchlistMembershipOut(BaseModel):
+    content_ids: list[int] = Field(..., description="Subset of the queried ids present in the watchlist")
+
+
 # Subscription
 
 class PlanBase(BaseModel):
@@ -142,6 +223,9 @@ class PaymentCreate(BaseModel):
     currency: str = "USD"
     provider: str = Field(..., description="stripe|paypal|upi")
     token: str = Field(..., description="payment token or id obtained from provider")
+    idempotency_key: Optional[str] = Field(
+        None, max_length=64, description="Client supplied key; retries with the same key return the same payment"
+    )
 
 
 class PaymentOut(BaseModel):
@@ -152,6 +236,8 @@ class PaymentOut(BaseModel):
     provider: str
     provider_ref: Optional[str] = None
     status: str
+    idempotency_key: Optional[str] = None
+    attempts: int = 0
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
@@ -179,6 +265,26 @@ class ReviewOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ReviewSummaryOut(BaseModel):
+    content_id: int
+    review_count: int = 0
+    average_rating: Optional[float] = None
+
+
+# Playback progress
+
+class ProgressHeartbeat(BaseModel):
+    position_seconds: int = Field(..., ge=0, description="Current playback position")
+    duration_seconds: Optional[int] = Field(None, gt=0, description="Total runtime, if known to the player")
+
+
+class ContinueWatchingOut(BaseModel):
+    content: ContentOut
+    position_seconds: int
+    duration_seconds: Optional[int] = None
+    updated_at: datetime
+
+
 # Streaming
 
 class StreamTokenOut(BaseModel):
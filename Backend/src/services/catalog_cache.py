@@ -0,0 +1,56 @@
+import threading
+from typing import Callable, Hashable
+
+from src.core.cache import MISSING, LRUCache
+from src.core.compression import PrecompressedBody
+from src.core.config import get_settings
+from src.core.events import event_bus
+
+settings = get_settings()
+
+
+class CatalogResponseCache:
+    """Cache of rendered catalog list responses, stored precompressed.
+
+    Keys are the normalized query parameters (including the maturity ceiling). Any
+    content write bumps the version and clears the cache; a fill that started before
+    the bump is discarded instead of stored, so a slow query cannot re-insert a body
+    that predates the write. Every "content" change event, local or from another
+    worker, triggers the same invalidation; ttl_seconds bounds staleness if one is lost.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._cache = LRUCache(max_entries, ttl_seconds)
+        self._lock = threading.Lock()
+        self.version = 0
+
+    # PUBLIC_INTERFACE
+    def get_or_render(self, key: Hashable, render: Callable[[], bytes]) -> PrecompressedBody:
+        """Return the cached body for key, rendering it on a miss (variants are compressed on first use)."""
+        body = self._cache.get(key)
+        if body is MISSING:
+            version = self.version
+            body = PrecompressedBody(render())
+            with self._lock:
+                if version == self.version:
+                    self._cache.set(key, body)
+        return body
+
+    # PUBLIC_INTERFACE
+    def invalidate(self) -> None:
+        """Drop every cached response after a catalog write."""
+        with self._lock:
+            self.version += 1
+            self._cache.clear()
+
+    # PUBLIC_INTERFACE
+    def stats(self) -> dict:
+        """Return hit/miss counters of the underlying cache."""
+        return self._cache.stats()
+
+
+catalog_cache = CatalogResponseCache(
+    max_entries=settings.CATALOG_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS,
+)
+event_bus.subscribe("content", lambda ev: catalog_cache.invalidate())
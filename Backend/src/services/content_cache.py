@@ -0,0 +1,128 @@
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from src.core.cache import MISSING, LRUCache
+from src.core.config import get_settings
+from src.core.events import event_bus
+from src.models.models import Content, content_maturity_level
+from src.services.listings import content_rows, dump_row
+
+settings = get_settings()
+
+
+class ContentRecord:
+    """Immutable snapshot of one title: what get_content and get_stream_url need, plus its JSON."""
+
+    __slots__ = ("id", "version", "maturity_level", "is_premium", "video_url", "body")
+
+    def __init__(self, row: dict, version: int):
+        self.id = row["id"]
+        self.version = version
+        self.maturity_level = content_maturity_level(row["maturity_rating"])
+        self.is_premium = bool(row["is_premium"])
+        self.video_url = row["video_url"]
+        self.body = dump_row(row)
+
+
+class _Flight:
+    __slots__ = ("done", "record", "failed")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.record: Optional[ContentRecord] = None
+        self.failed = False
+
+
+class HotContentCache:
+    """Bounded LRU of ContentRecord by content id for the per-title read paths.
+
+    Traffic is heavily skewed toward a few hundred titles, so a few thousand entries
+    absorb nearly all lookups. Concurrent misses for the same id are collapsed into
+    a single load (the others wait for it), so a release drop does not stampede the
+    database. Unknown ids are cached as None for only negative_ttl_seconds, so a
+    scan of made-up ids cannot fill the cache for long. Any content write bumps the version;
+    a load that started before the bump still answers its own request but is not
+    stored. Writes in other worker processes arrive as "content" change events;
+    if one is lost the entry still expires after ttl_seconds.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, negative_ttl_seconds: float, load_wait_seconds: float):
+        self._cache = LRUCache(max_entries, ttl_seconds)
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._lock = threading.Lock()
+        self._flights: Dict[int, _Flight] = {}
+        self.load_wait_seconds = load_wait_seconds
+        self.version = 0
+        self.loads = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def _load(db: Session, content_id: int, version: int) -> Optional[ContentRecord]:
+        rows = content_rows(db, db.query(Content).filter(Content.id == content_id))
+        return ContentRecord(rows[0], version) if rows else None
+
+    # PUBLIC_INTERFACE
+    def get(self, db: Session, content_id: int) -> Optional[ContentRecord]:
+        """Return the title's record (None if it does not exist), loading it at most once per miss."""
+        record = self._cache.get(content_id)
+        if record is not MISSING:
+            return record
+        with self._lock:
+            flight = self._flights.get(content_id)
+            leader = flight is None
+            if leader:
+                flight = self._flights[content_id] = _Flight()
+                version = self.version
+            else:
+                self.coalesced += 1
+        if not leader:
+            if flight.done.wait(self.load_wait_seconds) and not flight.failed:
+                return flight.record
+            return self._load(db, content_id, self.version)
+        try:
+            flight.record = self._load(db, content_id, version)
+        except BaseException:
+            flight.failed = True
+            raise
+        finally:
+            with self._lock:
+                del self._flights[content_id]
+                if not flight.failed:
+                    self.loads += 1
+                if not flight.failed and version == self.version:
+                    if flight.record is not None:
+                        self._cache.set(content_id, flight.record)
+                    elif self.negative_ttl_seconds > 0:
+                        self._cache.set(content_id, None, self.negative_ttl_seconds)
+            flight.done.set()
+        return flight.record
+
+    # PUBLIC_INTERFACE
+    def invalidate(self, content_id: int) -> None:
+        """Drop a title after it was created, updated or deleted."""
+        with self._lock:
+            self.version += 1
+            self._cache.pop(content_id)
+
+    # PUBLIC_INTERFACE
+    def clear(self) -> None:
+        """Drop every cached record."""
+        with self._lock:
+            self.version += 1
+            self._cache.clear()
+
+    # PUBLIC_INTERFACE
+    def stats(self) -> dict:
+        """Return hit-rate counters plus loads and coalesced (waited-on) misses."""
+        return {**self._cache.stats(), "loads": self.loads, "coalesced": self.coalesced, "version": self.version}
+
+
+content_cache = HotContentCache(
+    max_entries=settings.CONTENT_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CONTENT_CACHE_TTL_SECONDS,
+    negative_ttl_seconds=settings.CONTENT_CACHE_NEGATIVE_TTL_SECONDS,
+    load_wait_seconds=settings.CONTENT_CACHE_LOAD_WAIT_SECONDS,
+)
+event_bus.subscribe("content", lambda ev: content_cache.invalidate(ev.key))
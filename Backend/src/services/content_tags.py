@@ -0,0 +1,75 @@
+from typing import Iterable, List, Optional
+
+from sqlalchemy.orm import selectinload
+
+from src.models.models import Content, ContentGenre, ContentLanguage, ContentTrack, TrackKind
+from src.schemas.schemas import ContentTagsIn
+
+TAG_FIELDS = set(ContentTagsIn.model_fields)
+
+# Loader options for queries whose Content rows are rendered as ContentOut (tags included)
+TAG_LOADERS = (selectinload(Content.genre_tags), selectinload(Content.language_tags), selectinload(Content.tracks))
+
+
+# PUBLIC_INTERFACE
+def split_tags(value: Optional[str]) -> List[str]:
+    """Split a legacy comma separated tag string ("Drama, Crime") into clean tags."""
+    if not value:
+        return []
+    return normalize_tags(value.split(","))
+
+
+# PUBLIC_INTERFACE
+def normalize_tags(values: Iterable[str]) -> List[str]:
+    """Strip whitespace, drop empties and duplicates (case-insensitive), keeping order."""
+    seen = set()
+    out = []
+    for v in values:
+        v = v.strip()
+        if v and v.lower() not in seen:
+            seen.add(v.lower())
+            out.append(v)
+    return out
+
+
+def _sync(existing: list, wanted: List[tuple], key, build) -> list:
+    # Keep rows whose key is still wanted so an unchanged tag is never deleted and re-inserted;
+    # sorted like the relationships' order_by so the response matches later reads
+    by_key = {key(row): row for row in existing}
+    return [by_key.get(k) or build(*k) for k in sorted(wanted)]
+
+
+# PUBLIC_INTERFACE
+def apply_content_tags(content: Content, tags: ContentTagsIn, partial: bool = False) -> None:
+    """Replace a content item's genre/language/track tags.
+
+    When genres or languages are not given explicitly they are derived from the
+    legacy genre/language strings; the strings are kept in sync for older clients.
+    With partial, track lists missing from the request keep their stored tracks.
+    """
+    genres = normalize_tags(tags.genres) if tags.genres is not None else split_tags(content.genre)
+    languages = normalize_tags(tags.languages) if tags.languages is not None else split_tags(content.language)
+    content.genre = ", ".join(genres)[:128] or None
+    content.language = ", ".join(languages)[:64] or None
+
+    content.genre_tags = _sync(
+        content.genre_tags, [(g,) for g in genres], lambda t: (t.genre,), lambda g: ContentGenre(genre=g)
+    )
+    content.language_tags = _sync(
+        content.language_tags,
+        [(lang,) for lang in languages],
+        lambda t: (t.language,),
+        lambda lang: ContentLanguage(language=lang),
+    )
+    wanted_tracks = []
+    for kind, field in ((TrackKind.AUDIO, "audio_languages"), (TrackKind.SUBTITLE, "subtitle_languages")):
+        if partial and field not in tags.model_fields_set:
+            wanted_tracks += [(t.kind, t.language) for t in content.tracks if t.kind == kind.value]
+        else:
+            wanted_tracks += [(kind.value, lang) for lang in normalize_tags(getattr(tags, field))]
+    content.tracks = _sync(
+        content.tracks,
+        wanted_tracks,
+        lambda t: (t.kind, t.language),
+        lambda kind, lang: ContentTrack(kind=kind, language=lang),
+    )
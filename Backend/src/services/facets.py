@@ -0,0 +1,271 @@
+import threading
+import time
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.core.config import get_settings
+from src.core.events import event_bus
+from src.models.models import (
+    EFFECTIVE_MATURITY_LEVEL,
+    UNRATED_LEVEL,
+    Content,
+    ContentGenre,
+    ContentLanguage,
+    content_maturity_level,
+)
+
+settings = get_settings()
+
+FACETS = ("genre", "language", "release_year", "category", "maturity_rating")
+# Multi-valued facets live in tag tables: facet -> (model, value column)
+TAG_FACETS = {"genre": (ContentGenre, "genre"), "language": (ContentLanguage, "language")}
+COLUMN_FACETS = tuple(f for f in FACETS if f not in TAG_FACETS)
+
+
+def _bits_from_ids(ids: Iterable[int]) -> int:
+    """Build a bitset (bit n set for content id n) without quadratic int re-allocation."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    buf = bytearray(max(ids) // 8 + 1)
+    for i in ids:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, "little")
+
+
+class FacetIndex:
+    """Per-value bitsets over content ids for instant facet counts.
+
+    Each facet value owns an int used as a bitset where bit n is set when content n
+    has that value. Counts for a filter set are computed by AND-ing the bitsets of the
+    other active filters (so a facet's own selection does not hide its siblings) and
+    taking popcounts. The index is built lazily, patched on content writes and rebuilt
+    from scratch once it is older than max_age_seconds. A content change event from
+    another worker marks it stale so the next count rebuilds it.
+
+    Rebuilds are single-flight: concurrent callers of ensure_built wait for the one
+    running build instead of starting their own. Writes patched in while a build
+    reads the tables are journaled and replayed onto the new bitsets, since the
+    build's reads may predate them; a stale mark during a build keeps the result
+    stale so the next count rebuilds again.
+    """
+
+    def __init__(self, max_age_seconds: float = settings.FACET_INDEX_MAX_AGE_SECONDS):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._bitsets: Dict[str, Dict[Hashable, int]] = {f: {} for f in FACETS}
+        self._doc_values: Dict[int, Dict[str, Tuple]] = {}
+        self._all = 0
+        self._built_at: Optional[float] = None
+        # (content_id, values or None for a removal) patched in during the running build
+        self._journal: Optional[List[Tuple[int, Optional[Dict[str, Tuple]]]]] = None
+        self._stale_marks = 0
+        self.builds = 0
+
+    @staticmethod
+    def _values_of(content: Content) -> Dict[str, Tuple]:
+        values = {f: (getattr(content, f),) if getattr(content, f) is not None else () for f in COLUMN_FACETS}
+        values["genre"] = tuple(content.genres)
+        values["language"] = tuple(content.languages)
+        return values
+
+    # PUBLIC_INTERFACE
+    def build(self, db: Session) -> None:
+        """Rebuild every bitset from the contents and tag tables."""
+        with self._build_lock:
+            self._build(db)
+
+    def _build(self, db: Session) -> None:
+        with self._lock:
+            self._journal = []
+            stale_marks = self._stale_marks
+        try:
+            bitsets, doc_values = self._read(db)
+        except BaseException:
+            with self._lock:
+                self._journal = None
+            raise
+        with self._lock:
+            journal, self._journal = self._journal, None
+            self._bitsets = bitsets
+            self._doc_values = doc_values
+            self._all = _bits_from_ids(doc_values)
+            for content_id, values in journal:
+                self._remove_locked(content_id)
+                if values is not None:
+                    self._add_locked(content_id, values)
+            self._built_at = time.monotonic() if stale_marks == self._stale_marks else None
+            self.builds += 1
+
+    @staticmethod
+    def _read(db: Session) -> Tuple[Dict[str, Dict[Hashable, int]], Dict[int, Dict[str, Tuple]]]:
+        ids_by_value: Dict[str, Dict[Hashable, List[int]]] = {f: {} for f in FACETS}
+        doc_values: Dict[int, Dict[str, Tuple]] = {}
+        for row in db.execute(select(Content.id, *(getattr(Content, f) for f in COLUMN_FACETS))):
+            values = {f: () for f in FACETS}
+            for facet in COLUMN_FACETS:
+                v = getattr(row, facet)
+                if v is not None:
+                    values[facet] = (v,)
+                    ids_by_value[facet].setdefault(v, []).append(row.id)
+            doc_values[row.id] = values
+        for facet, (model, column) in TAG_FACETS.items():
+            for content_id, v in db.execute(select(model.content_id, getattr(model, column))):
+                if content_id in doc_values:
+                    doc_values[content_id][facet] += (v,)
+                    ids_by_value[facet].setdefault(v, []).append(content_id)
+        bitsets = {f: {v: _bits_from_ids(ids) for v, ids in by_value.items()} for f, by_value in ids_by_value.items()}
+        return bitsets, doc_values
+
+    def _expired(self) -> bool:
+        built_at = self._built_at
+        return built_at is None or time.monotonic() - built_at > self.max_age_seconds
+
+    # PUBLIC_INTERFACE
+    def ensure_built(self, db: Session) -> None:
+        """Build the index if it has never been built or has aged out (one build at a time)."""
+        if self._expired():
+            with self._build_lock:
+                # Callers that waited on another build find the index fresh
+                if self._expired():
+                    self._build(db)
+
+    # PUBLIC_INTERFACE
+    def upsert(self, content) -> None:
+        """Apply a created or updated content row to the bitsets."""
+        values = self._values_of(content)
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((content.id, values))
+            if self._built_at is None:
+                return
+            self._remove_locked(content.id)
+            self._add_locked(content.id, values)
+
+    def _add_locked(self, content_id: int, values: Dict[str, Tuple]) -> None:
+        bit = 1 << content_id
+        for facet, vals in values.items():
+            for v in vals:
+                self._bitsets[facet][v] = self._bitsets[facet].get(v, 0) | bit
+        self._doc_values[content_id] = values
+        self._all |= bit
+
+    # PUBLIC_INTERFACE
+    def mark_stale(self) -> None:
+        """Force a rebuild on the next ensure_built (another worker changed the catalog)."""
+        with self._lock:
+            self._stale_marks += 1
+            self._built_at = None
+
+    # PUBLIC_INTERFACE
+    def remove(self, content_id: int) -> None:
+        """Remove a deleted content id from the bitsets."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((content_id, None))
+            if self._built_at is None:
+                return
+            self._remove_locked(content_id)
+
+    def _remove_locked(self, content_id: int) -> None:
+        old = self._doc_values.pop(content_id, None)
+        if old is None:
+            return
+        mask = ~(1 << content_id)
+        for facet, vals in old.items():
+            for v in vals:
+                remaining = self._bitsets[facet][v] & mask
+                if remaining:
+                    self._bitsets[facet][v] = remaining
+                else:
+                    del self._bitsets[facet][v]
+        self._all &= mask
+
+    # PUBLIC_INTERFACE
+    def counts(
+        self,
+        db: Session,
+        filters: Dict[str, Hashable],
+        base_ids: Optional[Iterable[int]] = None,
+        max_level: Optional[int] = None,
+    ) -> Tuple[int, Dict[str, Dict[Hashable, int]]]:
+        """Return (matching total, {facet: {value: count}}) for the active filters.
+
+        base_ids optionally restricts the universe (e.g. ids matching a text search);
+        max_level restricts it to titles rated at or below that maturity level.
+        """
+        self.ensure_built(db)
+        with self._lock:
+            universe = self._all if base_ids is None else self._all & _bits_from_ids(base_ids)
+            if max_level is not None:
+                allowed = rated = 0
+                for rating, bits in self._bitsets["maturity_rating"].items():
+                    rated |= bits
+                    if content_maturity_level(rating) <= max_level:
+                        allowed |= bits
+                if UNRATED_LEVEL <= max_level:
+                    allowed |= self._all & ~rated
+                universe &= allowed
+            selected = {f: self._bitsets[f].get(v, 0) for f, v in filters.items() if v is not None}
+            total_mask = universe
+            for bits in selected.values():
+                total_mask &= bits
+            facets: Dict[str, Dict[Hashable, int]] = {}
+            for facet in FACETS:
+                mask = universe
+                for other, bits in selected.items():
+                    if other != facet:
+                        mask &= bits
+                counts = {}
+                for value, bits in self._bitsets[facet].items():
+                    n = (bits & mask).bit_count()
+                    if n:
+                        counts[value] = n
+                facets[facet] = counts
+        return total_mask.bit_count(), facets
+
+
+# PUBLIC_INTERFACE
+def group_by_counts(
+    db: Session,
+    filters: Dict[str, Hashable],
+    base_ids: Optional[Iterable[int]] = None,
+    max_level: Optional[int] = None,
+) -> Tuple[int, Dict[str, Dict[Hashable, int]]]:
+    """Reference implementation of FacetIndex.counts using one GROUP BY query per facet."""
+
+    def clause(facet: str, value):
+        if facet in TAG_FACETS:
+            model, column = TAG_FACETS[facet]
+            return Content.id.in_(select(model.content_id).where(getattr(model, column) == value))
+        return getattr(Content, facet) == value
+
+    def where(exclude: Optional[str]):
+        clauses = [clause(f, v) for f, v in filters.items() if v is not None and f != exclude]
+        if base_ids is not None:
+            clauses.append(Content.id.in_(list(base_ids)))
+        if max_level is not None:
+            clauses.append(EFFECTIVE_MATURITY_LEVEL <= max_level)
+        return clauses
+
+    total = db.execute(select(func.count(Content.id)).where(*where(None))).scalar() or 0
+    facets = {}
+    for facet in FACETS:
+        if facet in TAG_FACETS:
+            model, column = TAG_FACETS[facet]
+            col = getattr(model, column)
+            stmt = select(col, func.count(Content.id)).join(model, model.content_id == Content.id)
+        else:
+            col = getattr(Content, facet)
+            stmt = select(col, func.count(Content.id)).where(col.isnot(None))
+        rows = db.execute(stmt.where(*where(facet)).group_by(col))
+        facets[facet] = {value: n for value, n in rows}
+    return total, facets
+
+
+facet_index = FacetIndex()
+# Local writes patch the bitsets directly; only other workers' writes need a rebuild
+event_bus.subscribe("content", lambda ev: facet_index.mark_stale(), remote_only=True)
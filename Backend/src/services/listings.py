@@ -0,0 +1,124 @@
+from typing import Any, Dict, Iterable, List
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Query, Session
+
+from src.models.models import (
+    Content,
+    ContentGenre,
+    ContentLanguage,
+    ContentTrack,
+    RatingReview,
+    ReviewStatus,
+    TrackKind,
+    WatchlistItem,
+)
+from src.schemas.schemas import ContentOut, ReviewOut
+
+# Fast path for large list endpoints: select only the columns the response needs as
+# plain rows, build dicts and let pydantic-core encode them straight to JSON bytes.
+# This skips ORM identity-map bookkeeping, per-row from_attributes validation and
+# FastAPI's jsonable_encoder pass while producing the same JSON as the *Out models.
+
+TAG_LIST_FIELDS = ("genres", "languages", "audio_languages", "subtitle_languages")
+CONTENT_FIELDS = tuple(f for f in ContentOut.model_fields if f not in TAG_LIST_FIELDS)
+REVIEW_FIELDS = tuple(ReviewOut.model_fields)
+
+_content_columns = [getattr(Content, f) for f in CONTENT_FIELDS]
+_review_columns = [getattr(RatingReview, f) for f in REVIEW_FIELDS]
+_rows_adapter = TypeAdapter(List[Dict[str, Any]])
+_row_adapter = TypeAdapter(Dict[str, Any])
+
+# Keep IN lists well below SQLite's bound parameter limit
+_ID_CHUNK = 5_000
+
+
+def _chunks(ids: List[int]) -> Iterable[List[int]]:
+    for i in range(0, len(ids), _ID_CHUNK):
+        yield ids[i:i + _ID_CHUNK]
+
+
+def _attach_tags(db: Session, contents: List[dict]) -> None:
+    by_id = {}
+    for row in contents:
+        for field in TAG_LIST_FIELDS:
+            row[field] = []
+        by_id[row["id"]] = row
+    ids = list(by_id)
+    for chunk in _chunks(ids):
+        # Tags come back in name order, like the Content relationships
+        for content_id, genre in db.execute(
+            select(ContentGenre.content_id, ContentGenre.genre)
+            .where(ContentGenre.content_id.in_(chunk))
+            .order_by(ContentGenre.genre)
+        ):
+            by_id[content_id]["genres"].append(genre)
+        for content_id, language in db.execute(
+            select(ContentLanguage.content_id, ContentLanguage.language)
+            .where(ContentLanguage.content_id.in_(chunk))
+            .order_by(ContentLanguage.language)
+        ):
+            by_id[content_id]["languages"].append(language)
+        for content_id, kind, language in db.execute(
+            select(ContentTrack.content_id, ContentTrack.kind, ContentTrack.language)
+            .where(ContentTrack.content_id.in_(chunk))
+            .order_by(ContentTrack.kind, ContentTrack.language)
+        ):
+            field = "audio_languages" if kind == TrackKind.AUDIO.value else "subtitle_languages"
+            by_id[content_id][field].append(language)
+
+
+# PUBLIC_INTERFACE
+def content_rows(db: Session, query: Query) -> List[dict]:
+    """Run a Content query as column rows and return ContentOut-shaped dicts (tags included)."""
+    contents = [dict(zip(CONTENT_FIELDS, row)) for row in query.with_entities(*_content_columns)]
+    _attach_tags(db, contents)
+    return contents
+
+
+# PUBLIC_INTERFACE
+def watchlist_rows(db: Session, profile_id: int) -> List[dict]:
+    """Return WatchlistItemOut-shaped dicts for a profile, newest first."""
+    stmt = (
+        select(WatchlistItem.id, WatchlistItem.created_at, *_content_columns)
+        .join(Content, Content.id == WatchlistItem.content_id)
+        .where(WatchlistItem.profile_id == profile_id)
+        .order_by(WatchlistItem.created_at.desc())
+    )
+    items = []
+    contents = []
+    for item_id, created_at, *content in db.execute(stmt):
+        row = dict(zip(CONTENT_FIELDS, content))
+        contents.append(row)
+        items.append({"id": item_id, "profile_id": profile_id, "content": row, "created_at": created_at})
+    _attach_tags(db, contents)
+    return items
+
+
+# PUBLIC_INTERFACE
+def review_rows(db: Session, content_id: int) -> List[dict]:
+    """Return ReviewOut-shaped dicts for a content item, leaving out reviews hidden by moderation."""
+    stmt = select(*_review_columns).where(
+        RatingReview.content_id == content_id, RatingReview.status != ReviewStatus.HIDDEN.value
+    )
+    return [dict(zip(REVIEW_FIELDS, row)) for row in db.execute(stmt)]
+
+
+# PUBLIC_INTERFACE
+def dump_rows(rows: List[dict]) -> bytes:
+    """Encode row dicts to JSON bytes in one pydantic-core call."""
+    return _rows_adapter.dump_json(rows)
+
+
+# PUBLIC_INTERFACE
+def dump_row(row: dict) -> bytes:
+    """Encode a single row dict to JSON bytes."""
+    return _row_adapter.dump_json(row)
+
+
+# PUBLIC_INTERFACE
+def dump_watchlist_item(item: WatchlistItem, content_body: bytes) -> bytes:
+    """Encode a WatchlistItemOut around an already encoded content body (e.g. ContentRecord.body)."""
+    head = dump_row({"id": item.id, "profile_id": item.profile_id, "created_at": item.created_at})
+    return head[:-1] + b',"content":' + content_body + b"}"
@@ -0,0 +1,71 @@
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from src.core.cache import MISSING, LRUCache
+from src.core.database import get_db
+from src.core.events import event_bus
+from src.core.security import get_token_profile_id
+from src.models.models import MATURITY_LEVELS, UNRATED_LEVEL, Profile
+
+# profile_id -> maturity level ceiling (None = unrestricted); "profile" change events from
+# any worker drop an entry, the TTL only bounds staleness if one is lost
+_profile_ceilings = LRUCache(max_entries=100_000, ttl_seconds=300)
+
+
+# PUBLIC_INTERFACE
+def maturity_level(rating: Optional[str]) -> Optional[int]:
+    """Return a profile's ceiling for its rating, or None (unrestricted) for no/unknown rating."""
+    return MATURITY_LEVELS.get(rating) if rating else None
+
+
+# PUBLIC_INTERFACE
+def invalidate_profile(profile_id: int) -> None:
+    """Forget a profile's cached ceiling after its rating changes or it is deleted."""
+    _profile_ceilings.pop(profile_id)
+
+
+# PUBLIC_INTERFACE
+def get_maturity_ceiling(
+    profile_id: Optional[int] = Query(None, description="Viewing profile; hides titles above its maturity rating"),
+    max_rating: Optional[str] = Query(None, description="Explicit maturity ceiling, e.g. PG-13"),
+    token_profile_id: Optional[int] = Depends(get_token_profile_id),
+    db: Session = Depends(get_db),
+) -> Optional[int]:
+    """Dependency resolving the maturity level ceiling for catalog queries.
+
+    Returns None when no restriction applies. A profile token always applies its
+    profile's ceiling, so omitting profile_id does not lift it and max_rating can
+    only lower it. The profile's rating is cached so a profile-aware request costs
+    no extra query once warm.
+    """
+    if token_profile_id is not None:
+        if profile_id is not None and profile_id != token_profile_id:
+            raise HTTPException(status_code=403, detail="Token is bound to another profile.")
+        profile_id = token_profile_id
+    ceiling = None
+    if max_rating is not None:
+        if max_rating not in MATURITY_LEVELS:
+            raise HTTPException(status_code=400, detail="Unknown maturity rating.")
+        ceiling = MATURITY_LEVELS[max_rating]
+    if profile_id is not None:
+        level = _profile_ceilings.get(profile_id)
+        if level is MISSING:
+            row = db.query(Profile.maturity_rating).filter(Profile.id == profile_id).first()
+            if row is None:
+                raise HTTPException(status_code=404, detail="Profile not found.")
+            level = maturity_level(row[0])
+            _profile_ceilings.set(profile_id, level)
+        if level is not None:
+            ceiling = level if ceiling is None else min(ceiling, level)
+    return ceiling
+
+
+# PUBLIC_INTERFACE
+def within_ceiling(level: Optional[int], ceiling: Optional[int]) -> bool:
+    """Return True if a title with the given level (None = not yet backfilled) may be shown under ceiling."""
+    return ceiling is None or (UNRATED_LEVEL if level is None else level) <= ceiling
+
+
+event_bus.subscribe("profile", lambda ev: invalidate_profile(ev.key))
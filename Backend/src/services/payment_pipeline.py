@@ -0,0 +1,408 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from starlette.concurrency import run_in_threadpool
+
+from src.core.config import get_settings
+from src.core.database import SessionLocal
+from src.models.models import Payment
+from src.services.payments import (
+    PaymentError,
+    PaymentProviderRegistry,
+    PaymentTransientError,
+    get_payment_registry,
+    reset_payment_registry,
+)
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+# updated_at of payments released by a stopping worker: old enough for immediate recovery
+_RELEASED_AT = datetime(1970, 1, 1)
+
+
+class PaymentQueueFull(PaymentError):
+    pass
+
+
+@dataclass
+class PaymentJob:
+    payment_id: int
+    provider: str
+    amount_cents: int
+    currency: str
+    token: str
+    idempotency_key: Optional[str] = None  # sent to the gateway with every attempt
+
+
+class PaymentPipeline:
+    """Background payment processor.
+
+    Requests persist a pending Payment and submit a PaymentJob; a fixed set of worker
+    tasks running on a dedicated event loop thread drive the provider charge through the
+    shared provider registry with a per-provider concurrency limit, a per-attempt timeout
+    and exponential backoff, then record the outcome. Waiters blocked in wait(), or
+    awaiting wait_async(), are released once a payment settles.
+
+    The queue is only a hand-off: the pending row (with its charge token) is the source
+    of truth. Each attempt first renews the row's updated_at, and stops if the row is no
+    longer pending. A recovery task re-enqueues pending rows that nobody touched for
+    recovery_after seconds, i.e. jobs of a worker that crashed or was restarted; on
+    stop() unfinished jobs are released so the next recovery pass picks them up at once.
+    Claims are conditional UPDATEs, so two workers never resume the same payment.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.PAYMENT_WORKERS,
+        queue_size: int = settings.PAYMENT_QUEUE_SIZE,
+        provider_concurrency: int = settings.PAYMENT_PROVIDER_CONCURRENCY,
+        charge_timeout: float = settings.PAYMENT_CHARGE_TIMEOUT_SECONDS,
+        max_attempts: int = settings.PAYMENT_MAX_ATTEMPTS,
+        backoff_seconds: float = settings.PAYMENT_RETRY_BACKOFF_SECONDS,
+        recovery_interval: float = settings.PAYMENT_RECOVERY_INTERVAL_SECONDS,
+        recovery_after: float = settings.PAYMENT_RECOVERY_AFTER_SECONDS,
+        wait_poll: float = settings.PAYMENT_WAIT_POLL_SECONDS,
+        registry: Optional[PaymentProviderRegistry] = None,
+    ):
+        self._registry = registry
+        self.workers = workers
+        self.queue_size = queue_size
+        self.provider_concurrency = provider_concurrency
+        self.charge_timeout = charge_timeout
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.recovery_interval = recovery_interval
+        self.recovery_after = recovery_after
+        self.wait_poll = wait_poll
+        self.recovered = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._active: Dict[int, PaymentJob] = {}  # jobs a worker task is processing
+        self._waiters: Dict[int, threading.Event] = {}
+        self._wakeups: Dict[int, List[Callable[[], None]]] = {}  # wait_async callbacks per payment
+        self._waiters_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+
+    @property
+    def registry(self) -> PaymentProviderRegistry:
+        return self._registry or get_payment_registry()
+
+    # PUBLIC_INTERFACE
+    def start(self) -> None:
+        """Start the event loop thread, worker tasks and recovery task (idempotent)."""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(ready,), name="payment-pipeline", daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    # PUBLIC_INTERFACE
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the worker tasks and event loop thread, releasing unfinished jobs for recovery."""
+        with self._start_lock:
+            if self._thread is None or self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout)
+            self._thread = None
+            self._loop = None
+            self._queue = None
+            self._semaphores.clear()
+
+    # PUBLIC_INTERFACE
+    def submit(self, job: PaymentJob) -> None:
+        """Enqueue a job for processing. Raises PaymentQueueFull when the queue is saturated."""
+        self.start()
+        self._event_for(job.payment_id)
+        future = asyncio.run_coroutine_threadsafe(self._enqueue(job), self._loop)
+        try:
+            future.result(timeout=5)
+        except Exception:
+            future.cancel()
+            self._settle(job.payment_id)
+            raise
+
+    # PUBLIC_INTERFACE
+    def wait(self, payment_id: int, timeout: float) -> bool:
+        """Block up to timeout seconds until the payment settles; return True if it did.
+
+        Payments queued by this process are awaited on an in-memory event; any other
+        payment (queued by another worker, or recovered) is polled every wait_poll seconds.
+        """
+        with self._waiters_lock:
+            event = self._waiters.get(payment_id)
+        if event is not None:
+            return event.wait(timeout)
+        deadline = time.monotonic() + timeout
+        while True:
+            status = self._status(payment_id)
+            if status is None or status in TERMINAL_STATUSES:
+                return status is not None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.wait_poll, remaining))
+
+    # PUBLIC_INTERFACE
+    async def wait_async(self, payment_id: int, timeout: float) -> bool:
+        """Like wait(), for async handlers: no thread is held while waiting.
+
+        Only the status polls of payments queued elsewhere run in the threadpool.
+        """
+        loop = asyncio.get_running_loop()
+        settled = asyncio.Event()
+
+        def wake() -> None:
+            try:
+                loop.call_soon_threadsafe(settled.set)
+            except RuntimeError:  # the waiting loop is gone
+                pass
+
+        with self._waiters_lock:
+            local = payment_id in self._waiters
+            if local:
+                self._wakeups.setdefault(payment_id, []).append(wake)
+        if local:
+            try:
+                await asyncio.wait_for(settled.wait(), timeout)
+                return True
+            except asyncio.TimeoutError:
+                return False
+            finally:
+                with self._waiters_lock:
+                    wakeups = self._wakeups.get(payment_id, [])
+                    if wake in wakeups:
+                        wakeups.remove(wake)
+        deadline = time.monotonic() + timeout
+        while True:
+            status = await run_in_threadpool(self._status, payment_id)
+            if status is None or status in TERMINAL_STATUSES:
+                return status is not None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(self.wait_poll, remaining))
+
+    @staticmethod
+    def _status(payment_id: int) -> Optional[str]:
+        with SessionLocal() as db:
+            return db.execute(select(Payment.status).where(Payment.id == payment_id)).scalar()
+
+    # PUBLIC_INTERFACE
+    def recover_pending(self, limit: int) -> List[PaymentJob]:
+        """Claim up to limit abandoned pending payments and return them as jobs.
+
+        Pending rows without a charge token (created before tokens were stored) can
+        never be charged and are marked failed instead.
+        """
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=self.recovery_after)
+        abandoned = (Payment.status == "pending", Payment.updated_at < cutoff)
+        with SessionLocal() as db:
+            db.execute(
+                update(Payment)
+                .where(*abandoned, Payment.charge_token.is_(None))
+                .values(status="failed", updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            candidates = (
+                select(Payment.id)
+                .where(*abandoned, Payment.charge_token.is_not(None))
+                .order_by(Payment.id)
+                .limit(limit)
+            )
+            # The pending/age predicate is re-checked per row, so concurrent claims never overlap
+            rows = db.execute(
+                update(Payment)
+                .where(Payment.id.in_(candidates), *abandoned)
+                .values(updated_at=now)
+                .returning(
+                    Payment.id,
+                    Payment.provider,
+                    Payment.amount_cents,
+                    Payment.currency,
+                    Payment.charge_token,
+                    Payment.idempotency_key,
+                )
+                .execution_options(synchronize_session=False)
+            ).all()
+            db.commit()
+        self.recovered += len(rows)
+        return [PaymentJob(*row) for row in rows]
+
+    def _event_for(self, payment_id: int) -> threading.Event:
+        with self._waiters_lock:
+            return self._waiters.setdefault(payment_id, threading.Event())
+
+    def _settle(self, payment_id: int) -> None:
+        with self._waiters_lock:
+            event = self._waiters.pop(payment_id, None)
+            wakeups = self._wakeups.pop(payment_id, [])
+        if event is not None:
+            event.set()
+        for wake in wakeups:
+            wake()
+
+    def _run(self, ready: threading.Event) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._active.clear()
+        tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        tasks.append(loop.create_task(self._recover()))
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            unfinished = list(self._active)
+            while not self._queue.empty():
+                unfinished.append(self._queue.get_nowait().payment_id)
+            try:
+                self._release(unfinished)
+            except Exception:
+                logger.exception("Failed to release %d unfinished payments", len(unfinished))
+            # The registry's pooled connections are bound to this loop; close them with it
+            loop.run_until_complete(self.registry.aclose())
+            if self._registry is None:
+                reset_payment_registry()
+            loop.close()
+
+    async def _enqueue(self, job: PaymentJob) -> None:
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise PaymentQueueFull("Payment queue is full, try again later.")
+
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(provider)
+        if sem is None:
+            sem = self._semaphores[provider] = asyncio.Semaphore(self.provider_concurrency)
+        return sem
+
+    async def _recover(self) -> None:
+        while True:
+            free = self.queue_size - self._queue.qsize()
+            if free > 0:
+                try:
+                    jobs = await asyncio.to_thread(self.recover_pending, free)
+                except Exception:
+                    logger.exception("Payment recovery failed")
+                    jobs = []
+                for job in jobs:
+                    logger.info("Resuming abandoned payment %s", job.payment_id)
+                    self._queue.put_nowait(job)
+            await asyncio.sleep(self.recovery_interval)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._active[job.payment_id] = job
+            try:
+                await self._process(job)
+            except Exception:
+                logger.exception("Payment %s processing crashed", job.payment_id)
+                await asyncio.to_thread(self._record, job.payment_id, "failed", None, self.max_attempts)
+            finally:
+                self._active.pop(job.payment_id, None)
+                self._queue.task_done()
+                self._settle(job.payment_id)
+
+    async def _process(self, job: PaymentJob) -> None:
+        status, ref = "failed", None
+        attempt = 0
+        while attempt < self.max_attempts:
+            attempt += 1
+            if not await asyncio.to_thread(self._touch, job.payment_id):
+                # Failed by the request that could not queue it, or settled elsewhere
+                return
+            try:
+                status, ref = await self._charge_once(job)
+                break
+            except PaymentTransientError as exc:
+                logger.warning("Payment %s attempt %s failed: %r", job.payment_id, attempt, exc)
+                status, ref = "failed", None
+                if attempt < self.max_attempts:
+                    await asyncio.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
+        await asyncio.to_thread(self._record, job.payment_id, status, ref, attempt)
+
+    async def _charge_once(self, job: PaymentJob) -> Tuple[str, str]:
+        async with self._semaphore(job.provider):
+            return await self.registry.charge(
+                job.provider,
+                job.amount_cents,
+                job.currency,
+                job.token,
+                timeout=self.charge_timeout,
+                idempotency_key=self._gateway_key(job),
+            )
+
+    @staticmethod
+    def _gateway_key(job: PaymentJob) -> str:
+        # Client keys are only unique per user; the payment id scopes them gateway-wide
+        return f"payment-{job.payment_id}-{job.idempotency_key or ''}"
+
+    def _touch(self, payment_id: int) -> bool:
+        # Renews the recovery lease; False when the payment is no longer pending
+        with SessionLocal() as db:
+            touched = db.query(Payment).filter(Payment.id == payment_id, Payment.status == "pending").update(
+                {Payment.updated_at: datetime.utcnow()}, synchronize_session=False
+            )
+            db.commit()
+        return touched > 0
+
+    def _record(self, payment_id: int, status: str, ref: Optional[str], attempts: int) -> None:
+        with SessionLocal() as db:
+            db.query(Payment).filter(Payment.id == payment_id, Payment.status == "pending").update(
+                {
+                    Payment.status: status,
+                    Payment.provider_ref: ref or None,
+                    Payment.charge_token: None,
+                    Payment.attempts: attempts,
+                    Payment.updated_at: datetime.utcnow(),
+                },
+                synchronize_session=False,
+            )
+            db.commit()
+
+    def _release(self, payment_ids: List[int]) -> None:
+        if not payment_ids:
+            return
+        with SessionLocal() as db:
+            db.query(Payment).filter(Payment.id.in_(payment_ids), Payment.status == "pending").update(
+                {Payment.updated_at: _RELEASED_AT}, synchronize_session=False
+            )
+            db.commit()
+
+
+_pipeline: Optional[PaymentPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+# PUBLIC_INTERFACE
+def get_payment_pipeline() -> PaymentPipeline:
+    """Return the process-wide payment pipeline, creating it on first use."""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = PaymentPipeline()
+    return _pipeline
@@ -1,5 +1,12 @@
-from dataclasses import dataclass
-from typing import Protocol, Tuple
+import asyncio
+import base64
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Protocol, Tuple
+
+import httpx
 
 from src.core.config import get_settings
 
@@ -10,58 +17,397 @@ class PaymentError(Exception):
     pass
 
 
+class PaymentTransientError(PaymentError):
+    """Raised by providers for retryable failures (gateway timeouts, 5xx, network errors)."""
+
+
+class PaymentProviderUnavailable(PaymentTransientError):
+    """Raised when a provider's circuit breaker is open."""
+
+
+def _simulate_latency(latency_seconds: float) -> None:
+    if latency_seconds > 0:
+        time.sleep(latency_seconds)
+
+
+async def _gateway_charge(
+    client: httpx.AsyncClient,
+    base_url: str,
+    headers: Dict[str, str],
+    amount_cents: int,
+    currency: str,
+    token: str,
+    idempotency_key: Optional[str] = None,
+) -> Tuple[str, str]:
+    """POST a charge to a gateway and map the response to (status, provider_ref).
+
+    The gateway is expected to answer 2xx with {"status": ..., "id": ...}; 4xx is a
+    decline and 5xx or network errors are retryable. Every attempt for the same
+    payment carries the same Idempotency-Key, so a retry after a timeout whose
+    request did reach the gateway does not charge twice.
+    """
+    if idempotency_key:
+        headers = {**headers, "Idempotency-Key": idempotency_key}
+    try:
+        resp = await client.post(
+            f"{base_url.rstrip('/')}/charges",
+            json={"amount": amount_cents, "currency": currency, "source": token},
+            headers=headers,
+        )
+    except httpx.HTTPError as e:
+        raise PaymentTransientError(f"Gateway request failed: {e!r}")
+    if resp.status_code >= 500:
+        raise PaymentTransientError(f"Gateway error {resp.status_code}")
+    if resp.status_code >= 400:
+        return ("failed", "")
+    body = resp.json()
+    return (body.get("status", "failed"), body.get("id", ""))
+
+
 class PaymentProvider(Protocol):
     # PUBLIC_INTERFACE
     def charge(self, amount_cents: int, currency: str, token: str) -> Tuple[str, str]:
         """Charge the specified amount and return (status, provider_ref)."""
 
+    # PUBLIC_INTERFACE
+    async def acharge(
+        self, amount_cents: int, currency: str, token: str, idempotency_key: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """Async variant of charge used by the payment pipeline."""
+
 
 @dataclass
 class StripeProvider:
     api_key: str | None = None
+    latency_seconds: float = 0.0
+    base_url: str | None = None
+    client: httpx.AsyncClient | None = field(default=None, repr=False)
 
-    # PUBLIC_INTERFACE
-    def charge(self, amount_cents: int, currency: str, token: str) -> Tuple[str, str]:
-        """Simulate Stripe charge; accepts tokens starting with 'tok_' as success."""
+    def _simulate(self, token: str) -> Tuple[str, str]:
         if not token.startswith("tok_"):
             return ("failed", "")
         provider_ref = f"pi_{token[-10:]}"
         return ("succeeded", provider_ref)
 
+    # PUBLIC_INTERFACE
+    def charge(self, amount_cents: int, currency: str, token: str) -> Tuple[str, str]:
+        """Simulate Stripe charge; accepts tokens starting with 'tok_' as success."""
+        _simulate_latency(self.latency_seconds)
+        return self._simulate(token)
+
+    # PUBLIC_INTERFACE
+    async def acharge(
+        self, amount_cents: int, currency: str, token: str, idempotency_key: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """Charge through the Stripe gateway when configured, otherwise simulate."""
+        if self.base_url and self.client is not None:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            return await _gateway_charge(
+                self.client, self.base_url, headers, amount_cents, currency, token, idempotency_key
+            )
+        await asyncio.sleep(self.latency_seconds)
+        return self._simulate(token)
+
 
 @dataclass
 class PayPalProvider:
     client_id: str | None = None
     client_secret: str | None = None
+    latency_seconds: float = 0.0
+    base_url: str | None = None
+    client: httpx.AsyncClient | None = field(default=None, repr=False)
 
-    # PUBLIC_INTERFACE
-    def charge(self, amount_cents: int, currency: str, token: str) -> Tuple[str, str]:
-        """Simulate PayPal capture; tokens starting with 'pp_' succeed."""
+    def _simulate(self, token: str) -> Tuple[str, str]:
         if not token.startswith("pp_"):
             return ("failed", "")
         provider_ref = f"pp_txn_{token[-10:]}"
         return ("succeeded", provider_ref)
 
+    # PUBLIC_INTERFACE
+    def charge(self, amount_cents: int, currency: str, token: str) -> Tuple[str, str]:
+        """Simulate PayPal capture; tokens starting with 'pp_' succeed."""
+        _simulate_latency(self.latency_seconds)
+        return self._simulate(token)
+
+    # PUBLIC_INTERFACE
+    async def acharge(
+        self, amount_cents: int, currency: str, token: str, idempotency_key: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """Capture through the PayPal gateway when configured, otherwise simulate."""
+        if self.base_url and self.client is not None:
+            headers = {}
+            if self.client_id:
+                creds = base64.b64encode(f"{self.client_id}:{self.client_secret or ''}".encode()).decode()
+                headers["Authorization"] = f"Basic {creds}"
+            return await _gateway_charge(
+                self.client, self.base_url, headers, amount_cents, currency, token, idempotency_key
+            )
+        await asyncio.sleep(self.latency_seconds)
+        return self._simulate(token)
+
 
 @dataclass
 class MockUPIProvider:
-    # PUBLIC_INTERFACE
-    def charge(self, amount_cents: int, currency: str, token: str) -> Tuple[str, str]:
-        """Simulate UPI payment; tokens starting with 'upi_' succeed."""
+    latency_seconds: float = 0.0
+    base_url: str | None = None
+    client: httpx.AsyncClient | None = field(default=None, repr=False)
+
+    def _simulate(self, token: str) -> Tuple[str, str]:
         if not token.startswith("upi_"):
             return ("failed", "")
         provider_ref = f"upi_txn_{token[-10:]}"
         return ("succeeded", provider_ref)
 
+    # PUBLIC_INTERFACE
+    def charge(self, amount_cents: int, currency: str, token: str) -> Tuple[str, str]:
+        """Simulate UPI payment; tokens starting with 'upi_' succeed."""
+        _simulate_latency(self.latency_seconds)
+        return self._simulate(token)
+
+    # PUBLIC_INTERFACE
+    async def acharge(
+        self, amount_cents: int, currency: str, token: str, idempotency_key: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """Collect through the UPI gateway when configured, otherwise simulate."""
+        if self.base_url and self.client is not None:
+            return await _gateway_charge(
+                self.client, self.base_url, {}, amount_cents, currency, token, idempotency_key
+            )
+        await asyncio.sleep(self.latency_seconds)
+        return self._simulate(token)
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open -> closed).
+
+    Once the cool-down has passed, a single trial call is let through; its outcome
+    closes or re-opens the breaker. A trial that never reports back (e.g. the caller
+    was cancelled) is given up after another reset_seconds.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    # PUBLIC_INTERFACE
+    def allow(self) -> bool:
+        """Return True if a call may proceed: always when closed, once per trial when half-open."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < self.reset_seconds:
+                return False
+            if self._trial_started is not None and now - self._trial_started < self.reset_seconds:
+                return False
+            self._trial_started = now
+            return True
+
+    # PUBLIC_INTERFACE
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_started = None
+
+    # PUBLIC_INTERFACE
+    def record_failure(self) -> None:
+        """Count a failure, opening (or re-opening) the breaker at the threshold."""
+        with self._lock:
+            self.failures += 1
+            self._trial_started = None
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class LatencyStats:
+    """Call counters plus a bounded window of recent latencies for percentiles."""
+
+    def __init__(self, window: int = 1024):
+        self.calls = 0
+        self.errors = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    # PUBLIC_INTERFACE
+    def observe(self, seconds: float, ok: bool) -> None:
+        """Record one completed call."""
+        with self._lock:
+            self.calls += 1
+            if not ok:
+                self.errors += 1
+            self.total_seconds += seconds
+            self.max_seconds = max(self.max_seconds, seconds)
+            self._samples.append(seconds)
+
+    # PUBLIC_INTERFACE
+    def reject(self) -> None:
+        """Count a call refused by the circuit breaker."""
+        with self._lock:
+            self.rejected += 1
+
+    # PUBLIC_INTERFACE
+    def snapshot(self) -> Dict[str, float]:
+        """Return counters and p50/p95/p99 latency in milliseconds."""
+        with self._lock:
+            samples = sorted(self._samples)
+            calls, errors, rejected = self.calls, self.errors, self.rejected
+            total, peak = self.total_seconds, self.max_seconds
+
+        def pct(p: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+        return {
+            "calls": calls,
+            "errors": errors,
+            "rejected": rejected,
+            "avg_ms": (total / calls * 1000) if calls else 0.0,
+            "max_ms": peak * 1000,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+            "p99_ms": pct(0.99),
+        }
+
+
+class PaymentProviderRegistry:
+    """Long-lived provider instances sharing one pooled, keep-alive async HTTP client.
+
+    Each provider is built once and guarded by its own circuit breaker; charge()
+    records per-provider latency and error metrics.
+    """
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        self.client = client or httpx.AsyncClient(
+            timeout=settings.PAYMENT_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=settings.PAYMENT_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.PAYMENT_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.PAYMENT_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        latency = settings.PAYMENT_SIMULATED_LATENCY_MS / 1000
+        self.providers: Dict[str, PaymentProvider] = {
+            "stripe": StripeProvider(
+                api_key=settings.STRIPE_API_KEY,
+                latency_seconds=latency,
+                base_url=settings.STRIPE_API_BASE,
+                client=self.client,
+            ),
+            "paypal": PayPalProvider(
+                client_id=settings.PAYPAL_CLIENT_ID,
+                client_secret=settings.PAYPAL_CLIENT_SECRET,
+                latency_seconds=latency,
+                base_url=settings.PAYPAL_API_BASE,
+                client=self.client,
+            ),
+            "upi": MockUPIProvider(latency_seconds=latency, base_url=settings.UPI_API_BASE, client=self.client),
+        }
+        self.breakers: Dict[str, CircuitBreaker] = {
+            name: CircuitBreaker(settings.PAYMENT_BREAKER_FAILURE_THRESHOLD, settings.PAYMENT_BREAKER_RESET_SECONDS)
+            for name in self.providers
+        }
+        self.stats: Dict[str, LatencyStats] = {name: LatencyStats() for name in self.providers}
+
+    # PUBLIC_INTERFACE
+    def get(self, name: str) -> PaymentProvider:
+        """Return the provider registered under name."""
+        provider = self.providers.get(name.lower())
+        if provider is None:
+            raise PaymentError(f"Unsupported payment provider: {name}")
+        return provider
+
+    # PUBLIC_INTERFACE
+    async def charge(
+        self,
+        name: str,
+        amount_cents: int,
+        currency: str,
+        token: str,
+        timeout: float,
+        idempotency_key: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        """Charge via the named provider honoring its circuit breaker and a timeout.
+
+        Pass the payment's idempotency key on every attempt; gateways use it to
+        return the original charge instead of creating another one.
+        """
+        name = name.lower()
+        provider = self.get(name)
+        breaker, stats = self.breakers[name], self.stats[name]
+        if not breaker.allow():
+            stats.reject()
+            raise PaymentProviderUnavailable(f"Payment provider {name} is temporarily unavailable.")
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                provider.acharge(amount_cents, currency, token, idempotency_key), timeout=timeout
+            )
+        except (asyncio.TimeoutError, PaymentTransientError) as e:
+            stats.observe(time.perf_counter() - started, ok=False)
+            breaker.record_failure()
+            if isinstance(e, asyncio.TimeoutError):
+                raise PaymentTransientError(f"Payment provider {name} timed out.")
+            raise
+        stats.observe(time.perf_counter() - started, ok=True)
+        breaker.record_success()
+        return result
+
+    # PUBLIC_INTERFACE
+    def metrics(self) -> Dict[str, Dict]:
+        """Return breaker state and latency statistics per provider."""
+        return {
+            name: {"breaker": self.breakers[name].state, **self.stats[name].snapshot()}
+            for name in self.providers
+        }
+
+    # PUBLIC_INTERFACE
+    async def aclose(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        await self.client.aclose()
+
+
+_registry: Optional[PaymentProviderRegistry] = None
+_registry_lock = threading.Lock()
+
+
+# PUBLIC_INTERFACE
+def get_payment_registry() -> PaymentProviderRegistry:
+    """Return the process-wide provider registry, building it on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PaymentProviderRegistry()
+    return _registry
+
+
+# PUBLIC_INTERFACE
+def reset_payment_registry() -> None:
+    """Drop the process-wide registry so the next use builds a fresh one."""
+    global _registry
+    with _registry_lock:
+        _registry = None
+
 
 # PUBLIC_INTERFACE
 def get_payment_provider(name: str) -> PaymentProvider:
-    """Factory to get a payment provider by name."""
-    n = name.lower()
-    if n == "stripe":
-        return StripeProvider(api_key=settings.STRIPE_API_KEY)
-    if n == "paypal":
-        return PayPalProvider(client_id=settings.PAYPAL_CLIENT_ID, client_secret=settings.PAYPAL_CLIENT_SECRET)
-    if n == "upi":
-        return MockUPIProvider()
-    raise PaymentError(f"Unsupported payment provider: {name}")
+    """Return the shared provider instance for name."""
+    return get_payment_registry().get(name)
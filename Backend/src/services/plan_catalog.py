@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.core.compression import PrecompressedBody
+from src.core.config import get_settings
+from src.core.database import SessionLocal
+from src.core.events import event_bus
+from src.models.models import SubscriptionPlan
+from src.schemas.schemas import PlanOut
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+_plans_adapter = TypeAdapter(List[PlanOut])
+
+
+class PlanSnapshot:
+    """Immutable view of the active plans with the GET /subscriptions/plans body pre-rendered."""
+
+    __slots__ = ("version", "plans", "by_id", "starting_price_cents", "body", "loaded_at")
+
+    def __init__(self, plans: Tuple[PlanOut, ...], version: int):
+        self.version = version
+        self.plans = plans
+        self.by_id: Mapping[int, PlanOut] = MappingProxyType({p.id: p for p in plans})
+        # Cheapest plan per currency: the "plans from ..." figure of the pricing page
+        starting = {}
+        for plan in plans:
+            starting[plan.currency] = min(plan.price_cents, starting.get(plan.currency, plan.price_cents))
+        self.starting_price_cents: Mapping[str, int] = MappingProxyType(starting)
+        self.body = PrecompressedBody(_plans_adapter.dump_json(list(plans)))
+        self.loaded_at = time.monotonic()
+
+
+class PlanCatalog:
+    """Process-wide snapshot of the subscription plan catalog.
+
+    Readers take the current snapshot without locking; it is never mutated. A reload
+    reads the active plans in one query and replaces the snapshot with a single
+    reference assignment, so a request sees either the old or the new catalog.
+    create_plan adds its committed row to a copy of the snapshot without reading
+    the table again. "subscription_plan" events from other workers trigger a reload
+    on the event bus thread; ttl_seconds bounds staleness when no event arrives
+    (e.g. with the local transport and several workers).
+    """
+
+    def __init__(self, ttl_seconds: float = settings.PLAN_CATALOG_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[PlanSnapshot] = None
+        self._load_lock = threading.Lock()
+        self._version = 0
+        self.reloads = 0
+
+    def _load(self, db: Session) -> PlanSnapshot:
+        rows = db.execute(
+            select(SubscriptionPlan).where(SubscriptionPlan.is_active.is_(True)).order_by(SubscriptionPlan.id)
+        ).scalars()
+        self._version += 1
+        self.reloads += 1
+        return PlanSnapshot(tuple(PlanOut.model_validate(row) for row in rows), self._version)
+
+    # PUBLIC_INTERFACE
+    def get(self, db: Session) -> PlanSnapshot:
+        """Return the current snapshot, loading it with db on first use or once it has expired."""
+        snapshot = self._snapshot
+        if snapshot is None or self._expired(snapshot):
+            with self._load_lock:
+                snapshot = self._snapshot
+                if snapshot is None or self._expired(snapshot):
+                    snapshot = self._snapshot = self._load(db)
+        return snapshot
+
+    def _expired(self, snapshot: PlanSnapshot) -> bool:
+        return time.monotonic() - snapshot.loaded_at > self.ttl_seconds
+
+    # PUBLIC_INTERFACE
+    def reload(self, db: Optional[Session] = None) -> PlanSnapshot:
+        """Read the plans again and swap in the new snapshot.
+
+        Reloads are serialized, so the last one to finish read the latest committed
+        plans. Without db a short-lived session is used.
+        """
+        with self._load_lock:
+            if db is not None:
+                snapshot = self._load(db)
+            else:
+                with SessionLocal() as own:
+                    snapshot = self._load(own)
+            self._snapshot = snapshot
+        return snapshot
+
+    # PUBLIC_INTERFACE
+    def add(self, plan: PlanOut) -> None:
+        """Swap in a snapshot that includes a just-committed plan, without querying."""
+        with self._load_lock:
+            current = self._snapshot
+            if current is None:
+                return  # the next request loads the table, new plan included
+            plans = tuple(p for p in current.plans if p.id != plan.id)
+            if plan.is_active:
+                plans = tuple(sorted(plans + (plan,), key=lambda p: p.id))
+            self._version += 1
+            self._snapshot = PlanSnapshot(plans, self._version)
+
+    # PUBLIC_INTERFACE
+    def refresh(self) -> None:
+        """Reload after a plan change; on failure drop the snapshot so the next request loads it."""
+        try:
+            self.reload()
+        except Exception:
+            logger.exception("Plan catalog reload failed")
+            self._snapshot = None
+
+    # PUBLIC_INTERFACE
+    def stats(self) -> dict:
+        """Return the snapshot version, plan count and age."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"loaded": False, "reloads": self.reloads}
+        return {
+            "loaded": True,
+            "version": snapshot.version,
+            "plans": len(snapshot.plans),
+            "starting_price_cents": dict(snapshot.starting_price_cents),
+            "age_seconds": round(time.monotonic() - snapshot.loaded_at, 3),
+            "reloads": self.reloads,
+        }
+
+
+plan_catalog = PlanCatalog()
+# Local writes update the snapshot in create_plan; only other workers' changes need a reload
+event_bus.subscribe("subscription_plan", lambda ev: plan_catalog.refresh(), remote_only=True)
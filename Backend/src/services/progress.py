@@ -0,0 +1,243 @@
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.core.config import get_settings
+from src.core.database import SessionLocal, dialect_insert
+from src.models.models import Content, PlaybackProgress, Profile
+from src.services.content_tags import TAG_LOADERS
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# (position_seconds, duration_seconds, completed, updated_at)
+ProgressEntry = Tuple[int, Optional[int], bool, datetime]
+
+# Keeps IN (...) lists below SQLite's bound parameter limit
+_IN_CHUNK = 900
+
+
+def _chunks(values: Sequence, size: int = _IN_CHUNK) -> Iterable[Sequence]:
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+class ProgressTracker:
+    """Coalesces player heartbeats in memory and flushes them in batched upserts.
+
+    Heartbeats for the same (profile, content) overwrite each other, so the database
+    sees at most one write per pair per flush interval no matter how often players
+    report. Reads merge unflushed entries over the stored rows so the continue-watching
+    rail is never behind the last heartbeat received by this process.
+
+    The last position per pair is also kept after it is flushed, so last_position
+    answers from memory for players whose heartbeats reach this process and reads
+    the stored row when the previous heartbeat went to another worker.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = settings.PROGRESS_FLUSH_INTERVAL_SECONDS,
+        batch_size: int = settings.PROGRESS_FLUSH_BATCH_SIZE,
+        completion_ratio: float = settings.PROGRESS_COMPLETION_RATIO,
+        owner_cache_size: int = 100_000,
+        position_cache_size: int = 100_000,
+    ):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.completion_ratio = completion_ratio
+        self.owner_cache_size = owner_cache_size
+        self.position_cache_size = position_cache_size
+        # profile_id -> content_id -> entry
+        self._pending: Dict[int, Dict[int, ProgressEntry]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._owners: "OrderedDict[int, int]" = OrderedDict()
+        # (profile_id, content_id) -> (position, updated_at) of the latest heartbeat seen here
+        self._positions: "OrderedDict[Tuple[int, int], Tuple[int, datetime]]" = OrderedDict()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.heartbeats = 0
+        self.rows_flushed = 0
+
+    # PUBLIC_INTERFACE
+    def start(self) -> None:
+        """Start the periodic flush thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="progress-flusher", daemon=True)
+            self._thread.start()
+
+    # PUBLIC_INTERFACE
+    def stop(self) -> None:
+        """Stop the flush thread and write out anything still pending."""
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Progress flush failed")
+
+    # PUBLIC_INTERFACE
+    def profile_owner(self, db: Session, profile_id: int) -> Optional[int]:
+        """Return the owning user id of a profile, cached since ownership never changes."""
+        with self._lock:
+            owner = self._owners.get(profile_id)
+            if owner is not None:
+                self._owners.move_to_end(profile_id)
+                return owner
+        owner = db.query(Profile.user_id).filter(Profile.id == profile_id).scalar()
+        if owner is not None:
+            with self._lock:
+                self._owners[profile_id] = owner
+                while len(self._owners) > self.owner_cache_size:
+                    self._owners.popitem(last=False)
+        return owner
+
+    # PUBLIC_INTERFACE
+    def forget_profile(self, profile_id: int) -> None:
+        """Drop cached ownership and pending heartbeats of a deleted profile."""
+        with self._lock:
+            self._owners.pop(profile_id, None)
+            self._pending.pop(profile_id, None)
+            for key in [key for key in self._positions if key[0] == profile_id]:
+                del self._positions[key]
+
+    # PUBLIC_INTERFACE
+    def last_position(self, db: Session, profile_id: int, content_id: int) -> Optional[Tuple[int, datetime]]:
+        """Return (position, updated_at) of the previous heartbeat for the pair, from any worker.
+
+        A heartbeat received by another worker is seen once that worker has flushed it.
+        """
+        key = (profile_id, content_id)
+        with self._lock:
+            last = self._positions.get(key)
+        if last is not None:
+            return last
+        row = db.execute(
+            select(PlaybackProgress.position_seconds, PlaybackProgress.updated_at).where(
+                PlaybackProgress.profile_id == profile_id, PlaybackProgress.content_id == content_id
+            )
+        ).first()
+        return (row.position_seconds, row.updated_at) if row is not None else None
+
+    # PUBLIC_INTERFACE
+    def record(self, profile_id: int, content_id: int, position: int, duration: Optional[int]) -> None:
+        """Record a heartbeat; only the latest one per (profile, content) is kept."""
+        completed = bool(duration) and position >= duration * self.completion_ratio
+        now = datetime.utcnow()
+        with self._lock:
+            self._pending.setdefault(profile_id, {})[content_id] = (position, duration, completed, now)
+            self._positions.pop((profile_id, content_id), None)
+            self._positions[(profile_id, content_id)] = (position, now)
+            while len(self._positions) > self.position_cache_size:
+                self._positions.popitem(last=False)
+            self.heartbeats += 1
+        if self._thread is None:
+            self.start()
+
+    # PUBLIC_INTERFACE
+    def flush(self) -> int:
+        """Upsert all pending heartbeats in batches and return the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            rows = [
+                {
+                    "profile_id": profile_id,
+                    "content_id": content_id,
+                    "position_seconds": position,
+                    "duration_seconds": duration,
+                    "completed": completed,
+                    "updated_at": updated_at,
+                }
+                for profile_id, entries in pending.items()
+                for content_id, (position, duration, completed, updated_at) in entries.items()
+            ]
+            try:
+                with SessionLocal() as db:
+                    # Drop heartbeats for titles or profiles deleted since they were recorded
+                    live_contents, live_profiles = set(), set()
+                    for chunk in _chunks(sorted({r["content_id"] for r in rows})):
+                        live_contents.update(db.execute(select(Content.id).where(Content.id.in_(chunk))).scalars())
+                    for chunk in _chunks(sorted(pending)):
+                        live_profiles.update(db.execute(select(Profile.id).where(Profile.id.in_(chunk))).scalars())
+                    rows = [r for r in rows if r["content_id"] in live_contents and r["profile_id"] in live_profiles]
+                    stmt = dialect_insert(db, PlaybackProgress)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["profile_id", "content_id"],
+                        set_={
+                            "position_seconds": stmt.excluded.position_seconds,
+                            "duration_seconds": stmt.excluded.duration_seconds,
+                            "completed": stmt.excluded.completed,
+                            "updated_at": stmt.excluded.updated_at,
+                        },
+                        # Another worker may already have stored a newer heartbeat for the pair
+                        where=PlaybackProgress.updated_at <= stmt.excluded.updated_at,
+                    )
+                    for i in range(0, len(rows), self.batch_size):
+                        db.execute(stmt, rows[i:i + self.batch_size])
+                    db.commit()
+            except Exception:
+                self._requeue(pending)
+                raise
+            self.rows_flushed += len(rows)
+            return len(rows)
+
+    def _requeue(self, pending: Dict[int, Dict[int, ProgressEntry]]) -> None:
+        # Newer heartbeats that arrived during the failed flush take precedence
+        with self._lock:
+            for profile_id, entries in pending.items():
+                current = self._pending.setdefault(profile_id, {})
+                for content_id, entry in entries.items():
+                    current.setdefault(content_id, entry)
+
+    # PUBLIC_INTERFACE
+    def continue_watching(self, db: Session, profile_id: int, limit: int = 20) -> List[dict]:
+        """Return the profile's unfinished titles, most recently watched first."""
+        with self._lock:
+            pending = dict(self._pending.get(profile_id, {}))
+        stored = (
+            db.query(PlaybackProgress)
+            .filter(PlaybackProgress.profile_id == profile_id, PlaybackProgress.completed.is_(False))
+            .order_by(PlaybackProgress.updated_at.desc())
+            .limit(limit + len(pending))
+            .all()
+        )
+        merged: Dict[int, ProgressEntry] = {
+            row.content_id: (row.position_seconds, row.duration_seconds, row.completed, row.updated_at) for row in stored
+        }
+        merged.update(pending)
+        latest = sorted(
+            ((cid, e) for cid, e in merged.items() if not e[2]), key=lambda item: item[1][3], reverse=True
+        )[:limit]
+        if not latest:
+            return []
+        contents = {}
+        for chunk in _chunks([cid for cid, _ in latest]):
+            contents.update((c.id, c) for c in db.query(Content).options(*TAG_LOADERS).filter(Content.id.in_(chunk)))
+        return [
+            {"content": contents[cid], "position_seconds": e[0], "duration_seconds": e[1], "updated_at": e[3]}
+            for cid, e in latest
+            if cid in contents
+        ]
+
+
+progress_tracker = ProgressTracker()
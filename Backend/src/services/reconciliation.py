@@ -0,0 +1,299 @@
+import argparse
+import csv
+import heapq
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from src.models.models import Payment
+
+SETTLEMENT_FIELDS = ("provider_ref", "amount_cents", "currency", "status")
+
+# (provider_ref, amount_cents, currency, status)
+SettlementRow = Tuple[str, int, str, str]
+# (payment_id, provider_ref, amount_cents, currency, status)
+PaymentRow = Tuple[int, str, int, str, str]
+
+
+@dataclass
+class Mismatch:
+    # amount, currency, status, missing_payment, missing_settlement, duplicate_settlement, duplicate_payment
+    kind: str
+    provider_ref: str
+    payment_id: Optional[int] = None
+    expected: Optional[str] = None
+    actual: Optional[str] = None
+
+
+@dataclass
+class ReconciliationReport:
+    provider: str
+    settlement_rows: int = 0
+    payment_rows: int = 0
+    matched: int = 0
+    mismatches: Counter = field(default_factory=Counter)
+    samples: List[Mismatch] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        total = self.settlement_rows + self.payment_rows
+        return total / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    # PUBLIC_INTERFACE
+    def as_dict(self) -> Dict:
+        """Return a JSON-serializable summary."""
+        return {
+            "provider": self.provider,
+            "settlement_rows": self.settlement_rows,
+            "payment_rows": self.payment_rows,
+            "matched": self.matched,
+            "mismatches": dict(self.mismatches),
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+def _read_settlement(path: str) -> Iterator[SettlementRow]:
+    with open(path, newline="") as fh:
+        for rec in csv.DictReader(fh):
+            yield (rec["provider_ref"], int(rec["amount_cents"]), rec["currency"], rec["status"])
+
+
+def _sorted_runs(rows: Iterable[SettlementRow], chunk_size: int, tmpdir: str) -> List[str]:
+    """Spill rows into sorted run files of at most chunk_size rows each."""
+    runs: List[str] = []
+    chunk: List[SettlementRow] = []
+
+    def flush():
+        chunk.sort()
+        path = os.path.join(tmpdir, f"run-{len(runs):05d}.csv")
+        with open(path, "w", newline="") as fh:
+            csv.writer(fh).writerows(chunk)
+        runs.append(path)
+        chunk.clear()
+
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+    return runs
+
+
+def _read_run(path: str) -> Iterator[SettlementRow]:
+    with open(path, newline="") as fh:
+        for ref, amount, currency, status in csv.reader(fh):
+            yield (ref, int(amount), currency, status)
+
+
+def _external_sort(rows: Iterable[SettlementRow], chunk_size: int, tmpdir: str) -> Iterator[SettlementRow]:
+    """Sort rows by provider_ref with memory bounded by chunk_size (k-way merge of runs)."""
+    return heapq.merge(*(_read_run(p) for p in _sorted_runs(rows, chunk_size, tmpdir)))
+
+
+def _iter_payments(
+    db: Session, provider: str, start: datetime, end: datetime, chunk_size: int
+) -> Iterator[PaymentRow]:
+    """Stream payments for a provider and created_at window ordered by (provider_ref, id).
+
+    Uses keyset pagination on (provider_ref, id), so each chunk is an index range scan,
+    memory stays bounded by chunk_size and payments sharing a ref are not skipped at a
+    chunk boundary. The merge-join compares refs as Python strings (code point order);
+    PostgreSQL sorts and compares them with the "C" collation to agree with it.
+    """
+    ref = Payment.provider_ref
+    if db.get_bind().dialect.name == "postgresql":
+        ref = ref.collate("C")
+    last = ("", 0)
+    while True:
+        chunk = (
+            db.query(Payment.id, Payment.provider_ref, Payment.amount_cents, Payment.currency, Payment.status)
+            .filter(
+                Payment.provider == provider,
+                Payment.provider_ref.isnot(None),
+                tuple_(ref, Payment.id) > tuple_(*last),
+                Payment.created_at >= start,
+                Payment.created_at < end,
+            )
+            .order_by(ref, Payment.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not chunk:
+            return
+        for row in chunk:
+            yield tuple(row)
+        last = (chunk[-1][1], chunk[-1][0])
+
+
+# PUBLIC_INTERFACE
+def reconcile(
+    db: Session,
+    provider: str,
+    settlement_path: str,
+    start: datetime,
+    end: datetime,
+    chunk_size: int = 50_000,
+    on_mismatch: Optional[Callable[[Mismatch], None]] = None,
+    max_samples: int = 100,
+) -> ReconciliationReport:
+    """Reconcile a provider settlement CSV against recorded payments.
+
+    The settlement file is externally sorted by provider_ref and merge-joined with
+    payments streamed in provider_ref order, so memory use is independent of file
+    size. Payments that are not 'succeeded' are expected to be absent from the
+    settlement file. A ref repeated in the file is a duplicate_settlement; further
+    payments recorded against an already seen ref are duplicate_payment. Every
+    mismatch is passed to on_mismatch; the first max_samples are also kept on the
+    report.
+    """
+    report = ReconciliationReport(provider=provider)
+    started = time.perf_counter()
+
+    def flag(m: Mismatch) -> None:
+        report.mismatches[m.kind] += 1
+        if len(report.samples) < max_samples:
+            report.samples.append(m)
+        if on_mismatch is not None:
+            on_mismatch(m)
+
+    def counted_settlement() -> Iterator[SettlementRow]:
+        for row in _read_settlement(settlement_path):
+            report.settlement_rows += 1
+            yield row
+
+    def counted_payments() -> Iterator[PaymentRow]:
+        for row in _iter_payments(db, provider, start, end, chunk_size):
+            report.payment_rows += 1
+            yield row
+
+    with tempfile.TemporaryDirectory(prefix="reconcile-") as tmpdir:
+        settlements = _external_sort(counted_settlement(), chunk_size, tmpdir)
+        payments = counted_payments()
+        s = next(settlements, None)
+        p = next(payments, None)
+        prev_ref = prev_payment_ref = None
+        while s is not None or p is not None:
+            if s is not None and s[0] == prev_ref:
+                flag(Mismatch("duplicate_settlement", s[0]))
+                s = next(settlements, None)
+                continue
+            if p is not None and p[1] == prev_payment_ref:
+                flag(Mismatch("duplicate_payment", p[1], payment_id=p[0], expected=p[4]))
+                p = next(payments, None)
+                continue
+            if p is None or (s is not None and s[0] < p[1]):
+                flag(Mismatch("missing_payment", s[0], actual=s[3]))
+                prev_ref, s = s[0], next(settlements, None)
+            elif s is None or p[1] < s[0]:
+                if p[4] == "succeeded":
+                    flag(Mismatch("missing_settlement", p[1], payment_id=p[0], expected=p[4]))
+                prev_payment_ref, p = p[1], next(payments, None)
+            else:
+                payment_id, ref, amount, currency, status = p
+                if status != s[3]:
+                    flag(Mismatch("status", ref, payment_id, expected=status, actual=s[3]))
+                elif amount != s[1]:
+                    flag(Mismatch("amount", ref, payment_id, expected=str(amount), actual=str(s[1])))
+                elif currency != s[2]:
+                    flag(Mismatch("currency", ref, payment_id, expected=currency, actual=s[2]))
+                else:
+                    report.matched += 1
+                prev_ref, s = s[0], next(settlements, None)
+                prev_payment_ref, p = p[1], next(payments, None)
+
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
+
+
+# PUBLIC_INTERFACE
+def write_mock_settlement_file(
+    db: Session,
+    provider: str,
+    start: datetime,
+    end: datetime,
+    path: str,
+    corrupt_ratio: float = 0.0,
+    seed: int = 0,
+) -> int:
+    """Write a settlement CSV as the simulated provider would report it.
+
+    Succeeded payments in the window are emitted in shuffled order; corrupt_ratio of
+    them get a perturbed amount so fixtures exercise mismatch detection. Returns the
+    number of rows written.
+    """
+    rng = random.Random(seed)
+    rows = [
+        [ref, amount, currency, status]
+        for ref, amount, currency, status in db.query(
+            Payment.provider_ref, Payment.amount_cents, Payment.currency, Payment.status
+        ).filter(
+            Payment.provider == provider,
+            Payment.status == "succeeded",
+            Payment.provider_ref.isnot(None),
+            Payment.created_at >= start,
+            Payment.created_at < end,
+        )
+    ]
+    rng.shuffle(rows)
+    for row in rows:
+        if rng.random() < corrupt_ratio:
+            row[1] += 1
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(SETTLEMENT_FIELDS)
+        writer.writerows(rows)
+    return len(rows)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import json
+
+    from src.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Reconcile a provider settlement file against payments.")
+    parser.add_argument("--provider", required=True, help="stripe|paypal|upi")
+    parser.add_argument("--file", required=True, help="Settlement CSV path")
+    parser.add_argument("--start", required=True, type=datetime.fromisoformat, help="Window start (ISO)")
+    parser.add_argument("--end", required=True, type=datetime.fromisoformat, help="Window end (ISO, exclusive)")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--mismatches-out", help="Optional CSV path receiving every mismatch")
+    args = parser.parse_args(argv)
+
+    out_fh = open(args.mismatches_out, "w", newline="") if args.mismatches_out else None
+    writer = csv.writer(out_fh) if out_fh else None
+    if writer:
+        writer.writerow(["kind", "provider_ref", "payment_id", "expected", "actual"])
+
+    def write_mismatch(m: Mismatch) -> None:
+        writer.writerow([m.kind, m.provider_ref, m.payment_id, m.expected, m.actual])
+
+    try:
+        with SessionLocal() as db:
+            report = reconcile(
+                db,
+                args.provider,
+                args.file,
+                args.start,
+                args.end,
+                chunk_size=args.chunk_size,
+                on_mismatch=write_mismatch if writer else None,
+            )
+    finally:
+        if out_fh:
+            out_fh.close()
+    print(json.dumps(report.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
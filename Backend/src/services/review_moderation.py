@@ -0,0 +1,311 @@
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from src.core.config import get_settings
+from src.core.database import SessionLocal, dialect_insert
+from src.models.models import (
+    Content,
+    ContentReviewStats,
+    RatingReview,
+    ReviewFingerprint,
+    ReviewLshBucket,
+    ReviewStatus,
+)
+from src.services.review_text import ReviewAnalysis, analyze, similarity
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Keeps IN (...) lists below SQLite's bound parameter limit
+_IN_CHUNK = 900
+
+
+# Plain Core executemany against the tables: the ORM bulk paths add per-row bookkeeping
+_reviews = RatingReview.__table__
+# Only rows still as the batch read them: an edit committed meanwhile (it resets the row to
+# pending with new text) is left pending for the next batch instead of getting a stale verdict
+_set_verdict = (
+    update(_reviews)
+    .where(
+        _reviews.c.id == bindparam("review_id"),
+        _reviews.c.status == ReviewStatus.PENDING.value,
+        _reviews.c.review_text.is_not_distinct_from(bindparam("read_text")),
+    )
+    .values(status=bindparam("verdict"), spam_score=bindparam("score"), duplicate_of_id=bindparam("duplicate_of"))
+)
+
+
+def _chunks(values: Sequence, size: int = _IN_CHUNK) -> Iterable[Sequence]:
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+class ReviewModerator:
+    """Screens newly accepted reviews in the background and keeps rating aggregates current.
+
+    add_review only inserts a pending row. A thread picks pending reviews up in id
+    order, batch_size at a time, and in one transaction per batch: analyses the
+    texts (normalization, MinHash signature, spam score; optionally in a process
+    pool), looks up near-duplicates through LSH buckets of earlier reviews, writes
+    every verdict with one bulk UPDATE and recomputes the touched titles' aggregates
+    with one grouped query and one upsert. Pending reviews stay listed until their
+    verdict; hidden ones disappear from listings and aggregates.
+
+    On PostgreSQL the pending scan uses FOR UPDATE SKIP LOCKED, so the moderators of
+    several worker processes split the backlog instead of repeating each other's work.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.REVIEW_MODERATION_INTERVAL_SECONDS,
+        batch_size: int = settings.REVIEW_MODERATION_BATCH_SIZE,
+        processes: int = settings.REVIEW_MODERATION_PROCESSES,
+        num_perm: int = settings.REVIEW_MINHASH_PERMUTATIONS,
+        bands: int = settings.REVIEW_MINHASH_BANDS,
+        duplicate_similarity: float = settings.REVIEW_DUPLICATE_SIMILARITY,
+        spam_threshold: float = settings.REVIEW_SPAM_THRESHOLD,
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.processes = processes
+        self.num_perm = num_perm
+        self.bands = bands
+        self.duplicate_similarity = duplicate_similarity
+        self.spam_threshold = spam_threshold
+        self._lock = threading.Lock()
+        self._batch_lock = threading.Lock()
+        self._dirty_contents: Set[int] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.batches = 0
+        self.moderated = 0
+        self.hidden = 0
+        self.duplicates = 0
+        self.last_batch_ms: Optional[float] = None
+
+    # PUBLIC_INTERFACE
+    def start(self) -> None:
+        """Start the moderation thread (and the analysis pool when processes > 0); idempotent."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            if self.processes > 0:
+                # spawn, not fork: forking a threaded server process is unsafe
+                self._pool = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context("spawn"))
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="review-moderator", daemon=True)
+            self._thread.start()
+
+    # PUBLIC_INTERFACE
+    def stop(self) -> None:
+        """Stop the moderation thread; pending reviews are picked up after the next start."""
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+            self._thread = None
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.process_pending()
+            except Exception:
+                logger.exception("Review moderation failed")
+
+    # PUBLIC_INTERFACE
+    def refresh_aggregates(self, content_id: int) -> None:
+        """Recompute a title's aggregates in the next batch (a review was deleted)."""
+        with self._lock:
+            self._dirty_contents.add(content_id)
+
+    # PUBLIC_INTERFACE
+    def process_pending(self) -> int:
+        """Moderate batches until no pending reviews are left; return how many were moderated."""
+        total = 0
+        while True:
+            moderated = self.process_batch()
+            total += moderated
+            if moderated < self.batch_size or self._stop.is_set():
+                return total
+
+    # PUBLIC_INTERFACE
+    def process_batch(self) -> int:
+        """Moderate up to batch_size pending reviews in one transaction and return how many."""
+        with self._batch_lock:
+            with self._lock:
+                dirty, self._dirty_contents = self._dirty_contents, set()
+            started = time.perf_counter()
+            try:
+                with SessionLocal() as db:
+                    rows = db.execute(
+                        select(RatingReview.id, RatingReview.content_id, RatingReview.review_text)
+                        .where(RatingReview.status == ReviewStatus.PENDING.value)
+                        .order_by(RatingReview.id)
+                        .limit(self.batch_size)
+                        .with_for_update(skip_locked=True)
+                    ).all()
+                    if rows:
+                        self._moderate(db, rows)
+                    touched = dirty | {row.content_id for row in rows}
+                    if touched:
+                        self._refresh_stats(db, sorted(touched))
+                    db.commit()
+            except Exception:
+                with self._lock:
+                    self._dirty_contents |= dirty
+                raise
+            if rows:
+                self.batches += 1
+                self.moderated += len(rows)
+                self.last_batch_ms = round((time.perf_counter() - started) * 1000, 3)
+            return len(rows)
+
+    def _analyze(self, texts: List[Optional[str]]) -> List[ReviewAnalysis]:
+        work = partial(analyze, num_perm=self.num_perm, bands=self.bands)
+        if self._pool is None or len(texts) < 2 * self.processes:
+            return work(texts)
+        size = -(-len(texts) // self.processes)
+        return [a for part in self._pool.map(work, _chunks(texts, size)) for a in part]
+
+    def _moderate(self, db: Session, rows) -> None:
+        analyses = self._analyze([row.review_text for row in rows])
+        # Edited reviews come back as pending: forget their previous fingerprint first
+        for ids in _chunks([row.id for row in rows]):
+            db.execute(delete(ReviewLshBucket).where(ReviewLshBucket.review_id.in_(ids)))
+            db.execute(delete(ReviewFingerprint).where(ReviewFingerprint.review_id.in_(ids)))
+
+        buckets: Dict[int, List[int]] = {}
+        keys = sorted({key for a in analyses for key in a.band_keys})
+        for chunk in _chunks(keys):
+            stmt = select(ReviewLshBucket.bucket, ReviewLshBucket.review_id).where(ReviewLshBucket.bucket.in_(chunk))
+            for bucket, review_id in db.execute(stmt):
+                buckets.setdefault(bucket, []).append(review_id)
+        signatures: Dict[int, bytes] = {}
+        candidate_ids = sorted({rid for rids in buckets.values() for rid in rids})
+        for chunk in _chunks(candidate_ids):
+            stmt = select(ReviewFingerprint.review_id, ReviewFingerprint.signature)
+            signatures.update(db.execute(stmt.where(ReviewFingerprint.review_id.in_(chunk))).all())
+
+        verdicts, fingerprints, bucket_rows = [], [], []
+        for row, analysis in zip(rows, analyses):
+            duplicate_of = None
+            if analysis.signature is not None:
+                duplicate_of = self._find_duplicate(analysis, buckets, signatures)
+                # Later reviews in this batch are compared against this one too
+                signatures[row.id] = analysis.signature
+                for key in analysis.band_keys:
+                    buckets.setdefault(key, []).append(row.id)
+                fingerprints.append({"review_id": row.id, "signature": analysis.signature})
+                bucket_rows.extend({"bucket": key, "review_id": row.id} for key in set(analysis.band_keys))
+            hidden = duplicate_of is not None or analysis.spam_score >= self.spam_threshold
+            verdicts.append(
+                {
+                    "review_id": row.id,
+                    "read_text": row.review_text,
+                    "verdict": (ReviewStatus.HIDDEN if hidden else ReviewStatus.VISIBLE).value,
+                    "score": analysis.spam_score,
+                    "duplicate_of": duplicate_of,
+                }
+            )
+        if db.execute(_set_verdict, verdicts).rowcount != len(verdicts):
+            # Some rows were edited after the read: drop their verdicts and fingerprints
+            edited = set()
+            for ids in _chunks([row.id for row in rows]):
+                edited.update(
+                    db.execute(
+                        select(RatingReview.id).where(
+                            RatingReview.id.in_(ids), RatingReview.status == ReviewStatus.PENDING.value
+                        )
+                    ).scalars()
+                )
+            verdicts = [v for v in verdicts if v["review_id"] not in edited]
+            fingerprints = [f for f in fingerprints if f["review_id"] not in edited]
+            bucket_rows = [b for b in bucket_rows if b["review_id"] not in edited]
+        self.duplicates += sum(v["duplicate_of"] is not None for v in verdicts)
+        self.hidden += sum(v["verdict"] == ReviewStatus.HIDDEN.value for v in verdicts)
+        if fingerprints:
+            db.execute(insert(ReviewFingerprint.__table__), fingerprints)
+        if bucket_rows:
+            db.execute(insert(ReviewLshBucket.__table__), bucket_rows)
+
+    def _find_duplicate(
+        self, analysis: ReviewAnalysis, buckets: Dict[int, List[int]], signatures: Dict[int, bytes]
+    ) -> Optional[int]:
+        candidates = {rid for key in analysis.band_keys for rid in buckets.get(key, ())}
+        matches = [
+            rid
+            for rid in candidates
+            if rid in signatures and similarity(analysis.signature, signatures[rid]) >= self.duplicate_similarity
+        ]
+        return min(matches) if matches else None
+
+    def _refresh_stats(self, db: Session, content_ids: List[int]) -> None:
+        now = datetime.utcnow()
+        stmt = dialect_insert(db, ContentReviewStats)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["content_id"],
+            set_={
+                "review_count": stmt.excluded.review_count,
+                "rating_sum": stmt.excluded.rating_sum,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        for chunk in _chunks(content_ids):
+            totals = {
+                content_id: (count, total)
+                for content_id, count, total in db.execute(
+                    select(RatingReview.content_id, func.count(RatingReview.id), func.sum(RatingReview.rating))
+                    .where(RatingReview.content_id.in_(chunk), RatingReview.status == ReviewStatus.VISIBLE.value)
+                    .group_by(RatingReview.content_id)
+                )
+            }
+            # Titles deleted since their reviews were written have no row to aggregate into
+            live = db.execute(select(Content.id).where(Content.id.in_(chunk))).scalars()
+            rows = [
+                {
+                    "content_id": cid,
+                    "review_count": totals.get(cid, (0, 0))[0],
+                    "rating_sum": totals.get(cid, (0, 0))[1],
+                    "updated_at": now,
+                }
+                for cid in live
+            ]
+            if rows:
+                db.execute(stmt, rows)
+
+    # PUBLIC_INTERFACE
+    def stats(self) -> dict:
+        """Return batch counters, verdict totals and the latest batch duration."""
+        return {
+            "running": self._thread is not None,
+            "processes": self.processes,
+            "batches": self.batches,
+            "moderated": self.moderated,
+            "hidden": self.hidden,
+            "duplicates": self.duplicates,
+            "last_batch_ms": self.last_batch_ms,
+        }
+
+
+# PUBLIC_INTERFACE
+def forget_review(db: Session, review_id: int) -> None:
+    """Delete a review's fingerprint and LSH buckets (SQLite does not cascade them)."""
+    db.execute(delete(ReviewLshBucket).where(ReviewLshBucket.review_id == review_id))
+    db.execute(delete(ReviewFingerprint).where(ReviewFingerprint.review_id == review_id))
+
+
+review_moderator = ReviewModerator()
@@ -0,0 +1,128 @@
+"""Pure text analysis for review moderation: normalization, MinHash signatures and spam scoring.
+
+Kept free of database and settings imports so batches can be analysed in a
+process pool without each worker loading the application.
+"""
+import hashlib
+import re
+import unicodedata
+from array import array
+from typing import List, NamedTuple, Optional, Sequence
+
+_URL = re.compile(r"(https?://|www\.)\S+|\b[a-z0-9-]+\.(com|net|org|io|ru|xyz|top|biz|info|ly)\b", re.I)
+_EMAIL = re.compile(r"\b[\w.+-]+@[\w-]+\.[\w.]+\b")
+_PHONE = re.compile(r"(?:\+?\d[\s-]?){8,}")
+_REPEATED_CHARS = re.compile(r"(.)\1+")
+_NON_WORD = re.compile(r"[^\w]+")
+
+SPAM_TERMS = frozenset(
+    {
+        "bitcoin", "casino", "cheap", "click", "crypto", "discount", "earn", "followers", "free", "giveaway",
+        "income", "investment", "loan", "promo", "telegram", "viagra", "visit", "whatsapp", "winner",
+    }
+)
+# Matched against normalized words, whose repeated letters are squeezed ("free" -> "fre")
+_NORMALIZED_SPAM_TERMS = frozenset(_REPEATED_CHARS.sub(r"\1", term) for term in SPAM_TERMS)
+
+# Word shingle size and the fewest shingles a text needs before it is fingerprinted;
+# short texts ("Loved it!") collide legitimately and are never treated as duplicates.
+SHINGLE_SIZE = 2
+MIN_SHINGLES = 6
+
+
+class ReviewAnalysis(NamedTuple):
+    spam_score: float
+    signature: Optional[bytes]  # packed uint32 MinHash values, None when the text is too short
+    band_keys: List[int]
+
+
+# PUBLIC_INTERFACE
+def normalize_text(text: str) -> str:
+    """Fold a review to a canonical form: NFKC, casefolded, links collapsed, punctuation dropped.
+
+    Runs of a repeated character shrink to one ("sooooo", "soo" -> "so") so
+    stretched copies of the same text shingle identically.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _URL.sub(" url ", text)
+    text = _REPEATED_CHARS.sub(r"\1", text)
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+# PUBLIC_INTERFACE
+def minhash(normalized: str, num_perm: int = 64) -> Optional[array]:
+    """Return the MinHash signature of a normalized text's word shingles, or None if it is too short.
+
+    Instead of num_perm hash functions evaluated in Python, each shingle gets one
+    SHAKE-128 digest of num_perm 32-bit words (slot i acts as hash function i) and
+    the signature is the column-wise minimum, computed by C-level zip/min.
+    """
+    words = normalized.split()
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    columns = [array("I", hashlib.shake_128(s.encode()).digest(4 * num_perm)) for s in shingles]
+    return array("I", map(min, zip(*columns)))
+
+
+# PUBLIC_INTERFACE
+def band_keys(signature: Sequence[int], bands: int) -> List[int]:
+    """Hash each band of a signature to a signed 64-bit LSH bucket key.
+
+    Two texts share a bucket in some band with probability 1 - (1 - s^r)^bands for
+    Jaccard similarity s and r = len(signature) / bands rows per band.
+    """
+    rows = len(signature) // bands
+    keys = []
+    for band in range(bands):
+        chunk = array("I", signature[band * rows:(band + 1) * rows])
+        digest = hashlib.blake2b(chunk.tobytes(), digest_size=8, person=band.to_bytes(2, "little")).digest()
+        keys.append(int.from_bytes(digest, "little", signed=True))
+    return keys
+
+
+# PUBLIC_INTERFACE
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimate Jaccard similarity from two packed signatures (fraction of equal slots)."""
+    sa, sb = array("I", a), array("I", b)
+    if len(sa) != len(sb) or not sa:
+        return 0.0
+    return sum(x == y for x, y in zip(sa, sb)) / len(sa)
+
+
+# PUBLIC_INTERFACE
+def spam_score(text: str, normalized: str) -> float:
+    """Score 0..1 from links, contact details, promotional terms, shouting and repetition."""
+    score = 0.45 * min(len(_URL.findall(text)), 2)
+    if _EMAIL.search(text) or _PHONE.search(text):
+        score += 0.4
+    words = normalized.split()
+    score += 0.15 * min(sum(w in _NORMALIZED_SPAM_TERMS for w in words), 4)
+    letters = sum(map(str.isalpha, text))
+    if letters >= 12 and sum(map(str.isupper, text)) / letters > 0.6:
+        score += 0.2
+    if len(words) >= 8 and len(set(words)) / len(words) < 0.35:
+        score += 0.3
+    if re.search(r"(.)\1{5,}", text):
+        score += 0.1
+    return round(min(score, 1.0), 3)
+
+
+# PUBLIC_INTERFACE
+def analyze(texts: Sequence[Optional[str]], num_perm: int = 64, bands: int = 16) -> List[ReviewAnalysis]:
+    """Analyse a batch of review texts; module level so it can run in a process pool."""
+    out = []
+    for text in texts:
+        if not text:
+            out.append(ReviewAnalysis(0.0, None, []))
+            continue
+        normalized = normalize_text(text)
+        signature = minhash(normalized, num_perm)
+        out.append(
+            ReviewAnalysis(
+                spam_score(text, normalized),
+                signature.tobytes() if signature is not None else None,
+                band_keys(signature, bands) if signature is not None else [],
+            )
+        )
+    return out
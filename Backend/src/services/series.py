@@ -0,0 +1,93 @@
+from typing import List, Optional
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session, aliased
+
+from src.core.cache import LRUCache
+from src.core.config import get_settings
+from src.core.events import event_bus
+from src.models.models import EPISODE_ORDINAL_STRIDE, Episode, Season
+from src.schemas.schemas import EpisodeOut, SeasonOut
+
+settings = get_settings()
+
+# (series_id, season_number) -> list of serialized episodes
+season_cache = LRUCache(settings.SEASON_CACHE_MAX_ENTRIES, settings.SEASON_CACHE_TTL_SECONDS)
+
+
+# PUBLIC_INTERFACE
+def episode_ordinal(season_number: int, episode_number: int) -> int:
+    """Return the series-wide ordering key for an episode."""
+    return season_number * EPISODE_ORDINAL_STRIDE + episode_number
+
+
+# PUBLIC_INTERFACE
+def season_episodes(db: Session, series_id: int, season_number: int) -> List[dict]:
+    """Return a season's episodes in order, served from the season cache when warm.
+
+    The season is selected as an ordinal range so the lookup is a single range scan
+    on the (series_id, ordinal) index.
+    """
+
+    def load() -> List[dict]:
+        rows = db.execute(
+            select(Episode)
+            .where(
+                Episode.series_id == series_id,
+                Episode.ordinal >= episode_ordinal(season_number, 0),
+                Episode.ordinal < episode_ordinal(season_number + 1, 0),
+            )
+            .order_by(Episode.ordinal)
+        ).scalars()
+        return [EpisodeOut.model_validate(e).model_dump() for e in rows]
+
+    return season_cache.get_or_load((series_id, season_number), load)
+
+
+# Built once: constructing the aliased join costs more than running the query
+_current = aliased(Episode, name="current_episode")
+_next_episode = (
+    select(Episode)
+    .join(_current, (_current.series_id == Episode.series_id) & (Episode.ordinal > _current.ordinal))
+    .where(_current.id == bindparam("episode_id"))
+    .order_by(Episode.ordinal)
+    .limit(1)
+)
+
+
+# PUBLIC_INTERFACE
+def next_episode(db: Session, episode_id: int) -> Optional[Episode]:
+    """Return the episode following episode_id in the series (across seasons), in one query."""
+    return db.execute(_next_episode, {"episode_id": episode_id}).scalar_one_or_none()
+
+
+# PUBLIC_INTERFACE
+def season_overview(db: Session, series_id: int) -> List[SeasonOut]:
+    """Return all seasons of a series with their episode counts in one grouped query."""
+    rows = db.execute(
+        select(Season, func.count(Episode.id))
+        .outerjoin(Episode, Episode.season_id == Season.id)
+        .where(Season.series_id == series_id)
+        .group_by(Season.id)
+        .order_by(Season.season_number)
+    ).all()
+    out = []
+    for season, count in rows:
+        item = SeasonOut.model_validate(season)
+        item.episode_count = count
+        out.append(item)
+    return out
+
+
+# PUBLIC_INTERFACE
+def invalidate_series(series_id: int, season_number: Optional[int] = None) -> None:
+    """Drop cached season payloads for one season, or for every season when None."""
+    if season_number is not None:
+        season_cache.pop((series_id, season_number))
+    else:
+        season_cache.clear()
+
+
+# "season" events carry (series_id, season_number); "series" events a deleted series id
+event_bus.subscribe("season", lambda ev: invalidate_series(*ev.key))
+event_bus.subscribe("series", lambda ev: invalidate_series(ev.key))
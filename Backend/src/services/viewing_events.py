@@ -0,0 +1,298 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import Column, Integer, MetaData, SmallInteger, Table, case, func, inspect, select, union_all
+from sqlalchemy.orm import Session
+
+from src.core.cache import LRUCache
+from src.core.config import get_settings
+from src.core.database import get_engine
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+PLAY = 1  # get_stream_url issued a playback token
+HEARTBEAT = 2  # player progress report; watch_seconds holds the time watched since the previous one
+
+PARTITION_PREFIX = "viewing_events_"
+_DAY = 86_400
+
+# (ts, kind, content_id, user_id, profile_id, watch_seconds)
+EventRow = Tuple[int, int, int, Optional[int], Optional[int], int]
+_FIELDS = ("ts", "kind", "content_id", "user_id", "profile_id", "watch_seconds")
+
+
+# PUBLIC_INTERFACE
+def partition_name(day: int) -> str:
+    """Table holding the events of a UTC day, given as days since the epoch."""
+    return PARTITION_PREFIX + datetime.fromtimestamp(day * _DAY, timezone.utc).strftime("%Y%m%d")
+
+
+def _day_of(name: str) -> int:
+    stamp = datetime.strptime(name[len(PARTITION_PREFIX):], "%Y%m%d").replace(tzinfo=timezone.utc)
+    return int(stamp.timestamp()) // _DAY
+
+
+def _epoch(moment: datetime) -> int:
+    # Naive datetimes are UTC, like every other timestamp in the schema
+    return int((moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)).timestamp())
+
+
+class ViewingEventStore:
+    """Append-only store of play and watch-time events, one table per UTC day.
+
+    Events are appended to an in-memory buffer and written by a background thread
+    with one executemany INSERT per day partition, every flush_interval seconds or
+    as soon as flush_rows events are waiting. Partition tables have no indexes, so
+    appends stay cheap, and are created on first write. Expiring a day is a DROP
+    TABLE instead of a bulk DELETE. Window queries read only the partitions the
+    window overlaps, and filter on ts only in the two edge days.
+
+    Analytics may lose the buffer on a crash. While the database is unreachable
+    the buffer keeps at most max_buffer events and drops the oldest.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = settings.VIEWING_EVENTS_ENABLED,
+        flush_interval: float = settings.VIEWING_EVENTS_FLUSH_INTERVAL_SECONDS,
+        flush_rows: int = settings.VIEWING_EVENTS_FLUSH_ROWS,
+        max_buffer: int = settings.VIEWING_EVENTS_MAX_BUFFER,
+        retention_days: int = settings.VIEWING_EVENTS_RETENTION_DAYS,
+        heartbeat_gap: int = settings.VIEWING_EVENTS_HEARTBEAT_GAP_SECONDS,
+    ):
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+        self.max_buffer = max_buffer
+        self.retention_days = retention_days
+        self.heartbeat_gap = heartbeat_gap
+        self._metadata = MetaData()
+        self._buffer: List[EventRow] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._partitions: Set[str] = set()
+        self._partitions_loaded_at = 0.0
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+
+    def _table(self, name: str) -> Table:
+        with self._lock:
+            table = self._metadata.tables.get(name)
+            if table is not None:
+                return table
+            return Table(
+                name,
+                self._metadata,
+                Column("ts", Integer, nullable=False),  # epoch seconds
+                Column("kind", SmallInteger, nullable=False),
+                Column("content_id", Integer, nullable=False),
+                Column("user_id", Integer, nullable=True),
+                Column("profile_id", Integer, nullable=True),
+                Column("watch_seconds", Integer, nullable=False, default=0),
+            )
+
+    # PUBLIC_INTERFACE
+    def start(self) -> None:
+        """Start the background flush thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="viewing-events", daemon=True)
+            self._thread.start()
+
+    # PUBLIC_INTERFACE
+    def stop(self) -> None:
+        """Stop the flush thread and write out the remaining buffer."""
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            self._wake.set()
+            thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        last_expiry = 0.0
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                if time.monotonic() - last_expiry > 3600:
+                    self.drop_expired()
+                    last_expiry = time.monotonic()
+            except Exception:
+                logger.exception("Viewing events flush failed")
+
+    # PUBLIC_INTERFACE
+    def append(self, row: EventRow) -> None:
+        """Buffer one raw event row (ts, kind, content_id, user_id, profile_id, watch_seconds)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._buffer.append(row)
+            self.recorded += 1
+            if len(self._buffer) > self.max_buffer:
+                overflow = len(self._buffer) - self.max_buffer
+                del self._buffer[:overflow]
+                self.dropped += overflow
+            full = len(self._buffer) >= self.flush_rows
+        if full:
+            self._wake.set()
+
+    # PUBLIC_INTERFACE
+    def record_play(self, user_id: int, content_id: int) -> None:
+        """Record that a playback URL was issued for a title."""
+        self.append((int(time.time()), PLAY, content_id, user_id, None, 0))
+
+    # PUBLIC_INTERFACE
+    def record_heartbeat(
+        self,
+        user_id: int,
+        profile_id: int,
+        content_id: int,
+        position: int,
+        previous: Optional[Tuple[int, datetime]],
+    ) -> None:
+        """Record watch time since the profile's previous heartbeat for the title.
+
+        previous is (position, updated_at) of that heartbeat, as returned by
+        ProgressTracker.last_position, so heartbeats spread over several workers
+        are still counted. Only forward progress of at most the wall-clock time
+        since it (capped at heartbeat_gap) counts, so seeks and replays are not
+        counted as watch time.
+        """
+        if not self.enabled:
+            return
+        watched = 0
+        if previous is not None:
+            elapsed = (datetime.utcnow() - previous[1]).total_seconds()
+            watched = min(position - previous[0], int(elapsed) + 1, self.heartbeat_gap)
+        self.append((int(time.time()), HEARTBEAT, content_id, user_id, profile_id, max(watched, 0)))
+
+    # PUBLIC_INTERFACE
+    def flush(self) -> int:
+        """Write all buffered events to their day partitions; return how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            by_day: Dict[int, List[dict]] = {}
+            for row in rows:
+                by_day.setdefault(row[0] // _DAY, []).append(dict(zip(_FIELDS, row)))
+            created = set()
+            try:
+                with get_engine().begin() as conn:
+                    for day, day_rows in sorted(by_day.items()):
+                        table = self._table(partition_name(day))
+                        if table.name not in self._partitions:
+                            table.create(conn, checkfirst=True)
+                            created.add(table.name)
+                        conn.execute(table.insert(), day_rows)
+            except Exception:
+                with self._lock:
+                    self._buffer[:0] = rows
+                raise
+            # Only once committed: a rolled-back CREATE TABLE must be retried on the next flush
+            self._partitions |= created
+            self.written += len(rows)
+            return len(rows)
+
+    def _existing_partitions(self, db: Session, days: range) -> List[Table]:
+        names = [partition_name(day) for day in days]
+        if any(n not in self._partitions for n in names) and time.monotonic() - self._partitions_loaded_at > 5:
+            # Other workers create partitions too; re-list them at most every few seconds
+            tables = inspect(db.get_bind()).get_table_names()
+            self._partitions.update(t for t in tables if t.startswith(PARTITION_PREFIX))
+            self._partitions_loaded_at = time.monotonic()
+        return [self._table(n) for n in names if n in self._partitions]
+
+    # PUBLIC_INTERFACE
+    def top_titles(
+        self, db: Session, since: datetime, until: Optional[datetime] = None, limit: int = 10, by: str = "plays"
+    ) -> List[dict]:
+        """Return the most played (or most watched, by="watch_seconds") titles in [since, until).
+
+        Each overlapping day partition is aggregated on its own (GROUP BY content_id)
+        and the per-day totals are summed, so no row outside the window is read
+        beyond the edge days.
+        """
+        start = _epoch(since)
+        end = _epoch(until) if until is not None else int(time.time())
+        tables = self._existing_partitions(db, range(start // _DAY, (end - 1) // _DAY + 1))
+        if not tables or end <= start:
+            return []
+        parts = []
+        for table in tables:
+            day = _day_of(table.name)
+            stmt = select(
+                table.c.content_id,
+                func.sum(case((table.c.kind == PLAY, 1), else_=0)).label("plays"),
+                func.sum(table.c.watch_seconds).label("watch_seconds"),
+            ).group_by(table.c.content_id)
+            if day * _DAY < start:
+                stmt = stmt.where(table.c.ts >= start)
+            if (day + 1) * _DAY > end:
+                stmt = stmt.where(table.c.ts < end)
+            parts.append(stmt)
+        per_day = (parts[0] if len(parts) == 1 else union_all(*parts)).subquery()
+        plays = func.sum(per_day.c.plays).label("plays")
+        watched = func.sum(per_day.c.watch_seconds).label("watch_seconds")
+        order = (watched, plays) if by == "watch_seconds" else (plays, watched)
+        stmt = (
+            select(per_day.c.content_id, plays, watched)
+            .group_by(per_day.c.content_id)
+            .order_by(*(o.desc() for o in order), per_day.c.content_id)
+            .limit(limit)
+        )
+        return [
+            {"content_id": cid, "plays": int(p or 0), "watch_seconds": int(w or 0)} for cid, p, w in db.execute(stmt)
+        ]
+
+    # PUBLIC_INTERFACE
+    def drop_expired(self, now: Optional[float] = None) -> List[str]:
+        """Drop partitions older than retention_days and return their names."""
+        cutoff = int((now or time.time()) // _DAY) - self.retention_days
+        engine = get_engine()
+        expired = [
+            t for t in inspect(engine).get_table_names() if t.startswith(PARTITION_PREFIX) and _day_of(t) < cutoff
+        ]
+        with engine.begin() as conn:
+            for name in expired:
+                self._table(name).drop(conn, checkfirst=True)
+                self._partitions.discard(name)
+        return expired
+
+    # PUBLIC_INTERFACE
+    def stats(self) -> dict:
+        """Return ingestion counters and the number of buffered events."""
+        with self._lock:
+            buffered = len(self._buffer)
+        return {"recorded": self.recorded, "written": self.written, "dropped": self.dropped, "buffered": buffered}
+
+
+viewing_events = ViewingEventStore()
+
+# (hours, limit) -> ranking; a trending rail does not need to be fresher than this
+_trending_cache = LRUCache(max_entries=64, ttl_seconds=settings.TRENDING_CACHE_TTL_SECONDS)
+
+
+# PUBLIC_INTERFACE
+def trending(db: Session, hours: float, limit: int) -> List[dict]:
+    """Return the most played titles of the last `hours` hours, cached briefly per (hours, limit)."""
+
+    def load() -> List[dict]:
+        return viewing_events.top_titles(db, datetime.now(timezone.utc) - timedelta(hours=hours), limit=limit)
+
+    return _trending_cache.get_or_load((hours, limit), load)
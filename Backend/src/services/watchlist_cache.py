@@ -0,0 +1,76 @@
+import threading
+from typing import FrozenSet, Iterable, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.core.cache import MISSING, LRUCache
+from src.core.config import get_settings
+from src.core.events import event_bus
+from src.models.models import WatchlistItem
+
+settings = get_settings()
+
+
+class WatchlistMembershipCache:
+    """LRU cache of each profile's watchlisted content ids.
+
+    A miss loads the whole id set with one query served by the
+    (profile_id, content_id) unique index; hits answer membership questions for any
+    number of tiles without touching the database. Every committed write to a
+    profile's watchlist, in this worker or another, arrives as a "watchlist" change
+    event that drops the entry; ttl_seconds bounds staleness if one is lost.
+    Every invalidation bumps the version; a load that started before the bump may
+    have read the old membership, so it answers its own request but is not stored.
+    """
+
+    def __init__(self, max_profiles: int, ttl_seconds: float):
+        self._cache = LRUCache(max_profiles, ttl_seconds)
+        self._lock = threading.Lock()
+        self.version = 0
+
+    # PUBLIC_INTERFACE
+    def get(self, db: Session, profile_id: int) -> FrozenSet[int]:
+        """Return the profile's watchlisted content ids, loading them on a miss."""
+        ids = self._cache.get(profile_id)
+        if ids is MISSING:
+            version = self.version
+            ids = frozenset(
+                db.execute(select(WatchlistItem.content_id).where(WatchlistItem.profile_id == profile_id)).scalars()
+            )
+            with self._lock:
+                if version == self.version:
+                    self._cache.set(profile_id, ids)
+        return ids
+
+    # PUBLIC_INTERFACE
+    def contains(self, db: Session, profile_id: int, content_ids: Iterable[int]) -> List[int]:
+        """Return the content ids (in request order) that are in the profile's watchlist."""
+        ids = self.get(db, profile_id)
+        return [cid for cid in content_ids if cid in ids]
+
+    # PUBLIC_INTERFACE
+    def invalidate(self, profile_id: int) -> None:
+        """Drop the cached id set for a profile."""
+        with self._lock:
+            self.version += 1
+            self._cache.pop(profile_id)
+
+    # PUBLIC_INTERFACE
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self.version += 1
+            self._cache.clear()
+
+    # PUBLIC_INTERFACE
+    def stats(self) -> dict:
+        """Return hit/miss counters of the underlying cache plus the version."""
+        return {**self._cache.stats(), "version": self.version}
+
+
+watchlist_cache = WatchlistMembershipCache(
+    max_profiles=settings.WATCHLIST_CACHE_MAX_PROFILES,
+    ttl_seconds=settings.WATCHLIST_CACHE_TTL_SECONDS,
+)
+event_bus.subscribe("watchlist", lambda ev: watchlist_cache.invalidate(ev.key))
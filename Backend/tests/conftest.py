@@ -0,0 +1,46 @@
+import os
+import tempfile
+import uuid
+
+# Settings are read once at import time: point them at a throwaway database first
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tests.db')}")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("REVIEW_MODERATION_ENABLED", "false")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from src.api.main import create_app  # noqa: E402
+from src.core import database  # noqa: E402
+from src.models.models import User  # noqa: E402
+
+PASSWORD = "secret1"
+
+
+@pytest.fixture
+def client():
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+def _register(client: TestClient, admin: bool = False) -> dict:
+    email = f"{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post("/auth/register", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    if admin:
+        with database.SessionLocal() as db:
+            db.query(User).filter(User.email == email).update({"is_admin": True})
+            db.commit()
+    token = client.post("/auth/login", data={"username": email, "password": PASSWORD}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def make_user(client):
+    """Factory: register a fresh user (admin=True for an admin) and return its Authorization header."""
+    return lambda admin=False: _register(client, admin)
+
+
+@pytest.fixture
+def admin_headers(make_user):
+    return make_user(admin=True)
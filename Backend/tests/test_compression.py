@@ -0,0 +1,39 @@
+import gzip
+import os
+
+from starlette.requests import Request
+
+from src.core.compression import PrecompressedBody
+
+
+def _request(accept_encoding: str) -> Request:
+    return Request({"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]})
+
+
+def test_variants_are_compressed_on_first_request_per_encoding():
+    raw = b'{"title": "x"}' * 500
+    body = PrecompressedBody(raw)
+    assert body.variants == {}
+
+    assert body.response(_request("")).body == raw
+    assert body.variants == {}
+
+    response = body.response(_request("gzip"))
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(response.body) == raw
+    assert list(body.variants) == ["gzip"]
+    assert body.response(_request("gzip")).body is body.variants["gzip"]
+
+
+def test_incompressible_body_falls_back_to_raw():
+    raw = os.urandom(4096)
+    body = PrecompressedBody(raw)
+    response = body.response(_request("gzip, br"))
+    assert response.body == raw and "content-encoding" not in response.headers
+    assert all(variant is None for variant in body.variants.values())
+
+
+def test_small_body_is_never_compressed():
+    body = PrecompressedBody(b"[]")
+    assert body.response(_request("gzip")).body == b"[]"
+    assert body.variants == {}
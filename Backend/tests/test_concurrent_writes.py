@@ -0,0 +1,66 @@
+"""Concurrent duplicate writers against the constraint-driven write paths.
+
+Each scenario fires WRITERS identical requests at once. Exactly one may create the
+row; the others must get the friendly conflict response (or, for idempotent
+endpoints, the same row back) and never a 5xx from a lost SELECT-then-INSERT race.
+Set DATABASE_URL to run them against PostgreSQL.
+"""
+import threading
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+WRITERS = 16
+CREATED = (200, 201, 202)
+
+
+def _burst(client, method, url, **kwargs) -> list:
+    barrier = threading.Barrier(WRITERS)
+
+    def one(_):
+        barrier.wait()
+        return client.request(method, url, **kwargs)
+
+    with ThreadPoolExecutor(WRITERS) as pool:
+        responses = list(pool.map(one, range(WRITERS)))
+    statuses = Counter(r.status_code for r in responses)
+    assert not any(code >= 500 for code in statuses), [r.text for r in responses if r.status_code >= 500][:1]
+    return responses
+
+
+def _created(responses) -> list:
+    return [r for r in responses if r.status_code in CREATED]
+
+
+def test_one_writer_creates_the_row(client, admin_headers, make_user):
+    email = f"{uuid.uuid4().hex}@example.com"
+    registered = _burst(client, "POST", "/auth/register", json={"email": email, "password": "secret1"})
+    assert len(_created(registered)) == 1
+    assert {r.status_code for r in registered} - set(CREATED) <= {400}
+
+    headers = make_user()
+    profiles = _burst(client, "POST", "/profiles", json={"name": "main"}, headers=headers)
+    assert len(_created(profiles)) == 1
+    profile_id = _created(profiles)[0].json()["id"]
+
+    plan = {"name": f"Plan {uuid.uuid4().hex[:8]}", "price_cents": 1}
+    assert len(_created(_burst(client, "POST", "/subscriptions/plans", json=plan, headers=admin_headers))) == 1
+
+    content_id = client.post("/content", json={"title": "Stress"}, headers=admin_headers).json()["id"]
+    review_url = f"/reviews/{profile_id}/content/{content_id}"
+    assert len(_created(_burst(client, "POST", review_url, json={"rating": 4}, headers=headers))) == 1
+
+
+def test_idempotent_writers_get_the_same_row(client, admin_headers, make_user):
+    headers = make_user()
+    profile_id = client.post("/profiles", json={"name": "main"}, headers=headers).json()["id"]
+    content_id = client.post("/content", json={"title": "Stress"}, headers=admin_headers).json()["id"]
+
+    items = _burst(client, "POST", f"/watchlist/{profile_id}/add/{content_id}", headers=headers)
+    assert len(_created(items)) == WRITERS
+    assert len({r.json()["id"] for r in items}) == 1
+
+    payment = {"amount_cents": 499, "provider": "stripe", "token": "tok_stress", "idempotency_key": uuid.uuid4().hex}
+    payments = _burst(client, "POST", "/subscriptions/pay", json=payment, headers=headers)
+    assert len(_created(payments)) == WRITERS
+    assert len({r.json()["id"] for r in payments}) == 1
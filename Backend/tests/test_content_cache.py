@@ -0,0 +1,55 @@
+import threading
+import time
+
+from src.core import database
+from src.models.models import Content
+from src.services.content_cache import HotContentCache
+
+
+def _cache(**overrides) -> HotContentCache:
+    options = {"max_entries": 100, "ttl_seconds": 60.0, "negative_ttl_seconds": 0.2, "load_wait_seconds": 5.0}
+    return HotContentCache(**{**options, **overrides})
+
+
+def test_unknown_ids_expire_after_the_negative_ttl(client):
+    cache = _cache()
+    with database.SessionLocal() as db:
+        content = Content(title="Cached")
+        db.add(content)
+        db.commit()
+        missing = content.id + 10_000
+
+        assert cache.get(db, missing) is None and cache.get(db, missing) is None
+        assert cache.get(db, content.id).id == content.id
+        assert cache.loads == 2
+        time.sleep(0.3)
+        assert cache.get(db, missing) is None
+        assert cache.get(db, content.id).id == content.id
+        assert cache.loads == 3
+
+
+def test_concurrent_misses_are_counted_once_each(client, monkeypatch):
+    cache = _cache()
+    release = threading.Event()
+    load = HotContentCache._load
+
+    def slow_load(db, content_id, version):
+        release.wait(5)
+        return load(db, content_id, version)
+
+    monkeypatch.setattr(cache, "_load", slow_load)
+
+    def reader():
+        with database.SessionLocal() as db:
+            cache.get(db, 1)
+
+    threads = [threading.Thread(target=reader) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.coalesced < 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert cache.loads == 1 and cache.coalesced == 7
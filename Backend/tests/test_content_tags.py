@@ -0,0 +1,42 @@
+import uuid
+
+from sqlalchemy import event
+
+from src.core import database
+from src.models.models import Content
+
+
+def _statements(fn):
+    seen = []
+
+    def capture(conn, cursor, statement, *args):
+        seen.append(statement)
+
+    engine = database.get_engine()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return seen
+
+
+def test_tags_are_deduplicated_and_ordered_by_name(client, admin_headers):
+    body = {
+        "title": f"Tags {uuid.uuid4().hex[:8]}",
+        "genres": ["thriller", "Drama", "Crime", "drama"],
+        "audio_languages": ["fr", "en"],
+        "subtitle_languages": ["de", "DE", "ar"],
+    }
+    created = client.post("/content", json=body, headers=admin_headers).json()
+    listed = client.get(f"/content/{created['id']}").json()
+    assert created["genres"] == listed["genres"] == ["Crime", "Drama", "thriller"]
+    assert created["audio_languages"] == listed["audio_languages"] == ["en", "fr"]
+    assert created["subtitle_languages"] == listed["subtitle_languages"] == ["ar", "de"]
+
+
+def test_loading_content_does_not_load_tags(client, admin_headers):
+    created = client.post("/content", json={"title": "Lazy", "genres": ["Drama"]}, headers=admin_headers).json()
+    with database.SessionLocal() as db:
+        assert len(_statements(lambda: db.get(Content, created["id"]))) == 1
+        assert db.get(Content, created["id"]).genres == ["Drama"]
@@ -0,0 +1,158 @@
+import json
+import multiprocessing
+import socket
+import time
+
+import psycopg2
+import pytest
+
+from benchmarks.event_bus import run_worker
+from src.core import database
+from src.core.events import ChangeEventBus, PostgresNotifyTransport, UnixSocketTransport, emit, event_bus
+
+
+def test_events_reach_every_worker_process(client, tmp_path, monkeypatch):
+    events, workers = 50, 2
+    monkeypatch.setenv("EVENT_BUS_TRANSPORT", "unix")
+    monkeypatch.setenv("EVENT_BUS_SOCKET_DIR", str(tmp_path))
+    ctx = multiprocessing.get_context("spawn")
+    ready, results = ctx.Queue(), ctx.Queue()
+    processes = [ctx.Process(target=run_worker, args=(events, ready, results, 20.0)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        ready.get(timeout=60)
+    event_bus.stop()
+    event_bus.start(UnixSocketTransport(str(tmp_path)))
+    try:
+        with database.SessionLocal() as db:
+            for i in range(events):
+                emit(db, "content", 10**6 + i)
+                db.commit()
+                time.sleep(0.005)  # datagrams to a full receive queue are dropped (best-effort transport)
+        delivered = [results.get(timeout=30) for _ in processes]
+    finally:
+        event_bus.stop()
+        for process in processes:
+            process.join(timeout=10)
+    assert [len(latencies) for latencies in delivered] == [events] * workers
+
+
+class _Recorder:
+    max_payload = 300
+
+    def __init__(self):
+        self.payloads = []
+
+    def open(self, deliver):
+        pass
+
+    def send(self, payload):
+        self.payloads.append(payload)
+
+    def close(self):
+        pass
+
+
+def test_batches_are_split_under_the_payload_limit():
+    recorder = _Recorder()
+    sender, receiver = ChangeEventBus(), ChangeEventBus()
+    sender.start(recorder)
+    received = []
+    receiver.subscribe("content", lambda ev: received.append(ev.key))
+    sender.publish([("content", i, "update") for i in range(40)] + [("content", "x" * 400, "update")])
+    assert len(recorder.payloads) > 1
+    assert all(len(p) <= _Recorder.max_payload for p in recorder.payloads)
+    for payload in recorder.payloads:
+        receiver._receive(payload)
+    assert received == list(range(40))  # the oversized event is dropped, not sent
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        if self.conn.broken:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.conn.executed.append((sql, params))
+
+
+class _FakeConnection:
+    """Stands in for a psycopg2 connection; readable through a socketpair for select()."""
+
+    def __init__(self, broken=False, dropped=False, notifies=()):
+        self.broken = broken  # statements fail
+        self.dropped = dropped  # the server goes away while listening
+        self.executed = []
+        self.notifies = []
+        self._pending = list(notifies)
+        self._reader, self._writer = socket.socketpair()
+        if dropped or self._pending:
+            self._writer.send(b"x")
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def poll(self):
+        self._reader.recv(16)
+        if self.dropped:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.notifies.extend(type("Notify", (), {"payload": p})() for p in self._pending)
+        self._pending = []
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
+
+
+def _transport(connections):
+    transport = PostgresNotifyTransport("postgresql://unused", "changes", backoff_seconds=0.01)
+    transport._connect = lambda: connections.pop(0)
+    return transport
+
+
+def test_listener_reconnects_after_the_connection_drops():
+    payload = json.dumps([{"e": "content", "k": 1, "op": "update", "v": 1, "o": "other", "t": 0.0}])
+    listen_after = _FakeConnection(notifies=[payload])
+    connections = [_FakeConnection(dropped=True), _FakeConnection(), listen_after]
+    transport = _transport(connections)
+    delivered = []
+    transport.open(delivered.append)
+    try:
+        for _ in range(200):
+            if delivered:
+                break
+            transport._stopped.wait(0.01)
+    finally:
+        transport.close()
+    assert delivered == [payload.encode()]
+    assert transport.reconnects == 1
+    assert listen_after.executed == [('LISTEN "changes"', None)]
+
+
+def test_notify_reconnects_and_backs_off():
+    notify_after = _FakeConnection()
+    transport = _transport([notify_after])
+    transport._notify_conn = _FakeConnection(broken=True)
+    transport.send(b"[]")
+    assert notify_after.executed == [("SELECT pg_notify(%s, %s)", ("changes", "[]"))]
+
+    def refuse():
+        raise psycopg2.OperationalError("could not connect to server")
+
+    transport._notify_conn.broken = True
+    transport._connect = refuse
+    with pytest.raises(psycopg2.OperationalError):
+        transport.send(b"[]")
+    with pytest.raises(ConnectionError):  # within the backoff window: no connection attempt
+        transport.send(b"[]")
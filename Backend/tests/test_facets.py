@@ -0,0 +1,63 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from src.core import database
+from src.services.facets import FacetIndex
+
+
+def _content(content_id, genre):
+    return SimpleNamespace(
+        id=content_id, release_year=2020, category=None, maturity_rating=None, genres=[genre], languages=[]
+    )
+
+
+class _SlowIndex(FacetIndex):
+    def __init__(self, during_read=None):
+        super().__init__(max_age_seconds=60)
+        self.during_read = during_read
+
+    def _read(self, db):
+        time.sleep(0.05)
+        if self.during_read is not None:
+            self.during_read(self)
+        return super()._read(db)
+
+
+def test_concurrent_callers_share_one_build(client):
+    index = _SlowIndex()
+    threads = []
+    for _ in range(8):
+        def run():
+            with database.SessionLocal() as db:
+                index.ensure_built(db)
+        threads.append(threading.Thread(target=run))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert index.builds == 1
+
+
+def test_writes_during_a_build_are_replayed(client):
+    missing_id = 10**7  # not in the table the build reads
+
+    def write(index):
+        index.upsert(_content(missing_id, "Replayed"))
+        index.upsert(_content(missing_id + 1, "Dropped"))
+        index.remove(missing_id + 1)
+
+    index = _SlowIndex(during_read=write)
+    with database.SessionLocal() as db:
+        index.ensure_built(db)
+        total, facets = index.counts(db, {"genre": "Replayed"})
+    assert total == 1 and "Dropped" not in facets["genre"]
+
+
+def test_stale_mark_during_a_build_keeps_the_index_stale(client):
+    index = _SlowIndex(during_read=lambda idx: idx.mark_stale())
+    with database.SessionLocal() as db:
+        index.ensure_built(db)
+        index.during_read = None
+        index.ensure_built(db)
+    assert index.builds == 2
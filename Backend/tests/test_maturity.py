@@ -0,0 +1,134 @@
+import json
+import uuid
+
+from sqlalchemy import create_engine, text
+
+from src.core import database
+from src.core.events import ChangeEvent, event_bus
+from src.migrations import maturity_level as migration
+from src.models.models import MATURITY_LEVELS, UNRATED_LEVEL, Content, Profile
+from src.services.facets import facet_index, group_by_counts
+
+
+def _content(client, headers, **fields):
+    body = {"title": f"Title {uuid.uuid4().hex[:8]}", **fields}
+    response = client.post("/content", json=body, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def _profile(client, headers, rating):
+    response = client.post("/profiles", json={"name": uuid.uuid4().hex[:8], "maturity_rating": rating}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def _profile_token(client, headers, profile_id):
+    response = client.post(f"/profiles/{profile_id}/token", headers=headers)
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_unrated_titles_are_treated_as_r(client, admin_headers, make_user):
+    unrated = _content(client, admin_headers)
+    headers = make_user()
+    kid = _profile(client, headers, "PG")
+    adult = _profile(client, headers, "TV-MA")
+    assert client.get(f"/content/{unrated}", params={"profile_id": kid}).status_code == 404
+    assert client.get(f"/content/{unrated}", params={"profile_id": adult}).status_code == 200
+    assert client.get(f"/content/{unrated}", params={"max_rating": "R"}).status_code == 200
+
+
+def test_profile_token_ceiling_cannot_be_bypassed(client, admin_headers, make_user):
+    mature = _content(client, admin_headers, maturity_rating="R")
+    headers = make_user()
+    kid = _profile(client, headers, "PG")
+    adult = _profile(client, headers, "R")
+    kid_headers = _profile_token(client, headers, kid)
+    assert client.get(f"/content/{mature}", headers=headers).status_code == 200
+    assert client.get(f"/content/{mature}", headers=kid_headers).status_code == 404
+    assert client.get(f"/content/{mature}", params={"max_rating": "NC-17"}, headers=kid_headers).status_code == 404
+    assert mature not in {c["id"] for c in client.get("/content", headers=kid_headers).json()}
+    assert client.get(f"/content/{mature}", params={"profile_id": adult}, headers=kid_headers).status_code == 403
+    # A profile token cannot mint another profile's token or raise its own rating
+    assert client.post(f"/profiles/{adult}/token", headers=kid_headers).status_code == 403
+    update = client.put(f"/profiles/{kid}", json={"name": "kid", "maturity_rating": "R"}, headers=kid_headers)
+    assert update.status_code == 403
+
+
+def test_stream_url_applies_ceiling(client, admin_headers, make_user):
+    mature = _content(client, admin_headers, maturity_rating="R")
+    headers = make_user()
+    kid_headers = _profile_token(client, headers, _profile(client, headers, "PG"))
+    assert client.get(f"/stream/{mature}", headers=headers).status_code == 200
+    assert client.get(f"/stream/{mature}", headers=kid_headers).status_code == 404
+    assert client.get(f"/stream/{mature}", params={"max_rating": "PG-13"}, headers=headers).status_code == 404
+
+
+def test_rating_change_in_another_worker_drops_cached_ceiling(client, admin_headers, make_user):
+    mature = _content(client, admin_headers, maturity_rating="R")
+    headers = make_user()
+    profile = _profile(client, headers, "R")
+    params = {"profile_id": profile}
+    assert client.get(f"/content/{mature}", params=params).status_code == 200
+
+    # Another worker lowers the rating: this process only sees its change event
+    with database.SessionLocal() as db:
+        db.query(Profile).filter(Profile.id == profile).update({"maturity_rating": "PG"})
+        db.commit()
+    assert client.get(f"/content/{mature}", params=params).status_code == 200  # cached ceiling
+    remote = ChangeEvent("profile", profile, "update", 1, "another-worker", 0.0)
+    event_bus._receive(json.dumps([remote.to_json()]).encode())
+    assert client.get(f"/content/{mature}", params=params).status_code == 404
+
+    # A local update invalidates through the same event
+    update = client.put(f"/profiles/{profile}", json={"name": "grown", "maturity_rating": "R"}, headers=headers)
+    assert update.status_code == 200
+    assert client.get(f"/content/{mature}", params=params).status_code == 200
+
+
+def test_rows_without_a_level_are_filtered_by_their_rating(client, admin_headers):
+    genre = f"Genre {uuid.uuid4().hex[:8]}"
+    ids = {rating: _content(client, admin_headers, genre=genre, maturity_rating=rating) for rating in ("PG", "R", None)}
+    with database.SessionLocal() as db:  # as if the backfill migration had not run yet
+        db.query(Content).filter(Content.id.in_(ids.values())).update({"maturity_level": None})
+        db.commit()
+    for max_rating, visible in (("PG", {ids["PG"]}), ("R", set(ids.values()))):
+        listed = {c["id"] for c in client.get("/content", params={"genre": genre, "max_rating": max_rating}).json()}
+        assert listed == visible
+        with database.SessionLocal() as db:
+            level = MATURITY_LEVELS[max_rating]
+            sql = group_by_counts(db, {"genre": genre}, max_level=level)
+            assert sql == facet_index.counts(db, {"genre": genre}, max_level=level)
+            assert sql[0] == len(visible)
+
+
+def test_next_episode_applies_ceiling(client, admin_headers, make_user):
+    series = _content(client, admin_headers, content_type="series", maturity_rating="TV-MA")
+    assert client.post(f"/series/{series}/seasons", json={"season_number": 1}, headers=admin_headers).status_code == 200
+    ids = []
+    for number in (1, 2):
+        response = client.post(
+            f"/series/{series}/seasons/1/episodes", json={"episode_number": number, "title": "E"}, headers=admin_headers
+        )
+        assert response.status_code == 200, response.text
+        ids.append(response.json()["id"])
+    headers = make_user()
+    kid_headers = _profile_token(client, headers, _profile(client, headers, "TV-PG"))
+    assert client.get(f"/series/episodes/{ids[0]}/next").json()["id"] == ids[1]
+    assert client.get(f"/series/episodes/{ids[0]}/next", headers=kid_headers).status_code == 404
+    assert client.get(f"/series/episodes/{ids[0]}/next", params={"max_rating": "PG"}).status_code == 404
+
+
+def test_migration_backfills_levels(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text("CREATE TABLE contents (id INTEGER PRIMARY KEY, title VARCHAR(255), maturity_rating VARCHAR(16))")
+        )
+        conn.execute(text("INSERT INTO contents VALUES (1, 'a', 'PG'), (2, 'b', NULL), (3, 'c', 'X')"))
+    assert migration.upgrade(engine) == 3
+    assert migration.upgrade(engine) == 0
+    with engine.connect() as conn:
+        levels = dict(conn.execute(text("SELECT id, maturity_level FROM contents")).all())
+    assert levels == {1: 1, 2: UNRATED_LEVEL, 3: UNRATED_LEVEL}
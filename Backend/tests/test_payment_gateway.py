@@ -0,0 +1,120 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from benchmarks.stand_in_gateway import StandInGateway
+from src.core import database
+from src.models.models import Payment
+from src.services.payment_pipeline import PaymentJob, PaymentPipeline
+from src.services.payments import CircuitBreaker, PaymentProviderRegistry, PaymentProviderUnavailable
+
+
+@pytest.fixture
+def gateway():
+    server = StandInGateway().start()
+    yield server
+    server.stop()
+
+
+def _registry(gateway: StandInGateway) -> PaymentProviderRegistry:
+    registry = PaymentProviderRegistry()
+    registry.providers["stripe"].base_url = gateway.url
+    return registry
+
+
+def test_charges_reuse_one_keep_alive_connection(gateway):
+    async def run():
+        registry = _registry(gateway)
+        results = [await registry.charge("stripe", 100, "USD", f"tok_{i}", timeout=5) for i in range(20)]
+        declined = await registry.charge("stripe", 100, "USD", "bad_token", timeout=5)
+        await registry.aclose()
+        return results, declined, registry.metrics()["stripe"]
+
+    results, declined, metrics = asyncio.run(run())
+    assert all(status == "succeeded" for status, _ in results)
+    assert declined == ("failed", "")
+    assert gateway.connections == 1
+    assert metrics["calls"] == 21 and metrics["errors"] == 0
+
+
+def _pending_payment(client, make_user, token: str) -> PaymentJob:
+    user_id = client.get("/users/me", headers=make_user()).json()["id"]
+    with database.SessionLocal() as db:
+        payment = Payment(
+            user_id=user_id,
+            amount_cents=499,
+            provider="stripe",
+            status="pending",
+            idempotency_key=uuid.uuid4().hex,
+            charge_token=token,
+        )
+        db.add(payment)
+        db.commit()
+        return PaymentJob(payment.id, "stripe", 499, "USD", token, payment.idempotency_key)
+
+
+def _run_job(gateway: StandInGateway, job: PaymentJob, **options) -> Payment:
+    pipeline = PaymentPipeline(registry=_registry(gateway), backoff_seconds=0.01, **options)
+    pipeline.start()
+    try:
+        pipeline.submit(job)
+        assert pipeline.wait(job.payment_id, timeout=10)
+    finally:
+        pipeline.stop()
+    with database.SessionLocal() as db:
+        return db.get(Payment, job.payment_id)
+
+
+def test_retries_send_the_same_idempotency_key(client, make_user, gateway):
+    job = _pending_payment(client, make_user, "tok_retry")
+    gateway.fail_next(503, 502)
+    payment = _run_job(gateway, job)
+    assert payment.status == "succeeded" and payment.attempts == 3
+    keys = {key for key, _ in gateway.requests}
+    assert len(gateway.requests) == 3 and len(keys) == 1 and None not in keys
+    assert len(gateway.charges) == 1
+
+
+def test_timed_out_attempts_charge_only_once(client, make_user, gateway):
+    # Every attempt reaches the gateway but times out on our side
+    gateway.latency_seconds = 0.3
+    job = _pending_payment(client, make_user, "tok_slow")
+    payment = _run_job(gateway, job, charge_timeout=0.1, max_attempts=3)
+    time.sleep(0.4)  # let the gateway finish the abandoned requests
+    assert payment.status == "failed"
+    assert len(gateway.requests) == 3
+    assert len(gateway.charges) == 1
+
+
+def test_half_open_breaker_allows_a_single_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.05)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()  # the trial is in flight
+    breaker.record_failure()
+    assert not breaker.allow()  # re-opened
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+
+def test_open_breaker_rejects_and_counts(gateway):
+    async def run():
+        registry = _registry(gateway)
+        registry.breakers["stripe"] = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+        gateway.fail_next(500)
+        with pytest.raises(Exception):
+            await registry.charge("stripe", 100, "USD", "tok_x", timeout=5)
+        with pytest.raises(PaymentProviderUnavailable):
+            await registry.charge("stripe", 100, "USD", "tok_x", timeout=5)
+        await registry.aclose()
+        return registry.metrics()["stripe"]
+
+    metrics = asyncio.run(run())
+    assert metrics["breaker"] == "open" and metrics["rejected"] == 1 and len(gateway.requests) == 1
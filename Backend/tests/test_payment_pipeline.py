@@ -0,0 +1,156 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, inspect, text
+
+from src.core import database
+from src.migrations import payment_pipeline as migration
+from src.models.models import Payment
+from src.services import payment_pipeline
+from src.services.payment_pipeline import PaymentPipeline
+
+
+def _pay(client, headers, **fields):
+    body = {"amount_cents": 499, "provider": "stripe", "token": "tok_" + uuid.uuid4().hex, **fields}
+    return client.post("/subscriptions/pay", json=body, headers=headers)
+
+
+def _payment(payment_id: int) -> Payment:
+    with database.SessionLocal() as db:
+        return db.get(Payment, payment_id)
+
+
+def _pending_row(user_id: int, token, age_seconds: float) -> int:
+    with database.SessionLocal() as db:
+        payment = Payment(
+            user_id=user_id,
+            amount_cents=100,
+            provider="stripe",
+            status="pending",
+            idempotency_key=uuid.uuid4().hex,
+            charge_token=token,
+            updated_at=datetime.utcnow() - timedelta(seconds=age_seconds),
+        )
+        db.add(payment)
+        db.commit()
+        return payment.id
+
+
+def test_payment_settles_and_clears_token(client, make_user):
+    headers = make_user()
+    response = _pay(client, headers)
+    assert response.status_code == 202, response.text
+    payment_id = response.json()["id"]
+    settled = client.get(f"/subscriptions/payments/{payment_id}?wait=5", headers=headers).json()
+    assert settled["status"] == "succeeded"
+    assert _payment(payment_id).charge_token is None
+
+
+def test_reused_idempotency_key_must_match(client, make_user):
+    headers = make_user()
+    first = _pay(client, headers, idempotency_key="order-1").json()
+    assert _pay(client, headers, idempotency_key="order-1").json()["id"] == first["id"]
+    assert _pay(client, headers, idempotency_key="order-1", amount_cents=999).status_code == 409
+    assert _pay(client, headers, idempotency_key="order-1", provider="upi").status_code == 409
+
+
+def test_submit_failure_marks_payment_failed(client, make_user, monkeypatch):
+    headers = make_user()
+
+    def broken_submit(job):
+        raise TimeoutError()
+
+    monkeypatch.setattr(payment_pipeline.get_payment_pipeline(), "submit", broken_submit)
+    response = _pay(client, headers, idempotency_key="stuck")
+    assert response.status_code == 503
+    with database.SessionLocal() as db:
+        payment = db.query(Payment).filter(Payment.idempotency_key == "stuck").one()
+    assert payment.status == "failed" and payment.charge_token is None
+
+
+def test_recovery_claims_abandoned_payments_once(client, make_user):
+    user_id = client.get("/users/me", headers=make_user()).json()["id"]
+    abandoned = _pending_row(user_id, "tok_abandoned", age_seconds=3600)
+    fresh = _pending_row(user_id, "tok_fresh", age_seconds=0)
+    tokenless = _pending_row(user_id, None, age_seconds=3600)
+    pipeline = PaymentPipeline(recovery_after=600)
+    jobs = pipeline.recover_pending(limit=100)
+    assert abandoned in {job.payment_id for job in jobs}
+    assert fresh not in {job.payment_id for job in jobs}
+    assert pipeline.recover_pending(limit=100) == []  # claimed: updated_at was renewed
+    assert _payment(tokenless).status == "failed"
+
+
+def test_recovered_payment_is_charged_after_restart(client, make_user):
+    user_id = client.get("/users/me", headers=make_user()).json()["id"]
+    payment_id = _pending_row(user_id, "tok_" + uuid.uuid4().hex, age_seconds=3600)
+    pipeline = PaymentPipeline(recovery_interval=0.05, recovery_after=600)
+    pipeline.start()
+    try:
+        assert pipeline.wait(payment_id, timeout=5)
+    finally:
+        pipeline.stop()
+    assert _payment(payment_id).status == "succeeded"
+
+
+def test_wait_polls_payments_queued_elsewhere(client, make_user):
+    user_id = client.get("/users/me", headers=make_user()).json()["id"]
+    pending = _pending_row(user_id, "tok_elsewhere", age_seconds=0)
+    pipeline = PaymentPipeline(wait_poll=0.01)
+    assert pipeline.wait(pending, timeout=0.05) is False
+    with database.SessionLocal() as db:
+        db.query(Payment).filter(Payment.id == pending).update({"status": "succeeded"})
+        db.commit()
+    assert pipeline.wait(pending, timeout=0.05) is True
+
+
+def test_long_polls_hold_no_thread_or_connection(client, make_user):
+    headers = make_user()
+    user_id = client.get("/users/me", headers=headers).json()["id"]
+    pending = _pending_row(user_id, "tok_" + uuid.uuid4().hex, age_seconds=0)
+    pollers = 50  # more than the threadpool (40) and the SQLite connection pool (15)
+    statuses = []
+
+    def poll():
+        statuses.append(client.get(f"/subscriptions/payments/{pending}?wait=10", headers=headers).json()["status"])
+
+    threads = [threading.Thread(target=poll) for _ in range(pollers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.5)
+    began = time.monotonic()
+    assert client.get("/users/me", headers=headers).status_code == 200
+    assert time.monotonic() - began < 2
+    assert statuses == []  # every poller is still waiting
+    with database.SessionLocal() as db:
+        db.query(Payment).filter(Payment.id == pending).update({"status": "succeeded"})
+        db.commit()
+    for thread in threads:
+        thread.join(5)
+    assert statuses == ["succeeded"] * pollers
+
+
+def test_migration_adds_pipeline_columns(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE payments (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, "
+                "amount_cents INTEGER NOT NULL, currency VARCHAR(8) NOT NULL, provider VARCHAR(32) NOT NULL, "
+                "provider_ref VARCHAR(128), status VARCHAR(32) NOT NULL, created_at DATETIME NOT NULL)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO payments VALUES (1, 1, 100, 'USD', 'stripe', 'pi_1', 'succeeded', '2024-01-01')")
+        )
+    assert migration.upgrade(engine) == 4
+    assert migration.upgrade(engine) == 0
+    columns = {c["name"] for c in inspect(engine).get_columns("payments")}
+    assert {"idempotency_key", "charge_token", "attempts", "updated_at"} <= columns
+    indexes = {i["name"]: i for i in inspect(engine).get_indexes("payments")}
+    assert indexes["uq_payment_user_idempotency"]["unique"]
+    assert "ix_payments_status_updated" in indexes
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT attempts, updated_at FROM payments")).one() == (0, "2024-01-01")
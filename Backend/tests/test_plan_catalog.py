@@ -0,0 +1,45 @@
+import json
+import uuid
+
+from src.core import database
+from src.core.events import ChangeEvent, event_bus
+from src.models.models import SubscriptionPlan
+from src.services.plan_catalog import PlanCatalog, plan_catalog
+
+
+def _plan(client, headers, **fields):
+    body = {"name": f"Plan {uuid.uuid4().hex[:8]}", "price_cents": 499, **fields}
+    response = client.post("/subscriptions/plans", json=body, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_create_plan_updates_snapshot_without_reloading(client, admin_headers):
+    client.get("/subscriptions/plans")
+    reloads = plan_catalog.reloads
+    created = _plan(client, admin_headers)
+    hidden = _plan(client, admin_headers, is_active=False)
+    listed = {p["id"] for p in client.get("/subscriptions/plans").json()}
+    assert created["id"] in listed and hidden["id"] not in listed
+    assert plan_catalog.reloads == reloads
+
+
+def test_remote_change_event_reloads(client):
+    client.get("/subscriptions/plans")
+    with database.SessionLocal() as db:
+        plan = SubscriptionPlan(name=f"Remote {uuid.uuid4().hex[:8]}", price_cents=899)
+        db.add(plan)
+        db.commit()
+        plan_id = plan.id
+    assert plan_id not in {p["id"] for p in client.get("/subscriptions/plans").json()}
+    event = ChangeEvent("subscription_plan", plan_id, "insert", 1, "another-worker", 0.0)
+    # What the transport delivers when another worker commits a plan
+    event_bus._receive(json.dumps([event.to_json()]).encode())
+    assert plan_id in {p["id"] for p in client.get("/subscriptions/plans").json()}
+
+
+def test_snapshot_expires():
+    catalog = PlanCatalog(ttl_seconds=0.0)
+    with database.SessionLocal() as db:
+        first = catalog.get(db)
+        assert catalog.get(db) is not first
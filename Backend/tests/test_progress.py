@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from src.core import database
+from src.models.models import Content, PlaybackProgress, Profile
+from src.services.progress import _IN_CHUNK, ProgressTracker
+from src.services.viewing_events import ViewingEventStore
+
+
+def test_flush_and_continue_watching_chunk_id_lists(client, make_user):
+    headers = make_user()
+    user_id = client.get("/users/me", headers=headers).json()["id"]
+    titles = _IN_CHUNK + 50
+    with database.SessionLocal() as db:
+        profile = Profile(user_id=user_id, name="Kid")
+        contents = [Content(title=f"Progress {i}") for i in range(titles)]
+        db.add_all([profile, *contents])
+        db.commit()
+        profile_id, content_ids = profile.id, [c.id for c in contents]
+
+    tracker = ProgressTracker(flush_interval=3600)
+    for cid in content_ids:
+        tracker.record(profile_id, cid, 60, 3600)
+    tracker.record(profile_id + 10**6, content_ids[0], 60, 3600)  # unknown profile is dropped
+    lists = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if " IN (" in statement:
+            lists.append(statement.count("?") or len(parameters))
+
+    engine = database.get_engine()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        tracker.stop()  # stops the flush thread and writes everything pending
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert tracker.rows_flushed == titles
+    assert lists and max(lists) <= _IN_CHUNK
+    with database.SessionLocal() as db:
+        assert db.query(PlaybackProgress).filter(PlaybackProgress.profile_id == profile_id).count() == titles
+        rail = tracker.continue_watching(db, profile_id, limit=titles)
+    assert len(rail) == titles
+
+
+def test_older_heartbeat_flushed_late_does_not_overwrite_newer(client, make_user):
+    user_id = client.get("/users/me", headers=make_user()).json()["id"]
+    with database.SessionLocal() as db:
+        profile, content = Profile(user_id=user_id, name="Main"), Content(title="Out of order")
+        db.add_all([profile, content])
+        db.commit()
+        profile_id, content_id = profile.id, content.id
+
+    slow, fast = ProgressTracker(flush_interval=3600), ProgressTracker(flush_interval=3600)
+    slow.record(profile_id, content_id, 100, 3600)
+    fast.record(profile_id, content_id, 160, 3600)
+    fast.stop()
+    slow.stop()  # flushes the older heartbeat last
+    with database.SessionLocal() as db:
+        row = db.query(PlaybackProgress).filter(PlaybackProgress.profile_id == profile_id).one()
+        assert row.position_seconds == 160
+        assert ProgressTracker().last_position(db, profile_id, content_id)[0] == 160
+
+
+def test_watch_time_counts_heartbeats_received_by_another_worker(client, make_user):
+    headers = make_user()
+    user_id = client.get("/users/me", headers=headers).json()["id"]
+    with database.SessionLocal() as db:
+        profile, content = Profile(user_id=user_id, name="Main"), Content(title="Two workers")
+        db.add_all([profile, content])
+        db.commit()
+        profile_id, content_id = profile.id, content.id
+
+    # Two workers share the database but nothing in memory
+    first, second = ProgressTracker(flush_interval=3600), ProgressTracker(flush_interval=3600)
+    events = ViewingEventStore(enabled=True, flush_rows=10**9)
+    with database.SessionLocal() as db:
+        assert first.last_position(db, profile_id, content_id) is None
+    first.record(profile_id, content_id, 100, 3600)
+    first.stop()
+    with database.SessionLocal() as db:
+        db.query(PlaybackProgress).filter(PlaybackProgress.profile_id == profile_id).update(
+            {"updated_at": datetime.utcnow() - timedelta(seconds=30)}
+        )
+        db.commit()
+        previous = second.last_position(db, profile_id, content_id)
+    second.record(profile_id, content_id, 130, 3600)
+    events.record_heartbeat(user_id, profile_id, content_id, 130, previous)
+    assert previous[0] == 100
+    assert events._buffer[-1][-1] == 30
+    assert second.last_position(None, profile_id, content_id)[0] == 130  # answered from memory
+    second.stop()
@@ -0,0 +1,170 @@
+import math
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from starlette.requests import Request
+
+from src.core import rate_limit as rate_limit_module
+from src.core.config import get_settings
+from src.core.rate_limit import (
+    ConcurrencyLimiter,
+    MemoryBucketStore,
+    RateLimiter,
+    RatePolicy,
+    SharedBucketStore,
+    rate_limiter,
+)
+from src.routers import content as content_router
+
+settings = get_settings()
+
+
+class _RecordingStore:
+    def __init__(self):
+        self.takes = []
+
+    def take(self, key, capacity, refill_per_second, cost=1.0):
+        self.takes.append((key, cost))
+        return True, 0.0
+
+
+class _LuaRedis:
+    """Redis stand-in whose eval runs the script in Lua 5.1 (Redis' version) over in-memory hashes.
+
+    Only the commands TOKEN_BUCKET_SCRIPT uses are implemented.
+    """
+
+    def __init__(self):
+        from lupa import lua51
+
+        self.hashes = {}
+        self.expires = {}
+        self._lua = lua51.LuaRuntime()
+        self._lua.globals().redis = self._lua.table_from({"call": self._call})
+
+    def _call(self, command, key, *args):
+        command = command.upper()
+        if command == "HMGET":
+            bucket = self.hashes.get(key, {})
+            return self._lua.table_from([bucket.get(field, False) for field in args])
+        if command == "HSET":
+            bucket = self.hashes.setdefault(key, {})
+            for field, value in zip(args[::2], args[1::2]):
+                bucket[field] = str(value)  # Redis stores strings
+            return len(args) // 2
+        if command == "EXPIRE":
+            self.expires[key] = int(args[0])
+            return 1
+        raise NotImplementedError(command)
+
+    def eval(self, script, numkeys, *keys_and_args):
+        keys, argv = keys_and_args[:numkeys], [str(a) for a in keys_and_args[numkeys:]]
+        self._lua.globals().KEYS = self._lua.table_from(list(keys))
+        self._lua.globals().ARGV = self._lua.table_from(argv)
+        result = self._lua.execute(script)
+        # Redis converts a Lua table reply to a list and truncates Lua numbers to integers
+        return [int(v) if isinstance(v, (int, float)) else v for v in result.values()]
+
+
+def _request(authorization=None, ip="10.0.0.1") -> Request:
+    headers = [(b"authorization", authorization.encode())] if authorization else []
+    return Request({"type": "http", "headers": headers, "client": (ip, 1234)})
+
+
+def _token(secret=settings.JWT_SECRET, **claims) -> str:
+    return "Bearer " + jwt.encode(claims, secret, algorithm=settings.JWT_ALGORITHM)
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    """Enable the app's limiter with a fresh in-memory store; returns a function setting a policy."""
+    monkeypatch.setattr(rate_limiter, "enabled", True)
+    monkeypatch.setattr(rate_limiter, "store", MemoryBucketStore())
+
+    def policy(name, capacity, refill_per_second=0.001, key_by="user"):
+        monkeypatch.setitem(rate_limiter.policies, name, RatePolicy(name, capacity, refill_per_second, key_by))
+
+    return policy
+
+
+def test_exhausted_bucket_answers_429_with_retry_after(client, admin_headers, make_user, limited):
+    content_id = client.post("/content", json={"title": "Limited"}, headers=admin_headers).json()["id"]
+    headers = make_user()
+    limited("stream", capacity=2, refill_per_second=0.5)
+    assert [client.get(f"/stream/{content_id}", headers=headers).status_code for _ in range(2)] == [200, 200]
+    rejected = client.get(f"/stream/{content_id}", headers=headers)
+    assert rejected.status_code == 429
+    assert rejected.headers["retry-after"] == "2"  # one token at 0.5/s
+    # Another user has a bucket of their own
+    assert client.get(f"/stream/{content_id}", headers=make_user()).status_code == 200
+
+
+def test_search_costs_more_tokens_than_listing(client, limited):
+    genre = uuid.uuid4().hex
+    limited("catalog", capacity=2 * settings.RATE_LIMIT_SEARCH_COST)
+    searches = [client.get("/content", params={"q": genre}).status_code for _ in range(3)]
+    assert searches == [200, 200, 429]
+    rate_limiter.store.clear()
+    listings = [client.get("/content", params={"genre": genre}).status_code for _ in range(9)]
+    assert listings == [200] * 8 + [429]
+
+
+def test_bucket_keys_by_user_or_ip():
+    store = _RecordingStore()
+    policies = {"stream": RatePolicy("stream", 10, 1), "login": RatePolicy("login", 10, 1, key_by="ip")}
+    limiter = RateLimiter(store, policies)
+    limiter.check(_request(_token(user_id=7)), "stream")
+    limiter.check(_request(_token(user_id=7)), "login")
+    limiter.check(_request(), "stream")
+    limiter.check(_request(_token(secret="not-the-secret", user_id=1)), "stream")  # forged
+    limiter.check(_request("Bearer not-a-jwt"), "stream")
+    limiter.check(_request(_token(user_id=7), ip="10.0.0.2"), "stream")
+    assert [key for key, _ in store.takes] == [
+        "stream:u:7",
+        "login:ip:10.0.0.1",
+        "stream:ip:10.0.0.1",
+        "stream:ip:10.0.0.1",
+        "stream:ip:10.0.0.1",
+        "stream:u:7",
+    ]
+
+
+def test_concurrency_limiter_rejects_with_503():
+    limiter = ConcurrencyLimiter("catalog", limit=1)
+    with limiter:
+        with pytest.raises(HTTPException) as rejected:
+            with limiter:
+                pass
+    assert rejected.value.status_code == 503 and rejected.value.headers["Retry-After"] == "1"
+    assert limiter.rejected == 1
+    with limiter:  # the slot is free again
+        pass
+
+
+def test_catalog_miss_without_a_slot_answers_503(client, monkeypatch):
+    monkeypatch.setattr(content_router, "catalog_admission", ConcurrencyLimiter("catalog", limit=1))
+    with content_router.catalog_admission:  # another render holds the only slot
+        response = client.get("/content", params={"genre": uuid.uuid4().hex})
+    assert response.status_code == 503 and response.headers["retry-after"] == "1"
+
+
+def test_shared_store_runs_the_token_bucket_script(monkeypatch):
+    pytest.importorskip("lupa")
+    now = [1_000.0]
+    monkeypatch.setattr(rate_limit_module.time, "time", lambda: now[0])
+    redis = _LuaRedis()
+    store = SharedBucketStore(redis)
+    assert [store.take("u:1", 3, 0.5)[0] for _ in range(3)] == [True, True, True]
+    allowed, retry_after = store.take("u:1", 3, 0.5)
+    assert not allowed and retry_after == pytest.approx(2.0)
+    assert store.take("u:2", 3, 0.5) == (True, 0.0)  # keys do not share tokens
+    assert redis.expires["ratelimit:u:1"] == math.ceil(3 / 0.5) + 1
+
+    now[0] += 3  # 1.5 tokens refilled
+    assert store.take("u:1", 3, 0.5, cost=1) == (True, 0.0)
+    allowed, retry_after = store.take("u:1", 3, 0.5, cost=1)
+    assert not allowed and retry_after == pytest.approx(1.0)
+    now[0] += 60  # refills stop at capacity
+    assert [store.take("u:1", 3, 0.5)[0] for _ in range(4)] == [True, True, True, False]
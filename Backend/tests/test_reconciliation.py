@@ -0,0 +1,91 @@
+import csv
+import uuid
+from datetime import datetime
+
+import pytest
+
+from src.core import database
+from src.models.models import Payment, User
+from src.services.reconciliation import reconcile, write_mock_settlement_file
+
+START, END = datetime(2024, 1, 1), datetime(2024, 2, 1)
+
+
+@pytest.fixture
+def provider(client):
+    """A provider name unique to the test, so payments of other tests never match."""
+    name = f"t-{uuid.uuid4().hex[:12]}"
+    with database.SessionLocal() as db:
+        user = User(email=f"{name}@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        return name, user.id
+
+
+def _payments(provider, refs, status="succeeded", amount=499):
+    name, user_id = provider
+    with database.SessionLocal() as db:
+        db.add_all(
+            Payment(
+                user_id=user_id,
+                provider=name,
+                provider_ref=ref,
+                amount_cents=amount,
+                status=status,
+                created_at=datetime(2024, 1, 15),
+            )
+            for ref in refs
+        )
+        db.commit()
+
+
+def _reconcile(provider, path, chunk_size=1000):
+    with database.SessionLocal() as db:
+        return reconcile(db, provider[0], str(path), START, END, chunk_size=chunk_size)
+
+
+def _fixture(provider, path, **options):
+    with database.SessionLocal() as db:
+        return write_mock_settlement_file(db, provider[0], START, END, str(path), **options)
+
+
+def test_mock_settlement_file_reconciles_cleanly(provider, tmp_path):
+    _payments(provider, [f"pi_{i:05d}" for i in range(250)])
+    _payments(provider, [f"pi_failed_{i}" for i in range(5)], status="failed")
+    assert _fixture(provider, tmp_path / "settlement.csv") == 250
+    report = _reconcile(provider, tmp_path / "settlement.csv", chunk_size=16)
+    assert report.matched == 250 and not report.mismatches
+    assert report.settlement_rows == 250 and report.payment_rows == 255
+
+
+def test_corrupted_amounts_are_flagged(provider, tmp_path):
+    _payments(provider, [f"pi_{i:05d}" for i in range(200)])
+    _fixture(provider, tmp_path / "settlement.csv", corrupt_ratio=0.1, seed=7)
+    report = _reconcile(provider, tmp_path / "settlement.csv", chunk_size=32)
+    assert report.mismatches["amount"] > 0
+    assert report.matched + report.mismatches["amount"] == 200
+
+
+def test_shared_refs_across_chunk_boundaries_are_not_skipped(provider, tmp_path):
+    # The simulated gateways derive refs from the token, so refs can repeat
+    _payments(provider, ["pi_a", "pi_b", "pi_b", "pi_b", "pi_c"])
+    _fixture(provider, tmp_path / "settlement.csv")
+    report = _reconcile(provider, tmp_path / "settlement.csv", chunk_size=2)
+    assert report.payment_rows == 5
+    assert report.mismatches["duplicate_payment"] == 2
+    assert report.mismatches["duplicate_settlement"] == 2  # the fixture reports every payment
+
+
+def test_missing_rows_on_either_side(provider, tmp_path):
+    _payments(provider, ["pi_1", "pi_2", "pi_3"])
+    path = tmp_path / "settlement.csv"
+    with open(path, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["provider_ref", "amount_cents", "currency", "status"])
+        writer.writerows(
+            [["pi_3", 499, "USD", "succeeded"], ["pi_1", 499, "EUR", "succeeded"], ["pi_9", 100, "USD", "succeeded"]]
+        )
+    report = _reconcile(provider, path)
+    assert report.matched == 1
+    assert dict(report.mismatches) == {"currency": 1, "missing_settlement": 1, "missing_payment": 1}
+    assert {m.provider_ref for m in report.samples} == {"pi_1", "pi_2", "pi_9"}
@@ -0,0 +1,103 @@
+import uuid
+
+from src.core import database
+from src.models.models import RatingReview, ReviewFingerprint, ReviewStatus
+from src.services.review_moderation import ReviewModerator
+
+# Too short to fingerprint, so repeating it across tests never makes a duplicate
+SPAM = "FREE CRYPTO GIVEAWAY!!! Visit www.cheap-promo.xyz now"
+
+
+def _text(words=12) -> str:
+    # Unique per call: fingerprints of other tests' reviews must not match
+    return " ".join(uuid.uuid4().hex[:6] for _ in range(words))
+
+
+def _moderator() -> ReviewModerator:
+    return ReviewModerator(processes=0)
+
+
+def _review(client, make_user, content_id, rating, text):
+    headers = make_user()
+    profile_id = client.post("/profiles", json={"name": uuid.uuid4().hex[:8]}, headers=headers).json()["id"]
+    response = client.post(
+        f"/reviews/{profile_id}/content/{content_id}", json={"rating": rating, "review_text": text}, headers=headers
+    )
+    assert response.status_code == 200
+    return response.json()["id"], headers
+
+
+def _content(client, admin_headers) -> int:
+    return client.post("/content", json={"title": uuid.uuid4().hex}, headers=admin_headers).json()["id"]
+
+
+def _row(review_id) -> RatingReview:
+    with database.SessionLocal() as db:
+        return db.get(RatingReview, review_id)
+
+
+def test_near_duplicates_and_spam_are_hidden_from_listings_and_aggregates(client, admin_headers, make_user):
+    content_id = _content(client, admin_headers)
+    text = _text()
+    reworded = text.rsplit(" ", 1)[0] + " typo"
+    original, _ = _review(client, make_user, content_id, 4, text)
+    copy, _ = _review(client, make_user, content_id, 1, reworded)
+    spam, _ = _review(client, make_user, content_id, 5, SPAM)
+    short, _ = _review(client, make_user, content_id, 2, "Loved it!")
+    assert len(client.get(f"/reviews/content/{content_id}").json()) == 4  # pending reviews are listed
+
+    moderator = _moderator()
+    moderator.process_pending()
+
+    assert _row(original).status == ReviewStatus.VISIBLE.value
+    assert _row(copy).status == ReviewStatus.HIDDEN.value and _row(copy).duplicate_of_id == original
+    assert _row(spam).status == ReviewStatus.HIDDEN.value and _row(spam).spam_score >= moderator.spam_threshold
+    assert _row(short).status == ReviewStatus.VISIBLE.value
+    assert moderator.duplicates == 1 and moderator.hidden == 2
+    assert sorted(r["id"] for r in client.get(f"/reviews/content/{content_id}").json()) == [original, short]
+    summary = client.get(f"/reviews/content/{content_id}/summary").json()
+    assert summary["review_count"] == 2 and summary["average_rating"] == 3.0
+
+
+def test_edited_review_is_moderated_again(client, admin_headers, make_user):
+    content_id = _content(client, admin_headers)
+    review_id, headers = _review(client, make_user, content_id, 5, SPAM)
+    moderator = _moderator()
+    moderator.process_pending()
+    assert _row(review_id).status == ReviewStatus.HIDDEN.value
+
+    response = client.put(f"/reviews/{review_id}", json={"rating": 4, "review_text": _text()}, headers=headers)
+    assert response.status_code == 200
+    assert _row(review_id).status == ReviewStatus.PENDING.value
+    moderator.process_pending()
+    assert _row(review_id).status == ReviewStatus.VISIBLE.value
+    summary = client.get(f"/reviews/content/{content_id}/summary").json()
+    assert summary["review_count"] == 1 and summary["average_rating"] == 4.0
+
+
+def test_edit_during_a_batch_is_not_overwritten(client, admin_headers, make_user, monkeypatch):
+    content_id = _content(client, admin_headers)
+    review_id, headers = _review(client, make_user, content_id, 5, SPAM)
+    moderator = _moderator()
+    analyze = moderator._analyze
+    edited = _text()
+
+    def analyze_then_edit(texts):
+        analyses = analyze(texts)
+        # The user rewrites the review while the batch is scoring the old text
+        response = client.put(f"/reviews/{review_id}", json={"rating": 3, "review_text": edited}, headers=headers)
+        assert response.status_code == 200
+        return analyses
+
+    monkeypatch.setattr(moderator, "_analyze", analyze_then_edit)
+    moderator.process_batch()
+    row = _row(review_id)
+    assert row.status == ReviewStatus.PENDING.value and row.review_text == edited
+    assert moderator.hidden == 0
+
+    monkeypatch.setattr(moderator, "_analyze", analyze)
+    moderator.process_pending()
+    assert _row(review_id).status == ReviewStatus.VISIBLE.value
+    with database.SessionLocal() as db:
+        fingerprints = db.query(ReviewFingerprint).filter_by(review_id=review_id).count()
+    assert fingerprints == 1
@@ -0,0 +1,72 @@
+import uuid
+
+from sqlalchemy import create_engine, inspect, text
+
+from src.core import database
+from src.migrations import series as migration
+from src.models.models import EPISODE_ORDINAL_STRIDE, Season
+
+
+def _series(client, headers, seasons=2, episodes=3):
+    body = {"title": f"Series {uuid.uuid4().hex[:8]}", "content_type": "series"}
+    series_id = client.post("/content", json=body, headers=headers).json()["id"]
+    ids = []
+    for season in range(1, seasons + 1):
+        client.post(f"/series/{series_id}/seasons", json={"season_number": season}, headers=headers)
+        for number in range(1, episodes + 1):
+            response = client.post(
+                f"/series/{series_id}/seasons/{season}/episodes",
+                json={"episode_number": number, "title": f"S{season}E{number}"},
+                headers=headers,
+            )
+            ids.append(response.json()["id"])
+    return series_id, ids
+
+
+def test_next_episode_continues_into_next_season(client, admin_headers):
+    _, ids = _series(client, admin_headers)
+    following = [client.get(f"/series/episodes/{episode_id}/next") for episode_id in ids]
+    assert [r.json()["id"] for r in following[:-1]] == ids[1:]
+    assert following[-1].status_code == 404
+
+
+def test_episode_number_stays_within_the_ordinal_stride(client, admin_headers):
+    series_id, _ = _series(client, admin_headers, seasons=1, episodes=0)
+    path = f"/series/{series_id}/seasons/1/episodes"
+    too_far = {"episode_number": EPISODE_ORDINAL_STRIDE, "title": "Overflow"}
+    assert client.post(path, json=too_far, headers=admin_headers).status_code == 422
+    last = {"episode_number": EPISODE_ORDINAL_STRIDE - 1, "title": "Last"}
+    assert client.post(path, json=last, headers=admin_headers).status_code == 200
+    season = client.post(f"/series/{series_id}/seasons", json={"season_number": 10**6}, headers=admin_headers)
+    assert season.status_code == 422
+
+
+def test_update_keeps_omitted_fields_and_guards_content_type(client, admin_headers):
+    series_id, _ = _series(client, admin_headers, seasons=1, episodes=1)
+    tracks = {"title": "Renamed", "audio_languages": ["en"], "subtitle_languages": ["fr"]}
+    assert client.put(f"/content/{series_id}", json=tracks, headers=admin_headers).status_code == 200
+    updated = client.put(f"/content/{series_id}", json={"title": "Renamed again"}, headers=admin_headers).json()
+    assert updated["content_type"] == "series"
+    assert (updated["audio_languages"], updated["subtitle_languages"]) == (["en"], ["fr"])
+
+    as_movie = {"title": "Renamed again", "content_type": "movie"}
+    assert client.put(f"/content/{series_id}", json=as_movie, headers=admin_headers).status_code == 409
+    assert client.get(f"/series/{series_id}").json()["season_count"] == 1
+    with database.SessionLocal() as db:
+        db.query(Season).filter(Season.series_id == series_id).delete()
+        db.commit()
+    assert client.put(f"/content/{series_id}", json=as_movie, headers=admin_headers).json()["content_type"] == "movie"
+
+
+def test_migration_adds_content_type_and_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE contents (id INTEGER PRIMARY KEY, title VARCHAR(255) NOT NULL)"))
+        conn.execute(text("INSERT INTO contents VALUES (1, 'Old movie')"))
+    assert migration.upgrade(engine) == 1
+    assert migration.upgrade(engine) == 0
+    inspector = inspect(engine)
+    assert {"seasons", "episodes"} <= set(inspector.get_table_names())
+    assert "ix_contents_content_type" in {i["name"] for i in inspector.get_indexes("contents")}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT content_type FROM contents")).scalar() == "movie"
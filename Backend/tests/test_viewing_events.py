@@ -0,0 +1,108 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, inspect, select, text
+
+from src.core import database
+from src.services.viewing_events import HEARTBEAT, PLAY, ViewingEventStore, partition_name
+
+DAY = 86_400
+TODAY = int(time.time()) // DAY
+# Partitions a running server also writes to (today) or expires (past the retention) are left alone
+FLUSH_DAY = TODAY + 400
+WINDOW_DAY = TODAY + 500
+
+
+def _at(day: int, hour: int = 0, second: int = 0) -> int:
+    return day * DAY + hour * 3600 + second
+
+
+def _moment(ts: int) -> datetime:
+    return datetime.fromtimestamp(ts, timezone.utc)
+
+
+def _count(day: int) -> int:
+    with database.SessionLocal() as db:
+        table = ViewingEventStore()._table(partition_name(day))
+        return db.scalar(select(func.count()).select_from(table))
+
+
+def _tables():
+    return inspect(database.get_engine()).get_table_names()
+
+
+def test_flush_writes_day_partitions_and_requeues_failed_batches(client):
+    store = ViewingEventStore(enabled=True)
+    broken = partition_name(FLUSH_DAY + 1)
+    with database.get_engine().begin() as conn:
+        conn.execute(text(f"CREATE TABLE {broken} (ts INTEGER)"))
+    store.append((_at(FLUSH_DAY, second=DAY - 1), PLAY, 1, 1, None, 0))
+    store.append((_at(FLUSH_DAY + 1), PLAY, 1, 1, None, 0))
+
+    with pytest.raises(Exception):
+        store.flush()
+    assert store.stats() == {"recorded": 2, "written": 0, "dropped": 0, "buffered": 2}
+    # The whole batch rolled back (pysqlite commits the CREATE TABLE on its own, PostgreSQL does not)
+    assert partition_name(FLUSH_DAY) not in _tables() or _count(FLUSH_DAY) == 0
+
+    with database.get_engine().begin() as conn:
+        conn.execute(text(f"DROP TABLE {broken}"))
+    assert store.flush() == 2
+    assert _count(FLUSH_DAY) == 1 and _count(FLUSH_DAY + 1) == 1
+    assert store.stats()["buffered"] == 0
+
+
+def test_top_titles_spans_day_partitions_within_the_window(client):
+    store = ViewingEventStore(enabled=True)
+    a, b, c = 901, 902, 903
+    for row in [
+        (_at(WINDOW_DAY, 11, 3599), PLAY, a, 1, None, 0),  # before since
+        (_at(WINDOW_DAY, 12), PLAY, a, 1, None, 0),
+        (_at(WINDOW_DAY + 1), PLAY, a, 1, None, 0),
+        (_at(WINDOW_DAY + 1, 12), PLAY, a, 1, None, 0),  # until is exclusive
+        (_at(WINDOW_DAY, 13), HEARTBEAT, c, 1, 1, 900),
+        (_at(WINDOW_DAY, 23), PLAY, b, 1, None, 0),
+        (_at(WINDOW_DAY + 1, 1), HEARTBEAT, b, 1, 1, 600),
+        (_at(WINDOW_DAY + 2), PLAY, c, 1, None, 0),  # a partition outside the window
+    ]:
+        store.append(row)
+    store.flush()
+    since, until = _moment(_at(WINDOW_DAY, 12)), _moment(_at(WINDOW_DAY + 1, 12))
+
+    with database.SessionLocal() as db:
+        by_plays = store.top_titles(db, since, until)
+        by_watch = store.top_titles(db, since, until, by="watch_seconds")
+        first_day = store.top_titles(db, since, _moment(_at(WINDOW_DAY + 1)))
+    assert by_plays == [
+        {"content_id": a, "plays": 2, "watch_seconds": 0},
+        {"content_id": b, "plays": 1, "watch_seconds": 600},
+        {"content_id": c, "plays": 0, "watch_seconds": 900},
+    ]
+    assert [row["content_id"] for row in by_watch] == [c, b, a]
+    assert [(row["content_id"], row["plays"]) for row in first_day] == [(a, 1), (b, 1), (c, 0)]
+
+
+def test_drop_expired_keeps_partitions_within_retention(client):
+    store = ViewingEventStore(enabled=True, retention_days=3)
+    store.append((_at(TODAY - 5), PLAY, 1, 1, None, 0))
+    store.append((_at(TODAY - 2), PLAY, 1, 1, None, 0))
+    store.flush()
+
+    assert store.drop_expired() == [partition_name(TODAY - 5)]
+    tables = _tables()
+    assert partition_name(TODAY - 5) not in tables and partition_name(TODAY - 2) in tables
+
+
+def test_heartbeats_credit_forward_progress_only(monkeypatch):
+    store = ViewingEventStore(enabled=True, heartbeat_gap=120)
+    rows = []
+    monkeypatch.setattr(store, "append", rows.append)
+    now = datetime.utcnow()
+
+    store.record_heartbeat(1, 1, 7, 100, None)  # first heartbeat
+    store.record_heartbeat(1, 1, 7, 160, (100, now - timedelta(seconds=60)))
+    store.record_heartbeat(1, 1, 7, 20, (160, now - timedelta(seconds=10)))  # seek back
+    store.record_heartbeat(1, 1, 7, 3000, (20, now - timedelta(seconds=10)))  # seek ahead
+    store.record_heartbeat(1, 1, 7, 3600, (3000, now - timedelta(hours=1)))  # resumed after a pause
+    assert [row[5] for row in rows] == [0, 60, 0, 11, 120]
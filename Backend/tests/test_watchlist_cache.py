@@ -0,0 +1,65 @@
+import json
+
+from sqlalchemy import event
+
+from src.core import database
+from src.core.events import ChangeEvent, event_bus
+from src.models.models import Content, Profile, WatchlistItem
+from src.services.watchlist_cache import WatchlistMembershipCache, watchlist_cache
+
+
+def test_load_racing_an_invalidation_is_not_stored(client, make_user):
+    user_id = client.get("/users/me", headers=make_user()).json()["id"]
+    with database.SessionLocal() as db:
+        profile, content = Profile(user_id=user_id, name="Main"), Content(title="Racing")
+        db.add_all([profile, content])
+        db.commit()
+        profile_id, content_id = profile.id, content.id
+
+    cache = WatchlistMembershipCache(max_profiles=10, ttl_seconds=60)
+    engine = database.get_engine()
+    raced = []
+
+    def write_during_load(conn, cursor, statement, *args):
+        # Another request adds the title and invalidates after the load's SELECT ran
+        if raced or "watchlist_items" not in statement:
+            return
+        raced.append(statement)
+        with database.SessionLocal() as other:
+            other.add(WatchlistItem(profile_id=profile_id, content_id=content_id))
+            other.commit()
+        cache.invalidate(profile_id)
+
+    event.listen(engine, "after_cursor_execute", write_during_load)
+    try:
+        with database.SessionLocal() as db:
+            assert cache.get(db, profile_id) == frozenset()
+    finally:
+        event.remove(engine, "after_cursor_execute", write_during_load)
+    with database.SessionLocal() as db:
+        assert cache.get(db, profile_id) == {content_id}
+
+
+def test_write_in_another_worker_invalidates_membership(client, make_user):
+    headers = make_user()
+    user_id = client.get("/users/me", headers=headers).json()["id"]
+    with database.SessionLocal() as db:
+        profile, content = Profile(user_id=user_id, name="Main"), Content(title="Elsewhere")
+        db.add_all([profile, content])
+        db.commit()
+        profile_id, content_id = profile.id, content.id
+    contains = f"/watchlist/{profile_id}/contains?content_ids={content_id}"
+    assert client.get(contains, headers=headers).json()["content_ids"] == []
+
+    # Another worker adds the title: only its change event reaches this process
+    with database.SessionLocal() as db:
+        db.add(WatchlistItem(profile_id=profile_id, content_id=content_id))
+        db.commit()
+    assert client.get(contains, headers=headers).json()["content_ids"] == []
+    remote = ChangeEvent("watchlist", profile_id, "update", 1, "another-worker", 0.0)
+    event_bus._receive(json.dumps([remote.to_json()]).encode())
+    assert client.get(contains, headers=headers).json()["content_ids"] == [content_id]
+
+    assert client.delete(f"/watchlist/{profile_id}/remove/{content_id}", headers=headers).status_code == 204
+    assert client.get(contains, headers=headers).json()["content_ids"] == []
+    assert watchlist_cache.stats()["version"] >= 2
@@ -0,0 +1,109 @@
+"""Statement budgets of the write endpoints.
+
+Each write is a single INSERT/UPDATE ... RETURNING: no SELECT before it re-checks
+what a unique constraint enforces, and none after it re-reads the written row.
+The expected sequences list every statement, so any added query fails here.
+"""
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from src.core import database
+
+WRITES = ("INSERT", "UPDATE", "DELETE")
+# Leading statement of authenticated requests: get_current_user's db.get(User)
+USER = "SELECT"
+
+
+@pytest.fixture
+def statements():
+    seen = []
+
+    def capture(conn, cursor, statement, *args):
+        seen.append(statement)
+
+    engine = database.get_engine()
+    event.listen(engine, "before_cursor_execute", capture)
+    yield seen
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+def _call(client, statements, method, url, expected, **kwargs):
+    statements.clear()
+    response = client.request(method, url, **kwargs)
+    assert response.status_code < 400, response.text
+    verbs = [s.split(None, 1)[0].upper() for s in statements]
+    assert verbs == [e.split()[0] for e in expected], statements
+    for statement, verb, label in zip(statements, verbs, expected):
+        # A row write returns the row; only set-based updates ("UPDATE (bulk)") return nothing
+        if verb in WRITES and not label.endswith("(bulk)"):
+            assert "RETURNING" in statement, statement
+    return response.json()
+
+
+def test_write_endpoints_issue_one_statement_per_write(client, admin_headers, statements):
+    email = f"{uuid.uuid4().hex}@example.com"
+    _call(client, statements, "POST", "/auth/register", ["INSERT"], json={"email": email, "password": "secret1"})
+    token = client.post("/auth/login", data={"username": email, "password": "secret1"}).json()["access_token"]
+    auth = {"Authorization": f"Bearer {token}"}
+
+    content_id = client.post("/content", json={"title": "Writes"}, headers=admin_headers).json()["id"]
+    client.get(f"/content/{content_id}")  # the title is in the hot content cache, as when browsing
+    profile_id = _call(
+        client, statements, "POST", "/profiles", [USER, "INSERT"], json={"name": "main"}, headers=auth
+    )["id"]
+    _call(
+        client,
+        statements,
+        "PUT",
+        f"/profiles/{profile_id}",
+        [USER, "UPDATE"],
+        json={"name": "main", "maturity_rating": "R"},
+        headers=auth,
+    )
+    review_id = _call(
+        client,
+        statements,
+        "POST",
+        f"/reviews/{profile_id}/content/{content_id}",
+        [USER, "SELECT", "SELECT", "INSERT"],  # profile ownership, content existence
+        json={"rating": 4},
+        headers=auth,
+    )["id"]
+    _call(client, statements, "PUT", f"/reviews/{review_id}", [USER, "UPDATE"], json={"rating": 5}, headers=auth)
+    added = _call(
+        client,
+        statements,
+        "POST",
+        f"/watchlist/{profile_id}/add/{content_id}",
+        [USER, "SELECT", "INSERT"],  # profile ownership
+        headers=auth,
+    )
+    assert added["content"]["id"] == content_id and added["profile_id"] == profile_id
+    again = _call(
+        client,
+        statements,
+        "POST",
+        f"/watchlist/{profile_id}/add/{content_id}",
+        [USER, "SELECT", "INSERT", "SELECT"],  # conflict: return the existing entry
+        headers=auth,
+    )
+    assert again["id"] == added["id"]
+    plan_id = _call(
+        client,
+        statements,
+        "POST",
+        "/subscriptions/plans",
+        [USER, "INSERT"],
+        json={"name": f"Plan {uuid.uuid4().hex[:8]}", "price_cents": 499},
+        headers=admin_headers,
+    )["id"]
+    _call(
+        client,
+        statements,
+        "POST",
+        f"/subscriptions/subscribe/{plan_id}",
+        [USER, "SELECT", "UPDATE (bulk)", "INSERT"],  # plan, cancel active subscriptions, new one
+        headers=auth,
+    )